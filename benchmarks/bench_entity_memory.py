@@ -0,0 +1,271 @@
+"""Report memory per entity and attribute read cost for the game's entity classes
+
+"Before" is the old layout: a plain object with one __dict__ entry per field,
+including the per-type constants every instance used to copy, and dicts for
+projectiles and trail particles. "After" is the current slotted classes, with
+enemies appended into an EnemyStore the way a wave fills the arena and
+projectiles as slots of the arena's ProjectilePool.
+
+Read costs are reported twice: for a mix of per-instance fields, and for
+the per-type constants alone (size, attack range and so on).
+
+Enemy reads through the proxy are a regression: every per-instance field
+(x, health, alive) is an EnemyStore column read, a dict lookup plus a
+NumPy .item(), and costs more than ten times a plain attribute. Enemies
+trade that for less memory and vectorized AI. Per-enemy loops should not
+read through the proxy; the AI works on whole columns and the render,
+minimap, health bar and targeting loops index EnemyStore.column_lists(),
+whose cost is reported as its own row.
+
+Bytes are Python heap allocations measured with tracemalloc. Surface pixel
+data lives in SDL memory and is not counted for either layout.
+
+Run from the repository root:  python benchmarks/bench_entity_memory.py
+"""
+import os
+import sys
+import gc
+import timeit
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC_DIR)
+os.chdir(SRC_DIR)  # Asset paths are relative to src/
+
+import pygame
+from constants import *
+from player import Player
+from enemy import Enemy
+from enemy_store import EnemyStore
+from boss import Boss
+from spell import Spell, TrailParticle
+from projectile_pool import ProjectilePool
+from town_state import NPC
+
+COUNT = 1024
+
+# Attributes each class stored in its instance __dict__ before the change
+# (fields that no longer exist on the new classes get OLD_DEFAULTS)
+OLD_FIELDS = {
+    "Enemy": [
+        "x", "y", "enemy_type", "health", "max_health", "speed", "attack_damage",
+        "size", "score_value", "attack_range", "is_ranged", "image", "rect",
+        "last_attack", "attack_cooldown", "alive", "projectiles", "projectile_speed",
+    ],
+    "Boss": [
+        "x", "y", "boss_type", "arena_state", "health", "max_health", "speed",
+        "attack_damage", "color", "size", "score_value", "special_ability",
+        "is_ranged", "attack_range", "is_real", "last_attack", "attack_cooldown",
+        "alive", "last_special_ability", "special_ability_cooldown", "rage_mode",
+        "rage_end_time", "projectiles", "projectile_speed", "image", "rect",
+        "spawned_minions", "skeleton_spawn_active", "decoy_troll", "real_troll",
+    ],
+    "Spell": [
+        "x", "y", "angle", "spell_type", "alive", "sound_manager", "speed",
+        "damage", "color", "size", "trail_particles", "particle_timer",
+        "particle_spawn_rate",
+    ],
+    "NPC": [
+        "x", "y", "name", "color", "size", "speed", "texture_key", "image",
+        "dialogue", "has_talked", "is_being_talked_to", "target_x", "target_y",
+        "wander_radius", "home_x", "home_y", "target_reached_time", "wait_time",
+        "stuck_timer", "max_stuck_time",
+    ],
+    "Player": [
+        "x", "y", "angle", "base_speed", "rot_speed", "health", "max_health",
+        "mana", "max_mana", "mana_regen", "z", "z_velocity", "gravity",
+        "jump_power", "is_jumping", "can_jump", "mouse_sensitivity", "gold",
+        "weapon_level", "armor_level", "spell_level", "current_spell",
+        "known_spells", "spell_costs", "total_score", "highest_wave",
+    ],
+}
+
+OLD_DEFAULTS = {"projectiles": []}
+
+
+class DictEntity:
+    """Stand-in for the old dict-backed classes"""
+    def __init__(self, fields):
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+
+def copy_value(value):
+    """Copy the values every old instance owned, share the rest"""
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, pygame.Surface):
+        return value.copy()
+    if isinstance(value, pygame.Rect):
+        return pygame.Rect(value)
+    return value
+
+
+def make_old(prototype, fields):
+    """Build a factory for dict-backed copies of prototype"""
+    values = {name: getattr(prototype, name, OLD_DEFAULTS.get(name)) for name in fields}
+
+    def factory(i):
+        return DictEntity({name: copy_value(value) for name, value in values.items()})
+    return factory
+
+
+def measure(factory, count=COUNT):
+    """Get the traced bytes allocated per object made by factory"""
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    objects = factory(count)
+    end = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (end - start) / count
+
+
+def each(factory):
+    """Make count objects into a list"""
+    return lambda count: [factory(i) for i in range(count)]
+
+
+def read_cost(obj, names, keyed=False):
+    """Get nanoseconds per attribute (or dict key) read"""
+    if keyed:
+        reads = "; ".join(f"obj[{name!r}]" for name in names)
+    else:
+        reads = "; ".join(f"obj.{name}" for name in names)
+    loops = 20000
+    seconds = min(timeit.repeat(reads, globals={"obj": obj}, number=loops, repeat=5))
+    return seconds / (loops * len(names)) * 1e9
+
+
+def list_read_cost(xs, ys, health, flags, row=7):
+    """Get nanoseconds per field read indexing column lists by row"""
+    reads = "xs[row]; ys[row]; health[row]; flags[row]"
+    names = {"xs": xs, "ys": ys, "health": health, "flags": flags, "row": row}
+    loops = 20000
+    seconds = min(timeit.repeat(reads, globals=names, number=loops, repeat=5))
+    return seconds / (loops * 4) * 1e9
+
+
+def fill_store(count):
+    """Spawn a wave of enemies into an arena store"""
+    store = EnemyStore()
+    types = [EnemyType.SKELETON, EnemyType.ORC, EnemyType.TROLL, EnemyType.DEMON]
+    for i in range(count):
+        store.append(Enemy(i % 600 + 100, i % 500 + 100, types[i % len(types)]))
+    return store
+
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    npc_image = pygame.Surface((24, 24))
+    player = Player(100, 100, 0)
+
+    cases = [
+        (
+            "Enemy", Enemy(300, 300, EnemyType.ORC), fill_store,
+            ["x", "health", "attack_range", "alive"],
+            ["size", "attack_range", "attack_cooldown", "is_ranged"],
+        ),
+        (
+            "Boss", Boss(300, 300, BossType.ORC_CHIEFTAIN),
+            each(lambda i: Boss(300, 300, BossType.ORC_CHIEFTAIN)),
+            ["x", "health", "attack_range", "rage_mode"],
+            ["size", "attack_range", "special_ability_cooldown", "is_ranged"],
+        ),
+        (
+            "Spell", Spell(300, 300, 0.5, "fireball"),
+            each(lambda i: Spell(300, 300, 0.5, "fireball")),
+            ["x", "damage", "speed", "alive"],
+            ["speed", "color", "size"],
+        ),
+        (
+            "NPC", NPC(300, 300, "Bench", BLUE, ["Hello"], "bench"),
+            each(lambda i: NPC(300, 300, "Bench", BLUE, ["Hello"], "bench")),
+            ["x", "target_x", "speed", "is_being_talked_to"],
+            None,
+        ),
+        (
+            "Player", player, each(lambda i: Player(100, 100, 0)),
+            ["x", "health", "base_speed", "is_jumping"],
+            None,
+        ),
+    ]
+    cases[3][1].image = npc_image
+
+    print(f"{'entity':<16}{'before B':>10}{'after B':>10}{'saved':>8}"
+          f"{'before ns':>11}{'after ns':>10}")
+
+    constant_reads = []
+    for name, prototype, new_factory, read_names, constant_names in cases:
+        old_factory = make_old(prototype, OLD_FIELDS[name])
+        old_bytes = measure(each(old_factory))
+        new_bytes = measure(new_factory)
+        old_ns = read_cost(old_factory(0), read_names)
+        new_ns = read_cost(prototype, read_names)
+        report(name, old_bytes, new_bytes, old_ns, new_ns)
+        if constant_names:
+            constant_reads.append((
+                name, read_cost(old_factory(0), constant_names),
+                read_cost(prototype, constant_names),
+            ))
+
+    # Projectiles used to be dicts, now they are pool slots read in batches
+    old_bytes = measure(each(lambda i: {'x': 1.0, 'y': 2.0, 'angle': 0.5, 'damage': 30, 'alive': True}))
+    new_bytes = measure(ProjectilePool)
+    report("Projectile", old_bytes, new_bytes, None, None)
+
+    # Trail particles used to be dicts
+    small_cases = [
+        (
+            "TrailParticle",
+            lambda i: {'x': 1.0, 'y': 2.0, 'life': 1.0, 'size': 3.0, 'color': ORANGE},
+            lambda i: TrailParticle(1.0, 2.0, 3.0, ORANGE),
+            ["x", "life", "size"],
+        ),
+    ]
+    for name, old_factory, new_factory, read_names in small_cases:
+        old_bytes = measure(each(old_factory))
+        new_bytes = measure(each(new_factory))
+        old_ns = read_cost(old_factory(0), read_names, keyed=True)
+        new_ns = read_cost(new_factory(0), read_names)
+        report(name, old_bytes, new_bytes, old_ns, new_ns)
+
+    print()
+    print(f"{'per-type consts':<16}{'before ns':>11}{'after ns':>10}")
+    for name, old_ns, new_ns in constant_reads:
+        print(f"{name:<16}{old_ns:>11.1f}{new_ns:>10.1f}")
+
+    # Enemy per-instance reads: through the proxy, and from column lists
+    enemy_names = ["x", "y", "health", "alive"]
+    old_enemy = make_old(cases[0][1], OLD_FIELDS["Enemy"])(0)
+    old_ns = read_cost(old_enemy, enemy_names)
+    proxy_ns = read_cost(cases[0][1], enemy_names)
+    store = fill_store(COUNT)
+    xs, ys, health, flags = store.column_lists('x', 'y', 'health', 'flags')
+    list_ns = list_read_cost(xs, ys, health, flags)
+
+    print()
+    print(f"{'enemy fields':<16}{'before ns':>11}{'after ns':>10}")
+    print(f"{'proxy':<16}{old_ns:>11.1f}{proxy_ns:>10.1f}"
+          f"   REGRESSION: {proxy_ns / old_ns:.0f}x slower per read")
+    print(f"{'column lists':<16}{old_ns:>11.1f}{list_ns:>10.1f}"
+          f"   (what per-enemy loops use)")
+
+
+def report(name, old_bytes, new_bytes, old_ns, new_ns):
+    """Print one result row (read costs may be None)"""
+    saved = (1 - new_bytes / old_bytes) * 100 if old_bytes else 0
+    reads = "" if old_ns is None else f"{old_ns:>11.1f}{new_ns:>10.1f}"
+    print(f"{name:<16}{old_bytes:>10.0f}{new_bytes:>10.0f}{saved:>7.0f}%{reads}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import math
+import time
+import numpy as np
+from constants import *
+
+# Relevance tiers, nearest first
+AI_TIER_NEAR = 0
+AI_TIER_MID = 1
+AI_TIER_FAR = 2
+
+
+class AIScheduler:
+    """Level of detail and time slicing for the arena's enemy AI
+
+    Enemies near the player or in front of them are in the near tier and
+    think every tick. Others think every AI_MID_INTERVAL or AI_FAR_INTERVAL
+    ticks, and each row's skipped time builds up in the store's ai_dt
+    column so it moves as far as it would have. Distant enemies that are
+    due only get the time left in AI_TIME_BUDGET_MS after the near tier,
+    shared round robin with at least AI_MIN_SLICE per tick, and the rest
+    wait for a later tick.
+
+    tier_counts, updated_counts and update_times_ms hold the last tick's
+    figures for each tier.
+    """
+    def __init__(self, time_budget_ms=AI_TIME_BUDGET_MS):
+        self.time_budget_ms = time_budget_ms
+        self.intervals = np.array([1, AI_MID_INTERVAL, AI_FAR_INTERVAL])
+        self.tick = 0
+        self.cursor = 0
+
+        # Running estimate of the cost of one enemy update
+        self.row_cost_ms = 0.005
+
+        self.tier_counts = [0, 0, 0]
+        self.updated_counts = [0, 0, 0]
+        self.update_times_ms = [0.0, 0.0, 0.0]
+
+    def classify(self, store, player):
+        """Get the relevance tier of every live row"""
+        dx = store.view('x') - player.x
+        dy = store.view('y') - player.y
+        distance = np.sqrt(dx * dx + dy * dy)
+
+        # Angle off the view direction, wrapped to -pi..pi
+        off_view = (np.arctan2(dy, dx) - player.angle + math.pi) % (2 * math.pi) - math.pi
+        visible = (np.abs(off_view) < HALF_FOV + AI_VIEW_MARGIN) & (distance < AI_VISIBLE_DISTANCE)
+
+        tier = np.where(distance <= AI_MID_DISTANCE, AI_TIER_MID, AI_TIER_FAR)
+        tier[(distance <= AI_NEAR_DISTANCE) | visible] = AI_TIER_NEAR
+        return tier
+
+    def select(self, tier, count):
+        """Get the rows that think this tick, near rows first"""
+        rows = np.arange(count)
+        near = rows[tier == AI_TIER_NEAR]
+
+        # Distant rows are staggered by row so their ticks spread out
+        intervals = self.intervals[tier]
+        due = (tier != AI_TIER_NEAR) & ((rows + self.tick) % intervals == 0)
+        distant = rows[due]
+
+        # Round robin the budget left after the near tier over due rows,
+        # always letting a few through so distant enemies never starve
+        spare_ms = self.time_budget_ms - len(near) * self.row_cost_ms
+        cap = max(AI_MIN_SLICE, int(spare_ms / self.row_cost_ms))
+        if len(distant) > cap:
+            chosen = distant[np.argsort((distant - self.cursor) % count, kind='stable')[:cap]]
+            self.cursor = (int(chosen[-1]) + 1) % count
+            distant = np.sort(chosen)
+        return near, distant
+
+    def update(self, store, player, dt, current_time, collision_grid, projectiles, flow_field=None,
+               line_of_sight=None):
+        """Run this tick's share of enemy AI"""
+        self.tick += 1
+        count = len(store)
+        if count == 0:
+            self.tier_counts = [0, 0, 0]
+            self.updated_counts = [0, 0, 0]
+            self.update_times_ms = [0.0, 0.0, 0.0]
+            return
+
+        ai_dt = store.view('ai_dt')
+        ai_dt += dt
+        np.minimum(ai_dt, AI_MAX_DT, out=ai_dt)
+
+        store.update_separation()
+        tier = self.classify(store, player)
+        near, distant = self.select(tier, count)
+        self.tier_counts = np.bincount(tier, minlength=3).tolist()
+
+        updated = 0
+        total_ms = 0.0
+        for tier_id in (AI_TIER_NEAR, AI_TIER_MID, AI_TIER_FAR):
+            if tier_id == AI_TIER_NEAR:
+                rows = near
+            else:
+                rows = distant[tier[distant] == tier_id]
+
+            start = time.perf_counter()
+            if len(rows):
+                store.update(player, ai_dt[rows], current_time, collision_grid, projectiles,
+                             flow_field, rows, line_of_sight)
+                ai_dt[rows] = 0.0
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            self.updated_counts[tier_id] = len(rows)
+            self.update_times_ms[tier_id] = elapsed_ms
+            updated += len(rows)
+            total_ms += elapsed_ms
+
+        if updated:
+            self.row_cost_ms = 0.9 * self.row_cost_ms + 0.1 * (total_ms / updated)
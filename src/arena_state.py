@@ -1,12 +1,30 @@
 import pygame
 import math
 import random
+import numpy as np
 from constants import *
 from raycaster import RayCaster
 from arena_map import ArenaMap
 from enemy import Enemy
+from enemy_store import EnemyStore, FLAG_ALIVE
 from boss import Boss
-from spell import Spell
+from spell import SpellPool
+from sprite_lod import LOD_FULL
+from spatial_hash import SpatialHash
+from projectile_pool import ProjectilePool
+from collision_grid import CollisionGrid, segment_circle_fraction
+from flow_field import FlowField
+from line_of_sight import LineOfSightTable
+from spawn_table import SpawnTable
+from spawn_scheduler import SpawnScheduler
+from timer_queue import TimerQueue
+from ai_scheduler import AIScheduler
+from population_controller import PopulationController
+from status_effects import StatusEffects, EFFECT_NAMES
+from entity_registry import EntityRegistry
+from combat_events import (CombatEventBus, HitEvent, DeathEvent, SpawnEvent, CastEvent,
+                           WaveCompleteEvent)
+from fixed_timestep import RenderInterpolation, save_previous
 
 class ArenaState:
     def __init__(self, screen, game_manager, player):
@@ -15,14 +33,47 @@ class ArenaState:
         self.player = player
         
         self.arena_map = ArenaMap()
-        self.raycaster = RayCaster(screen)
+        self.collision_grid = CollisionGrid.from_map(self.arena_map)
+        self.flow_field = FlowField(self.collision_grid)
+        self.line_of_sight = LineOfSightTable.from_grid(self.collision_grid)
+        self.raycaster = RayCaster(screen, game_manager.backend)
         
         self.sound_manager = None
         
-        # Entity lists
-        self.enemies = []
-        self.bosses = []
-        self.spells = []
+        # Entity storage (enemies live in a struct-of-arrays store, bosses
+        # and spells in registries addressed by handle)
+        self.enemies = EnemyStore()
+        self.bosses = EntityRegistry()
+        self.spells = EntityRegistry()
+        self.projectiles = ProjectilePool()
+        self.spell_pool = SpellPool()
+        self.spawner = SpawnScheduler()
+        self.ai_scheduler = AIScheduler()
+        self.population = PopulationController()
+        
+        # Burns, slows and stuns from spells, one table per kind of handle
+        self.enemy_effects = StatusEffects()
+        self.boss_effects = StatusEffects()
+        
+        # Wave delays, prompt timeouts and boss abilities on the game clock
+        self.timers = TimerQueue(lambda: self.game_manager.sim_time)
+        self.shop_prompt_timeout = None
+        
+        # Hits, deaths, spawns, casts and wave ends are queued during a tick
+        # and handed to sound and scoring in one batch at the end of it
+        self.events = CombatEventBus()
+        self.events.subscribe(HitEvent, self.on_hits)
+        self.events.subscribe(DeathEvent, self.on_deaths)
+        self.events.subscribe(SpawnEvent, self.on_spawns)
+        self.events.subscribe(CastEvent, self.on_casts)
+        self.events.subscribe(WaveCompleteEvent, self.on_wave_complete)
+        self.interpolation = RenderInterpolation()
+        
+        # Broadphase for spell hits, rebuilt once per tick
+        self.target_hash = SpatialHash(TILE_SIZE)
+        
+        # Sprites drawn at reduced detail this frame skip health bars and labels
+        self.lod_culled = set()
         
         # Wave management
         self.current_wave = 1
@@ -54,6 +105,8 @@ class ArenaState:
         self.arena_center_x = 10 * TILE_SIZE
         self.arena_center_y = 10 * TILE_SIZE
         self.spawn_radius = 7 * TILE_SIZE
+        self.spawn_table = SpawnTable.from_map(self.collision_grid, self.arena_center_x,
+                                               self.arena_center_y, self.spawn_radius)
         
     def initialize_arena(self):
         """Initialize/reset arena for new session"""
@@ -67,10 +120,19 @@ class ArenaState:
         if not self.wave_progress_saved:
             self.current_wave = 1
         
-        # Clear all entities
-        self.enemies = []
-        self.bosses = []
-        self.spells = []
+        # Clear all entities and queued spawns
+        self.enemies.clear()
+        self.spawner.clear()
+        self.population.clear()
+        self.enemy_effects.clear()
+        self.boss_effects.clear()
+        self.timers.clear()
+        self.bosses.clear()
+        for spell in self.spells:
+            self.spell_pool.release(spell)
+        self.spells.clear()
+        self.projectiles.clear()
+        self.events.clear()
         self.wave_completed = False
         self.between_waves = False
         self.boss_wave = False
@@ -93,17 +155,17 @@ class ArenaState:
         
     def continue_arena(self):
         """Continue arena after shopping"""
+        self.timers.cancel(self.shop_prompt_timeout)
         self.show_shop_prompt = False
         self.boss_defeated = False
         self.boss_wave = False
+        self.events.push(WaveCompleteEvent(self.current_wave))
         self.current_wave += 1
-        if self.sound_manager:
-            self.sound_manager.play_sound('wave_complete')
         self.start_wave()
         
     def start_wave(self):
         """Start a new wave"""
-        self.wave_start_time = pygame.time.get_ticks()
+        self.wave_start_time = self.game_manager.sim_time
         self.wave_completed = False
         self.between_waves = False
         
@@ -122,34 +184,29 @@ class ArenaState:
         additional_enemies = (self.current_wave - 1) // 2
         num_enemies = base_enemies + additional_enemies
         
+        self.spawner.schedule(self.wave_spawns(num_enemies), num_enemies)
+        self.enemies_remaining = len(self.enemies) + self.spawner.pending
+        
+    def wave_spawns(self, num_enemies):
+        """Spawn generator adding one wave enemy per step"""
         for _ in range(num_enemies):
             self.spawn_enemy()
-            
-        self.enemies_remaining = len(self.enemies)
+            yield
         
     def start_boss_wave(self):
         """Start a boss wave"""
         self.boss_wave = True
         
-        if self.sound_manager:
-            self.sound_manager.play_sound('boss_spawn')
-        
         # Cycle through boss types
         boss_types = [BossType.NECROMANCER, BossType.ORC_CHIEFTAIN, BossType.ANCIENT_TROLL, BossType.DEMON_LORD]
         boss_index = ((self.current_wave // 5) - 1) % len(boss_types)
         boss_type = boss_types[boss_index]
         
         boss_x, boss_y = self.get_spawn_position()
-        boss = Boss(boss_x, boss_y, boss_type, self)
-        
-        # Scale boss stats with wave
-        wave_multiplier = 1.0 + ((self.current_wave - 5) // 5) * 0.5
-        boss.health = int(boss.health * wave_multiplier)
-        boss.max_health = boss.health
-        boss.attack_damage = int(boss.attack_damage * wave_multiplier)
-        
-        self.bosses.append(boss)
-        self.enemies_remaining = len(self.enemies) + len(self.bosses)
+        boss = Boss(boss_x, boss_y, boss_type, self, self.current_wave)
+        self.bosses.add(boss)
+        self.events.push(SpawnEvent(boss, True))
+        self.enemies_remaining = len(self.enemies) + len(self.bosses) + self.spawner.pending
         
     def spawn_enemy(self):
         """Spawn a random enemy"""
@@ -165,50 +222,14 @@ class ArenaState:
             
         enemy_type = random.choice(enemy_types)
         enemy_x, enemy_y = self.get_spawn_position()
-        enemy = Enemy(enemy_x, enemy_y, enemy_type)
-        
-        # Scale enemy stats with wave
-        health_multiplier = 1.0 + (self.current_wave - 1) * 0.3
-        damage_multiplier = 1.0 + (self.current_wave - 1) * 0.2
-        
-        enemy.health = int(enemy.health * health_multiplier)
-        enemy.max_health = enemy.health
-        enemy.attack_damage = int(enemy.attack_damage * damage_multiplier)
-        
+        # Stats are scaled with the wave from the type's tables
+        enemy = Enemy(enemy_x, enemy_y, enemy_type, self.current_wave)
         self.enemies.append(enemy)
+        self.events.push(SpawnEvent(enemy, False))
         
     def get_spawn_position(self):
-        """Get a valid spawn position around the arena"""
-        attempts = 0
-        while attempts < 50:
-            angle = random.uniform(0, 2 * math.pi)
-            distance = random.uniform(self.spawn_radius * 0.7, self.spawn_radius)
-            
-            x = self.arena_center_x + math.cos(angle) * distance
-            y = self.arena_center_y + math.sin(angle) * distance
-            
-            # Check for valid position away from player
-            if not self.check_spawn_collision(x, y) and self.get_distance_to_player(x, y) > 100:
-                return x, y
-            attempts += 1
-            
-        return self.arena_center_x + 200, self.arena_center_y + 200
-                
-    def check_spawn_collision(self, x, y):
-        """Check if spawn position collides with walls"""
-        map_x = int(x // TILE_SIZE)
-        map_y = int(y // TILE_SIZE)
-        
-        if map_x < 0 or map_x >= 20 or map_y < 0 or map_y >= 20:
-            return True
-        
-        return not self.arena_map.is_walkable(map_x, map_y)
-        
-    def get_distance_to_player(self, x, y):
-        """Get distance from position to player"""
-        dx = x - self.player.x
-        dy = y - self.player.y
-        return math.sqrt(dx * dx + dy * dy)
+        """Get an open spawn position around the arena, away from the player"""
+        return self.spawn_table.sample(self.player.x, self.player.y, SPAWN_SAFE_DISTANCE)
         
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
@@ -252,154 +273,259 @@ class ArenaState:
         """Cast a spell"""
         if self.player.mana >= self.player.spell_costs[spell_type]:
             self.player.mana -= self.player.spell_costs[spell_type]
-            
-            if self.sound_manager:
-                self.sound_manager.play_sound('spell_cast')
+            self.events.push(CastEvent(spell_type))
             
             # Heal spell is instant
             if spell_type == "heal":
                 heal_amount = 20 * self.player.get_spell_damage_multiplier()
                 self.player.heal(heal_amount)
-                if self.sound_manager:
-                    self.sound_manager.play_sound('heal')
                 return
             
             # Create projectile spell
-            spell = Spell(self.player.x, self.player.y, self.player.angle, spell_type, self.sound_manager)
+            spell = self.spell_pool.acquire(self.player.x, self.player.y, self.player.angle,
+                                            spell_type, self.events)
             spell.damage = int(spell.damage * self.player.get_spell_damage_multiplier())
-            self.spells.append(spell)
+            self.spells.add(spell)
                 
+    def save_previous_state(self):
+        """Snapshot positions before a tick for render interpolation"""
+        save_previous([self.player])
+        save_previous(self.bosses)
+        save_previous(self.spells)
+        self.enemies.save_previous()
+        
+    def apply_interpolation(self, alpha):
+        """Draw everything alpha of the way between the last two ticks"""
+        self.interpolation.apply([self.player], alpha)
+        self.interpolation.apply(self.bosses, alpha)
+        self.interpolation.apply(self.spells, alpha)
+        self.enemies.apply_interpolation(alpha)
+        
+    def restore_interpolation(self):
+        """Put back the simulated positions after drawing"""
+        self.interpolation.restore()
+        self.enemies.restore_interpolation()
+        
     def update(self, dt):
-        current_time = pygame.time.get_ticks()
+        current_time = self.game_manager.sim_time
         
-        # Handle game over state
-        if self.game_over:
-            if current_time - self.game_over_timer > self.game_over_duration:
-                self.game_manager.change_state(GameState.MENU)
-            return
+        # Recount the population that boss summons have to fit in
+        self.population.census(self.enemies, self.bosses, self.spawner.pending)
         
-        # Handle shop prompt timeout
-        if self.show_shop_prompt:
-            if current_time - self.shop_prompt_timer > self.shop_prompt_duration:
-                self.continue_arena()
+        # Run due timers, including the game over and shop prompt timeouts
+        self.timers.advance()
+        if self.game_over or self.show_shop_prompt:
+            self.events.dispatch()
             return
         
         # Player movement with collision
         keys = pygame.key.get_pressed()
         old_x, old_y = self.player.x, self.player.y
         
-        self.player.move(keys, dt, self.arena_map.collision_map, 
-                        self.arena_map.width, self.arena_map.height)
+        self.player.move(keys, dt, self.collision_grid)
         
         # Check for out of bounds or wall collision
-        player_tile_x = int(self.player.x // TILE_SIZE)
-        player_tile_y = int(self.player.y // TILE_SIZE)
-        
-        if (player_tile_x < 0 or player_tile_x >= self.arena_map.width or
-            player_tile_y < 0 or player_tile_y >= self.arena_map.height or
-            self.arena_map.collision_map[player_tile_y][player_tile_x] != 0):
+        if self.collision_grid.is_blocked(self.player.x, self.player.y):
             self.player.x, self.player.y = old_x, old_y
             
         self.player.update(dt)
         
-        # Update enemies
-        for enemy in self.enemies[:]:
-            old_health = enemy.health
-            enemy.update(self.player, dt, current_time)
-            
-            if enemy.alive and enemy.health < old_health:
-                if self.sound_manager:
-                    self.sound_manager.play_sound('enemy_hit')
-            
-            if not enemy.alive:
-                self.player.add_gold(enemy.score_value)
-                self.player.total_score += enemy.score_value
-                self.enemies.remove(enemy)
-                if self.sound_manager:
-                    self.sound_manager.play_sound('enemy_death')
+        # Repath the shared flow field only when the player changes tile
+        self.flow_field.update(self.player.x, self.player.y)
+        
+        # Bring in queued wave and summon spawns a few at a time
+        self.spawner.update(current_time)
+        
+        self.update_status_effects(dt, current_time)
+        
+        # Update enemies in vectorized passes, distant ones less often
+        self.ai_scheduler.update(self.enemies, self.player, dt, current_time, self.collision_grid,
+                                 self.projectiles, self.flow_field, self.line_of_sight)
+        
+        for enemy in self.enemies.get_dead():
+            self.enemies.remove(enemy)
+            self.enemy_effects.remove(enemy.handle)
+            self.events.push(DeathEvent(enemy, enemy.score_value, False))
                 
-        # Update bosses
-        for boss in self.bosses[:]:
-            old_health = boss.health
-            boss.update(self.player, dt, current_time)
-            
-            if boss.alive and boss.health < old_health:
-                if self.sound_manager:
-                    self.sound_manager.play_sound('enemy_hit')
+        # Update bosses, from the end so removal can swap in visited ones
+        for i in range(len(self.bosses) - 1, -1, -1):
+            boss = self.bosses[i]
+            boss.update(self.player, dt, current_time, self.collision_grid,
+                        self.projectiles, self.flow_field)
             
             if not boss.alive:
-                self.player.add_gold(boss.score_value)
-                self.player.total_score += boss.score_value
-                self.bosses.remove(boss)
+                self.bosses.remove(boss.handle)
+                self.boss_effects.remove(boss.handle)
+                self.events.push(DeathEvent(boss, boss.score_value, True))
                 if self.boss_wave:
                     self.boss_defeated = True
-                if self.sound_manager:
-                    self.sound_manager.play_sound('enemy_death')
                     
+        # Move every enemy and boss projectile in one batch
+        self.projectiles.update(dt, self.player, self.collision_grid)
+                    
+        # Bucket live targets once per tick for the spell broadphase
+        self.target_hash.clear()
+        xs, ys, flags = self.enemies.column_lists('x', 'y', 'flags')
+        for row, enemy in enumerate(self.enemies.proxies):
+            if flags[row] & FLAG_ALIVE:
+                self.target_hash.insert(enemy, xs[row], ys[row])
+        for boss in self.bosses:
+            if boss.alive:
+                self.target_hash.insert(boss)
+                
         # Update spells and check collisions
-        for spell in self.spells[:]:
-            spell.update(dt, self.arena_map.collision_map, 
-                        self.arena_map.width, self.arena_map.height)
+        for i in range(len(self.spells) - 1, -1, -1):
+            spell = self.spells[i]
+            spell.update(dt, self.collision_grid)
             
-            if not spell.alive:
-                self.spells.remove(spell)
-                continue
-                
-            # Check spell hits on enemies
-            for enemy in self.enemies:
-                if enemy.alive and self.check_spell_collision(spell, enemy):
-                    enemy.take_damage(spell.damage)
-                    spell.on_hit_target()
-                    spell.alive = False
-                    break
-                    
-            # Check spell hits on bosses
-            for boss in self.bosses:
-                if boss.alive and self.check_spell_collision(spell, boss):
-                    boss.take_damage(spell.damage)
-                    spell.on_hit_target()
+            # Check spell hits on enemies and bosses along this step, which
+            # ends at the wall if the spell hit one. A spell clipped at a
+            # wall has already pushed its wall hit, the target hit is its own
+            # event either way
+            if spell.speed:
+                target = self.find_spell_target(spell)
+                if target:
+                    effects = self.effects_for(target)
+                    target.take_damage(effects.absorb(target.handle, spell.damage, current_time))
+                    if spell.stats.effect is not None:
+                        effects.apply(target.handle, EFFECT_NAMES[spell.stats.effect],
+                                      spell.stats.effect_strength, spell.stats.effect_duration,
+                                      current_time)
+                    spell.on_hit_target(target)
                     spell.alive = False
-                    break
+            
+            if not spell.alive:
+                self.spells.remove(spell.handle)
+                self.spell_pool.release(spell)
         
         # Check wave completion
-        if not self.between_waves and len(self.enemies) == 0 and len(self.bosses) == 0:
+        if (not self.between_waves and len(self.enemies) == 0 and len(self.bosses) == 0
+                and not self.spawner.pending):
             self.wave_completed = True
             
             if self.boss_wave and self.boss_defeated:
                 self.show_shop_prompt = True
                 self.shop_prompt_timer = current_time
+                self.shop_prompt_timeout = self.timers.schedule(self.shop_prompt_duration,
+                                                                self.continue_arena)
             else:
                 self.between_waves = True
                 self.wave_start_time = current_time
-                if self.sound_manager:
-                    self.sound_manager.play_sound('wave_complete')
-                
-        # Start next wave after delay
-        if self.between_waves and current_time - self.wave_start_time > self.wave_delay:
-            self.current_wave += 1
-            self.player.highest_wave = max(self.player.highest_wave, self.current_wave)
-            self.start_wave()
+                self.timers.schedule(self.wave_delay, self.start_next_wave)
+                self.events.push(WaveCompleteEvent(self.current_wave))
             
         # Check for player death
         if self.player.health <= 0:
             self.trigger_game_over(current_time)
             
+        # Hand this tick's combat events to their subscribers
+        self.events.dispatch()
+        
+    def effects_for(self, target):
+        """Get the status effect table for an enemy or boss"""
+        return self.boss_effects if isinstance(target, Boss) else self.enemy_effects
+        
+    def update_status_effects(self, dt, current_time):
+        """Apply every burn, regen, slow and stun for this tick"""
+        handles, damage, heal, speed_scale = self.enemy_effects.tick(dt, current_time)
+        self.enemies.view('speed_scale')[:] = 1.0
+        if len(handles):
+            rows, found = self.enemies.rows_of(handles)
+            rows = rows[found]
+            health = self.enemies.view('health')
+            health[rows] = np.minimum(health[rows] - damage[found] + heal[found],
+                                      self.enemies.view('max_health')[rows])
+            self.enemies.view('speed_scale')[rows] = speed_scale[found]
+            
+            # Burned to death, picked up with the other dead enemies
+            dead = rows[health[rows] <= 0]
+            self.enemies.view('flags')[dead] &= ~FLAG_ALIVE & 0xFF
+            
+        # Bosses are few, and go through take_damage for their resistances
+        handles, damage, heal, speed_scale = self.boss_effects.tick(dt, current_time)
+        for boss in self.bosses:
+            boss.speed_scale = 1.0
+        for handle, burn, regen, scale in zip(handles.tolist(), damage, heal, speed_scale):
+            boss = self.bosses.get(handle)
+            if boss is None or not boss.alive:
+                continue
+            if burn:
+                boss.take_damage(burn)
+            boss.health = min(boss.max_health, boss.health + regen)
+            boss.speed_scale = scale
+            
+    def on_hits(self, events):
+        """Play one impact sound however many spells landed this tick"""
+        if self.sound_manager:
+            self.sound_manager.play_sound('spell_hit')
+            if any(event.target is not None for event in events):
+                self.sound_manager.play_sound('enemy_hit')
+                
+    def on_deaths(self, events):
+        """Award gold and score for this tick's kills"""
+        score = sum(event.score_value for event in events)
+        self.player.add_gold(score)
+        self.player.total_score += score
+        if self.sound_manager:
+            self.sound_manager.play_sound('enemy_death')
+            
+    def on_spawns(self, events):
+        """Announce a boss arriving, decoys and regular enemies are silent"""
+        if any(event.is_boss and event.entity.is_real for event in events):
+            if self.sound_manager:
+                self.sound_manager.play_sound('boss_spawn')
+                
+    def on_casts(self, events):
+        """Play the cast sound, and the heal sound if a heal was cast"""
+        if self.sound_manager:
+            self.sound_manager.play_sound('spell_cast')
+            if any(event.spell_type == "heal" for event in events):
+                self.sound_manager.play_sound('heal')
+                
+    def on_wave_complete(self, events):
+        """Play the wave complete fanfare"""
+        if self.sound_manager:
+            self.sound_manager.play_sound('wave_complete')
+            
+    def start_next_wave(self):
+        """Start the next wave once the delay between waves is over"""
+        self.current_wave += 1
+        self.player.highest_wave = max(self.player.highest_wave, self.current_wave)
+        self.start_wave()
+            
     def trigger_game_over(self, current_time):
         """Trigger game over screen"""
         self.game_over = True
         self.game_over_timer = current_time
+        self.timers.schedule(self.game_over_duration, self.game_manager.change_state, GameState.MENU)
         if self.sound_manager:
             self.sound_manager.play_sound('player_hit')
             
     def check_spell_collision(self, spell, target):
-        """Check if spell hits target"""
-        dx = spell.x - target.x
-        dy = spell.y - target.y
-        distance = math.sqrt(dx * dx + dy * dy)
-        return distance < target.size + spell.size
+        """Get how far along the spell's last step it hits target, or None"""
+        return segment_circle_fraction(spell.prev_x, spell.prev_y, spell.x, spell.y,
+                                       target.x, target.y, target.size + spell.size)
+        
+    def find_spell_target(self, spell):
+        """Get the first live enemy or boss the spell's last step passes through"""
+        mid_x = (spell.prev_x + spell.x) / 2
+        mid_y = (spell.prev_y + spell.y) / 2
+        reach = math.hypot(spell.x - spell.prev_x, spell.y - spell.prev_y) / 2 + spell.size
+        
+        first_target = None
+        first_hit = math.inf
+        for target in self.target_hash.query(mid_x, mid_y, reach):
+            if not target.alive:
+                continue
+            hit = self.check_spell_collision(spell, target)
+            if hit is not None and hit < first_hit:
+                first_target = target
+                first_hit = hit
+        return first_target
         
     def render(self):
-        self.screen.fill(BLACK)
+        self.raycaster.backend.clear(BLACK)
+        self.lod_culled.clear()
         
         # Render 3D view
         rays = self.raycaster.cast_rays(self.player, self.arena_map.collision_map,
@@ -414,7 +540,7 @@ class ArenaState:
         # Render spell trails
         for spell in self.spells:
             if hasattr(spell, 'render_trail'):
-                spell.render_trail(self.screen)
+                spell.render_trail(self.raycaster.backend)
         
         self.draw_health_bars()
         self.draw_minimap()
@@ -430,12 +556,15 @@ class ArenaState:
         """Render enemies in 3D space with proper wall occlusion"""
         view_bob = int(self.player.z * 0.3)
         
-        for enemy in self.enemies:
-            if not enemy.alive:
+        xs, ys, flags = self.enemies.column_lists('x', 'y', 'flags')
+        for row, enemy in enumerate(self.enemies.proxies):
+            if not flags[row] & FLAG_ALIVE:
                 continue
                 
-            dx = enemy.x - self.player.x
-            dy = enemy.y - self.player.y
+            world_x = xs[row]
+            world_y = ys[row]
+            dx = world_x - self.player.x
+            dy = world_y - self.player.y
             enemy_distance = math.sqrt(dx * dx + dy * dy)
             
             if enemy_distance < 0.1:
@@ -451,27 +580,8 @@ class ArenaState:
                 angle_diff += 2 * math.pi
                 
             if abs(angle_diff) < HALF_FOV:
-                # Check if enemy is blocked by walls
-                enemy_blocked = False
-                steps = max(10, int(enemy_distance / 8))
-                
-                for step in range(1, steps):
-                    t = step / steps
-                    check_x = self.player.x + dx * t
-                    check_y = self.player.y + dy * t
-                    check_tile_x = int(check_x // TILE_SIZE)
-                    check_tile_y = int(check_y // TILE_SIZE)
-                    
-                    if (check_tile_x < 0 or check_tile_x >= self.arena_map.width or
-                        check_tile_y < 0 or check_tile_y >= self.arena_map.height):
-                        enemy_blocked = True
-                        break
-                    
-                    if self.arena_map.get_tile(check_tile_x, check_tile_y) != 0:
-                        enemy_blocked = True
-                        break
-                
-                if not enemy_blocked:  
+                # Skip enemies behind walls with one lookup in the sight table
+                if self.line_of_sight.visible_points(self.player.x, self.player.y, world_x, world_y):
                     screen_x = (angle_diff / HALF_FOV) * (SCREEN_WIDTH // 2) + (SCREEN_WIDTH // 2)
                     
                     # Scale enemy based on distance
@@ -483,21 +593,18 @@ class ArenaState:
                     
                     # Render enemy sprite or colored rect
                     if hasattr(enemy, 'image') and enemy.image:
-                        scaled_enemy = pygame.transform.scale(enemy.image, (enemy_width, enemy_height))
+                        enemy_rect = pygame.Rect(0, 0, enemy_width, enemy_height)
+                        enemy_rect.center = (int(screen_x), int(enemy_y + enemy_height // 2))
                         
                         # Apply distance-based darkness
+                        darkness = 0
                         if enemy_distance > 100:
-                            dark_surface = pygame.Surface((enemy_width, enemy_height))
-                            dark_surface.fill((0, 0, 0))
                             darkness = min(128, int((enemy_distance - 100) * 2))
-                            dark_surface.set_alpha(darkness)
                             
-                            enemy_rect = scaled_enemy.get_rect(center=(int(screen_x), int(enemy_y + enemy_height // 2)))
-                            self.screen.blit(scaled_enemy, enemy_rect)
-                            self.screen.blit(dark_surface, enemy_rect)
-                        else:
-                            enemy_rect = scaled_enemy.get_rect(center=(int(screen_x), int(enemy_y + enemy_height // 2)))
-                            self.screen.blit(scaled_enemy, enemy_rect)
+                        lod_level = self.raycaster.sprite_lod.draw(
+                            self.raycaster.backend, enemy.image, enemy_rect, enemy_distance, darkness)
+                        if lod_level != LOD_FULL:
+                            self.lod_culled.add(enemy)
                     else:
                         enemy_rect = (
                             screen_x - enemy_width // 2,
@@ -505,7 +612,7 @@ class ArenaState:
                             enemy_width,
                             enemy_height
                         )
-                        pygame.draw.rect(self.screen, enemy.color, enemy_rect)
+                        self.raycaster.backend.fill_rect(enemy.color, enemy_rect)
             
     def render_bosses_3d(self, rays):
         """Render bosses in 3D space with proper wall occlusion"""
@@ -532,27 +639,8 @@ class ArenaState:
                 angle_diff += 2 * math.pi
                 
             if abs(angle_diff) < HALF_FOV:
-                # Check if boss is blocked by walls
-                boss_blocked = False
-                steps = max(10, int(boss_distance / 8)) 
-                
-                for step in range(1, steps):
-                    t = step / steps
-                    check_x = self.player.x + dx * t
-                    check_y = self.player.y + dy * t
-                    check_tile_x = int(check_x // TILE_SIZE)
-                    check_tile_y = int(check_y // TILE_SIZE)
-                    
-                    if (check_tile_x < 0 or check_tile_x >= self.arena_map.width or
-                        check_tile_y < 0 or check_tile_y >= self.arena_map.height):
-                        boss_blocked = True
-                        break
-                    
-                    if self.arena_map.get_tile(check_tile_x, check_tile_y) != 0:
-                        boss_blocked = True
-                        break
-
-                if not boss_blocked:
+                # Skip bosses behind walls with one lookup in the sight table
+                if self.line_of_sight.visible_points(self.player.x, self.player.y, boss.x, boss.y):
                     screen_x = (angle_diff / HALF_FOV) * (SCREEN_WIDTH // 2) + (SCREEN_WIDTH // 2)
                     
                     # Scale boss larger than normal enemies
@@ -564,26 +652,22 @@ class ArenaState:
                     
                     # Render boss sprite
                     if hasattr(boss, 'image') and boss.image:
-                        scaled_boss = pygame.transform.scale(boss.image, (int(boss_width), int(boss_height)))
+                        boss_rect = (screen_x - boss_width // 2, boss_y, int(boss_width), int(boss_height))
                         
                         # Apply distance-based darkness
+                        darkness = 0
                         if boss_distance > 150:
-                            dark_surface = pygame.Surface((int(boss_width), int(boss_height)))
-                            dark_surface.fill((0, 0, 0))
                             darkness = min(100, int((boss_distance - 150) * 1.5))
-                            dark_surface.set_alpha(darkness)
                             
-                            boss_rect = (screen_x - boss_width // 2, boss_y, boss_width, boss_height)
-                            self.screen.blit(scaled_boss, boss_rect)
-                            self.screen.blit(dark_surface, boss_rect)
-                        else:
-                            boss_rect = (screen_x - boss_width // 2, boss_y, boss_width, boss_height)
-                            self.screen.blit(scaled_boss, boss_rect)
+                        lod_level = self.raycaster.sprite_lod.draw(
+                            self.raycaster.backend, boss.image, boss_rect, boss_distance, darkness)
+                        if lod_level != LOD_FULL:
+                            self.lod_culled.add(boss)
                             
                         # Show rage mode indicator
-                        if hasattr(boss, 'rage_mode') and boss.rage_mode:
+                        if hasattr(boss, 'rage_mode') and boss.rage_mode and lod_level == LOD_FULL:
                             rage_rect = pygame.Rect(screen_x - boss_width // 2, boss_y, boss_width, boss_height)
-                            pygame.draw.rect(self.screen, RED, rage_rect, 3)
+                            self.raycaster.backend.draw_rect(RED, rage_rect, 3)
                     else:
                         boss_rect = (
                             screen_x - boss_width // 2,
@@ -591,10 +675,10 @@ class ArenaState:
                             boss_width,
                             boss_height
                         )
-                        pygame.draw.rect(self.screen, boss.color, boss_rect)
+                        self.raycaster.backend.fill_rect(boss.color, boss_rect)
                     
                     # Draw boss name when close
-                    if boss_distance < 200 and boss_scale > 20:
+                    if boss_distance < 200 and boss_scale > 20 and boss not in self.lod_culled:
                         boss_names = {
                             BossType.NECROMANCER: "Necromancer",
                             BossType.ORC_CHIEFTAIN: "Orc Chieftain", 
@@ -603,7 +687,7 @@ class ArenaState:
                         }
                         name_text = boss_names.get(boss.boss_type, "Boss")
                         
-                        name_font = pygame.font.Font(None, max(16, int(boss_scale // 4)))
+                        name_font = pygame.font.Font(None, min(48, max(16, int(boss_scale // 4))))
                         name_surface = name_font.render(name_text, True, WHITE)
                         name_rect = name_surface.get_rect(center=(screen_x, boss_y - 20))
                         
@@ -642,10 +726,11 @@ class ArenaState:
                                    (tile_x, tile_y, map_scale, map_scale))
                     
         # Draw enemies on minimap
-        for enemy in self.enemies:
-            if enemy.alive:
-                enemy_map_x = int(map_x + (enemy.x / TILE_SIZE) * map_scale)
-                enemy_map_y = int(map_y + (enemy.y / TILE_SIZE) * map_scale)
+        xs, ys, flags = self.enemies.column_lists('x', 'y', 'flags')
+        for row in range(len(xs)):
+            if flags[row] & FLAG_ALIVE:
+                enemy_map_x = int(map_x + (xs[row] / TILE_SIZE) * map_scale)
+                enemy_map_y = int(map_y + (ys[row] / TILE_SIZE) * map_scale)
                 
                 if (map_x <= enemy_map_x <= map_x + map_size and 
                     map_y <= enemy_map_y <= map_y + map_size):
@@ -680,18 +765,21 @@ class ArenaState:
             
     def draw_health_bars(self):
         """Draw health bars for enemies and bosses"""
-        for enemy in self.enemies:
-            if enemy.alive and enemy.health < enemy.max_health:
-                self.draw_enemy_health_bar(enemy)
+        xs, ys, health, max_health, flags = self.enemies.column_lists(
+            'x', 'y', 'health', 'max_health', 'flags')
+        for row, enemy in enumerate(self.enemies.proxies):
+            if (flags[row] & FLAG_ALIVE and health[row] < max_health[row]
+                    and enemy not in self.lod_culled):
+                self.draw_enemy_health_bar(xs[row], ys[row], health[row] / max_health[row])
                 
         for boss in self.bosses:
             if boss.alive:
                 self.draw_boss_health_bar(boss)
                 
-    def draw_enemy_health_bar(self, enemy):
-        """Draw health bar above enemy"""
-        dx = enemy.x - self.player.x
-        dy = enemy.y - self.player.y
+    def draw_enemy_health_bar(self, x, y, health_percentage):
+        """Draw health bar above an enemy at (x, y)"""
+        dx = x - self.player.x
+        dy = y - self.player.y
         distance = math.sqrt(dx * dx + dy * dy)
         
         if distance > 300:
@@ -722,7 +810,6 @@ class ArenaState:
         pygame.draw.rect(self.screen, RED, bg_rect)
         
         # Draw health bar fill
-        health_percentage = enemy.health / enemy.max_health
         if health_percentage > 0.6:
             health_color = GREEN
         elif health_percentage > 0.3:
@@ -754,7 +841,7 @@ class ArenaState:
             self.screen.blit(stat_text, (10, stats_y + i * 30))
             
         # Show enemy count
-        enemies_remaining = len(self.enemies) + len(self.bosses)
+        enemies_remaining = len(self.enemies) + len(self.bosses) + self.spawner.pending
         if enemies_remaining > 0:
             enemies_text = f"Enemies: {enemies_remaining}"
             text_surface = self.font.render(enemies_text, True, RED)
@@ -770,14 +857,14 @@ class ArenaState:
             boss_text = "BOSS WAVE!"
             
             # Pulsing boss text
-            pulse = abs(math.sin(pygame.time.get_ticks() * 0.01)) * 0.3 + 0.7
+            pulse = abs(math.sin(self.game_manager.sim_time * 0.01)) * 0.3 + 0.7
             scaled_font = pygame.font.Font(None, int(48 * pulse))
             boss_text_pulsed = scaled_font.render(boss_text, True, RED)
             text_rect = boss_text_pulsed.get_rect(center=(SCREEN_WIDTH // 2, 80))
             self.screen.blit(boss_text_pulsed, text_rect)
             
         # Spell UI
-        current_time = pygame.time.get_ticks()
+        current_time = self.game_manager.sim_time
         spell_y = SCREEN_HEIGHT - 120
         
         current_spell_text = f"Current Spell: {self.player.current_spell.title()}"
@@ -903,7 +990,7 @@ class ArenaState:
         pygame.draw.rect(self.screen, DARK_GRAY, (box_x, box_y, box_width, box_height))
         pygame.draw.rect(self.screen, GOLD, (box_x, box_y, box_width, box_height), 3)
         
-        time_remaining = (self.shop_prompt_duration - (pygame.time.get_ticks() - self.shop_prompt_timer)) // 1000
+        time_remaining = (self.shop_prompt_duration - (self.game_manager.sim_time - self.shop_prompt_timer)) // 1000
         
         texts = [
             "BOSS DEFEATED!",
@@ -1004,7 +1091,7 @@ class ArenaState:
         pygame.draw.rect(self.screen, DARK_RED, (box_x, box_y, box_width, box_height))
         pygame.draw.rect(self.screen, RED, (box_x, box_y, box_width, box_height), 4)
         
-        time_remaining = (self.game_over_duration - (pygame.time.get_ticks() - self.game_over_timer)) // 1000
+        time_remaining = (self.game_over_duration - (self.game_manager.sim_time - self.game_over_timer)) // 1000
         
         texts = [
             "GAME OVER",
@@ -1,12 +1,30 @@
 import math
-import random
 import pygame
 from constants import DARK_GREEN, BossType
 from constants import *
+from entity_stats import BossArchetype, BOSS_STATS
 from enemy import Enemy
+from projectile_pool import ProjectilePool
+from combat_events import SpawnEvent
 
 class Boss:
+    __slots__ = (
+        'x', 'y', 'prev_x', 'prev_y', 'archetype', 'arena_state',
+        'health', 'max_health', 'speed', 'speed_scale', 'attack_damage', 'is_real',
+        'last_attack', 'alive', 'last_special_ability', 'rage_mode', 'rage_end_time',
+        'ability_timer',
+        'owner_id', 'spawned_minions', 'skeleton_spawn_active',
+        'decoy_troll', 'real_troll', 'handle',
+        # Per-type constants copied from the archetype
+        'boss_type', 'stats', 'image', 'color', 'size', 'special_ability',
+        'is_ranged', 'attack_range', 'special_ability_cooldown',
+    )
+    
     boss_images = {}
+    archetypes = {}
+    attack_cooldown = 1500
+    projectile_speed = 250
+    projectile_hit_radius = 25
     
     @classmethod
     def load_images(cls):
@@ -53,134 +71,141 @@ class Boss:
                 pygame.draw.rect(surface, WHITE, (0, 0, 64, 64), 2)
                 cls.boss_images[boss_type] = surface
 
-    def __init__(self, x: float, y: float, boss_type: str = BossType.NECROMANCER, arena_state=None):
+    @classmethod
+    def get_archetype(cls, boss_type):
+        """Get the shared archetype for a type, building it on first use"""
+        archetype = cls.archetypes.get(boss_type)
+        if archetype is None:
+            if not cls.boss_images:
+                cls.load_images()
+            size = BOSS_STATS[boss_type].size
+            sprite = pygame.transform.scale(cls.boss_images[boss_type], (size * 2, size * 2))
+            try:
+                sprite = sprite.convert_alpha()
+            except pygame.error:
+                pass  # No display yet, keep the unconverted sprite
+            archetype = cls.archetypes[boss_type] = BossArchetype.build(boss_type, sprite)
+        return archetype
+
+    def __init__(self, x: float, y: float, boss_type: str = BossType.NECROMANCER, arena_state=None,
+                 wave=None):
         self.x = x
         self.y = y
-        self.boss_type = boss_type
+        self.prev_x = x
+        self.prev_y = y
+        self.archetype = archetype = Boss.get_archetype(boss_type)
         self.arena_state = arena_state
         
-        # Set stats based on boss type
-        if boss_type == BossType.NECROMANCER:
-            self.health = 300
-            self.max_health = 300
-            self.speed = 30
-            self.attack_damage = 40
-            self.color = PURPLE
-            self.size = 35
-            self.score_value = 150
-            self.special_ability = "summon_skeletons"
-            self.is_ranged = True
-            self.attack_range = 150
-        elif boss_type == BossType.ORC_CHIEFTAIN:
-            self.health = 500
-            self.max_health = 800
-            self.speed = 60
-            self.attack_damage = 20 
-            self.color = DARK_GREEN
-            self.size = 40
-            self.score_value = 200
-            self.special_ability = "berserker_rage"
-            self.is_ranged = False
-            self.attack_range = 60
-        elif boss_type == BossType.ANCIENT_TROLL:
-            self.health = 600
-            self.max_health = 600
-            self.speed = 25
-            self.attack_damage = 80
-            self.color = DARK_BROWN
-            self.size = 50
-            self.score_value = 300
-            self.special_ability = "create_decoy"
-            self.is_ranged = False
-            self.attack_range = 70
-            self.is_real = True 
-        elif boss_type == BossType.DEMON_LORD:
-            self.health = 1200
-            self.max_health = 1200
-            self.speed = 70
-            self.attack_damage = 85
-            self.color = DARK_RED
-            self.size = 45
-            self.score_value = 450
-            self.special_ability = "demon_summon"
-            self.is_ranged = True
-            self.attack_range = 200
+        # Constants shared by every boss of the type, copied into slots so
+        # reads are a plain attribute lookup
+        self.stats = stats = archetype.stats
+        self.boss_type = boss_type
+        self.image = archetype.sprite
+        self.color = stats.color
+        self.size = stats.size
+        self.special_ability = stats.special_ability
+        self.is_ranged = stats.is_ranged
+        self.attack_range = stats.attack_range
+        self.special_ability_cooldown = stats.special_ability_cooldown
+        
+        # Stats that change during the fight start from the type's table,
+        # scaled by the wave for wave bosses
+        if wave is None:
+            self.health = stats.health
+            self.max_health = stats.max_health
+            self.attack_damage = stats.attack_damage
+        else:
+            self.health = self.max_health = archetype.health_for_wave(wave)
+            self.attack_damage = archetype.damage_for_wave(wave)
+        self.speed = stats.speed
+        # Slows and stuns from status effects, set by the arena every tick
+        self.speed_scale = 1.0
+        self.is_real = True
             
         # Combat timers
         self.last_attack = 0
-        self.attack_cooldown = 1500
         self.alive = True
         
-        # Special ability timing
+        # Special ability timing, arena bosses use the arena's timers and
+        # their first ability is due straight away
         self.last_special_ability = 0
-        if boss_type == BossType.NECROMANCER:
-            self.special_ability_cooldown = 2000
-        elif boss_type == BossType.DEMON_LORD:
-            self.special_ability_cooldown = 5000
-        else:
-            self.special_ability_cooldown = 8000
+        self.ability_timer = None
+        if arena_state:
+            self.ability_timer = arena_state.timers.schedule(0, self.special_ability_due)
             
         # Rage mode (Orc Chieftain)
         self.rage_mode = False
         self.rage_end_time = 0
         
-        # Projectile system
-        self.projectiles = []
-        self.projectile_speed = 250
-        
-        # Load sprite
-        if not Boss.boss_images:
-            Boss.load_images()
-            
-        self.image = pygame.transform.scale(
-            Boss.boss_images[self.boss_type], (self.size * 2, self.size * 2)
-        )
-        self.rect = self.image.get_rect(center=(self.x, self.y))
+        # Identifies this boss's shots in the arena projectile pool
+        self.owner_id = ProjectilePool.new_owner_id()
         
         # Minion spawning
         self.spawned_minions = False
         self.skeleton_spawn_active = True
+        # Arena registry handles of the paired trolls
         self.decoy_troll = None  
         self.real_troll = None   
+        self.handle = None
+
+    @property
+    def score_value(self):
+        """Get the score for defeating this boss (decoys are worth nothing)"""
+        return self.stats.score_value if self.is_real else 0
+
+    @property
+    def rect(self):
+        """Get the sprite rect centred on the current position"""
+        return self.image.get_rect(center=(self.x, self.y))
         
-    def update(self, player, dt, current_time):
+    def update(self, player, dt, current_time, collision_grid, projectiles, flow_field=None):
         """Update boss behavior with special abilities"""
         if not self.alive:
             return
             
-        self.update_special_states(current_time)
-        
-        # Use special ability when off cooldown
-        if current_time - self.last_special_ability > self.special_ability_cooldown:
-            self.use_special_ability(player, current_time)
+        # Bosses outside an arena poll their ability and rage timers
+        if self.ability_timer is None:
+            self.update_special_states(current_time)
+            if current_time - self.last_special_ability > self.special_ability_cooldown:
+                self.use_special_ability(player, current_time)
+            
+        # Stunned bosses neither move nor attack
+        if self.speed_scale == 0:
+            return
             
         dx = player.x - self.x
         dy = player.y - self.y
         distance = math.sqrt(dx * dx + dy * dy)
         
-        # Ranged boss behavior
+        # Ranged boss behavior, closing in while walls block the shot
         if self.is_ranged:
-            if distance > self.attack_range:
-                self.move_towards_player(player, dt, distance, dx, dy)
+            in_sight = self.can_see(player)
+            if distance > self.attack_range or not in_sight:
+                self.move_towards_player(player, dt, distance, dx, dy, collision_grid, flow_field)
             elif distance < 100:
-                self.move_away_from_player(player, dt, distance, dx, dy)
+                self.move_away_from_player(player, dt, distance, dx, dy, collision_grid)
                 
-            if distance <= self.attack_range and current_time - self.last_attack > self.attack_cooldown:
-                self.ranged_attack(player, current_time)
+            if (in_sight and distance <= self.attack_range
+                    and current_time - self.last_attack > self.attack_cooldown):
+                self.ranged_attack(player, current_time, projectiles)
         # Melee boss behavior
         else:
             if distance > self.attack_range:
-                self.move_towards_player(player, dt, distance, dx, dy)
+                self.move_towards_player(player, dt, distance, dx, dy, collision_grid, flow_field)
             elif current_time - self.last_attack > self.attack_cooldown:
                 self.melee_attack(player, current_time)
         
-        self.update_projectiles(dt, player)
-        
         # Spawn initial minions once
         if not self.spawned_minions:
             self.spawn_initial_minions()
             self.spawned_minions = True
                 
+    def can_see(self, player):
+        """Check the arena's sight table for a clear line to the player"""
+        if self.arena_state is None:
+            return True
+        return self.arena_state.line_of_sight.visible_points(self.x, self.y, player.x, player.y)
+        
     def spawn_initial_minions(self):
         """Spawn initial minions with boss"""
         if not self.arena_state:
@@ -191,61 +216,79 @@ class Boss:
             return  
             
         if self.boss_type == BossType.ORC_CHIEFTAIN:
-            for _ in range(3):
-                minion_x, minion_y = self.get_minion_spawn_position()
-                minion = Enemy(minion_x, minion_y, EnemyType.ORC)
-                self.arena_state.enemies.append(minion)
+            self.summon_minions(EnemyType.ORC, 3)
                 
         elif self.boss_type == BossType.ANCIENT_TROLL and self.is_real:  
-            # Spawn troll minions
-            for _ in range(4):
+            self.summon_minions(EnemyType.TROLL, 4)
+            self.arena_state.spawner.schedule(self.spawn_decoy(), 1)
+            
+    def summon_minions(self, enemy_type, count):
+        """Queue minions to appear around the boss over the next ticks"""
+        # Over the arena's budget, summons merge into fewer, stronger minions
+        units, strength = self.arena_state.population.admit(enemy_type, count)
+        if units:
+            self.arena_state.spawner.schedule(self.minion_spawns(enemy_type, units, strength), units)
+        
+    def minion_spawns(self, enemy_type, count, strength=1):
+        """Spawn generator adding one minion per step"""
+        population = self.arena_state.population
+        spawned = 0
+        try:
+            for _ in range(count):
+                if not self.alive:
+                    return
                 minion_x, minion_y = self.get_minion_spawn_position()
-                minion = Enemy(minion_x, minion_y, EnemyType.TROLL)
+                minion = Enemy(minion_x, minion_y, enemy_type)
+                if strength > 1:
+                    minion.max_health *= strength
+                    minion.health = minion.max_health
+                    minion.attack_damage *= strength
                 self.arena_state.enemies.append(minion)
-                
-            # Create decoy troll
-            decoy_x, decoy_y = self.get_minion_spawn_position()
-            decoy = Boss(decoy_x, decoy_y, BossType.ANCIENT_TROLL, self.arena_state)
-            decoy.is_real = False  
-            decoy.health = 600 
-            decoy.max_health = 600
-            decoy.score_value = 0  
-            decoy.spawned_minions = True  
-            decoy.real_troll = self  
-            self.decoy_troll = decoy  
-            self.arena_state.bosses.append(decoy)
+                population.spawned(enemy_type)
+                spawned += 1
+                self.arena_state.events.push(SpawnEvent(minion, False))
+                yield
+        finally:
+            # Hand back the budget of minions cut short by the boss dying
+            population.release(enemy_type, count - spawned)
+            
+    def spawn_decoy(self):
+        """Spawn generator adding the decoy troll"""
+        if not self.alive:
+            return
+        decoy_x, decoy_y = self.get_minion_spawn_position()
+        decoy = Boss(decoy_x, decoy_y, BossType.ANCIENT_TROLL, self.arena_state)
+        decoy.is_real = False  
+        decoy.health = 600 
+        decoy.max_health = 600
+        decoy.spawned_minions = True  
+        decoy.real_troll = self.handle  
+        self.decoy_troll = self.arena_state.bosses.add(decoy)
+        self.arena_state.events.push(SpawnEvent(decoy, True))
+        yield
                 
     def get_minion_spawn_position(self):
-        """Get spawn position near boss"""
-        angle = random.uniform(0, 2 * math.pi)
-        distance = random.uniform(60, 120)
-        
-        x = self.x + math.cos(angle) * distance
-        y = self.y + math.sin(angle) * distance
-        
-        # Keep within bounds
-        x = max(100, min(1180, x))
-        y = max(100, min(1180, y))
-        
-        return x, y
+        """Get an open spawn position near boss"""
+        return self.arena_state.spawn_table.sample_near(self.x, self.y, 60, 120)
                 
+    def special_ability_due(self):
+        """Timer callback for when the special ability is off cooldown"""
+        if self.alive:
+            self.use_special_ability(self.arena_state.player, self.arena_state.timers.clock())
+            
     def use_special_ability(self, player, current_time):
         """Use boss special ability"""
         self.last_special_ability = current_time
+        if self.ability_timer is not None:
+            self.arena_state.timers.reschedule(self.ability_timer, self.special_ability_cooldown)
         
         if self.special_ability == "summon_skeletons" and self.skeleton_spawn_active:
             if self.arena_state:
-                for _ in range(2):
-                    skeleton_x, skeleton_y = self.get_minion_spawn_position()
-                    skeleton = Enemy(skeleton_x, skeleton_y, EnemyType.SKELETON)
-                    self.arena_state.enemies.append(skeleton)
+                self.summon_minions(EnemyType.SKELETON, 2)
                     
         elif self.special_ability == "demon_summon":
             if self.arena_state:
-                for _ in range(3):
-                    demon_x, demon_y = self.get_minion_spawn_position()
-                    demon = Enemy(demon_x, demon_y, EnemyType.DEMON)
-                    self.arena_state.enemies.append(demon)
+                self.summon_minions(EnemyType.DEMON, 3)
                     
         elif self.special_ability == "berserker_rage":
             if not self.rage_mode:
@@ -253,38 +296,44 @@ class Boss:
                 self.rage_end_time = current_time + 5000 
                 self.speed *= 1.5 
                 self.attack_damage = int(self.attack_damage * 1.3) 
+                if self.arena_state:
+                    self.arena_state.timers.schedule(5000, self.end_rage)
                 
-    def move_towards_player(self, player, dt, distance, dx, dy):
+    def move_towards_player(self, player, dt, distance, dx, dy, collision_grid, flow_field=None):
         """Move toward player with boss-specific patterns"""
         if distance > 0:
             dx /= distance
             dy /= distance
             
-            current_speed = self.speed
+            # Follow the flow field around walls when there is one
+            if flow_field is not None:
+                direction = flow_field.get_direction(self.x, self.y)
+                if direction is not None:
+                    dx, dy = direction
+            
+            current_speed = self.speed * self.speed_scale
             if self.rage_mode:
                 current_speed *= 1.5
                 
             new_x = self.x + dx * current_speed * dt
             new_y = self.y + dy * current_speed * dt
             
-            if not self.check_collision(new_x, new_y):
+            if not collision_grid.is_blocked(new_x, new_y):
                 self.x = new_x
                 self.y = new_y
-                self.rect.center = (self.x, self.y)
 
-    def move_away_from_player(self, player, dt, distance, dx, dy):
+    def move_away_from_player(self, player, dt, distance, dx, dy, collision_grid):
         """Move away from player (for ranged bosses)"""
         if distance > 0:
             dx /= distance
             dy /= distance
 
-            new_x = self.x - dx * self.speed * 0.7 * dt
-            new_y = self.y - dy * self.speed * 0.7 * dt
+            new_x = self.x - dx * self.speed * self.speed_scale * 0.7 * dt
+            new_y = self.y - dy * self.speed * self.speed_scale * 0.7 * dt
 
-            if not self.check_collision(new_x, new_y):
+            if not collision_grid.is_blocked(new_x, new_y):
                 self.x = new_x
                 self.y = new_y
-                self.rect.center = (self.x, self.y)
 
     def melee_attack(self, player, current_time):
         """Melee attack with special damage values"""
@@ -294,7 +343,7 @@ class Boss:
         player.take_damage(damage)
         self.last_attack = current_time
 
-    def ranged_attack(self, player, current_time):
+    def ranged_attack(self, player, current_time, projectiles):
         """Ranged attack - bosses shoot multiple projectiles"""
         dx = player.x - self.x
         dy = player.y - self.y
@@ -310,63 +359,24 @@ class Boss:
             else:
                 angle = base_angle + (i - 1) * spread_angle
                 
-            projectile = {
-                'x': self.x,
-                'y': self.y,
-                'angle': angle,
-                'damage': self.attack_damage,
-                'alive': True
-            }
-            self.projectiles.append(projectile)
+            projectiles.spawn(self.x, self.y, angle, self.projectile_speed,
+                              self.attack_damage, self.projectile_hit_radius, self.owner_id)
             
         self.last_attack = current_time
 
-    def update_projectiles(self, dt, player):
-        """Update boss projectiles"""
-        for projectile in self.projectiles[:]:
-            if not projectile['alive']:
-                self.projectiles.remove(projectile)
-                continue
-                
-            # Move projectile
-            projectile['x'] += math.cos(projectile['angle']) * self.projectile_speed * dt
-            projectile['y'] += math.sin(projectile['angle']) * self.projectile_speed * dt
-            
-            # Check collision with player
-            dx = projectile['x'] - player.x
-            dy = projectile['y'] - player.y
-            distance = math.sqrt(dx * dx + dy * dy)
-            
-            if distance < 25: 
-                player.take_damage(projectile['damage'])
-                projectile['alive'] = False
-                
-            elif self.check_collision(projectile['x'], projectile['y']):
-                projectile['alive'] = False
-                
     def update_special_states(self, current_time):
         """Update special boss states"""
         # End rage mode when timer expires
+        if current_time > self.rage_end_time:
+            self.end_rage()
+                
+    def end_rage(self):
+        """End berserker rage (Orc Chieftain)"""
         if self.boss_type == BossType.ORC_CHIEFTAIN and self.rage_mode:
-            if current_time > self.rage_end_time:
-                self.rage_mode = False
-                self.speed = 60  
-                self.attack_damage = 60  
+            self.rage_mode = False
+            self.speed = 60  
+            self.attack_damage = 60  
                 
-    def check_collision(self, x: float, y: float) -> bool:
-        """Check collision with arena walls"""
-        map_x = int(x // TILE_SIZE)
-        map_y = int(y // TILE_SIZE)
-        
-        if map_x < 0 or map_x >= 20 or map_y < 0 or map_y >= 20:
-            return True
-            
-        # Check circular arena boundary
-        center_x, center_y = 10, 10
-        distance = math.sqrt((map_x - center_x) ** 2 + (map_y - center_y) ** 2)
-        
-        return distance > 8
-        
     def take_damage(self, damage):
         """Take damage with boss-specific resistances"""
         # Decoy trolls don't take damage
@@ -384,14 +394,19 @@ class Boss:
                 self.skeleton_spawn_active = False
                 
             # Kill decoy troll when real troll dies
-            if self.boss_type == BossType.ANCIENT_TROLL and self.is_real and self.decoy_troll:
-                self.decoy_troll.alive = False
+            if self.boss_type == BossType.ANCIENT_TROLL and self.is_real and self.arena_state:
+                decoy = self.arena_state.bosses.get(self.decoy_troll)
+                if decoy:
+                    decoy.alive = False
             
         # Trigger rage mode at low health
         if (self.boss_type == BossType.ORC_CHIEFTAIN and 
             self.health < self.max_health * 0.3 and 
             not self.rage_mode):
-            current_time = pygame.time.get_ticks()
+            if self.arena_state:
+                current_time = self.arena_state.game_manager.sim_time
+            else:
+                current_time = pygame.time.get_ticks()
             self.use_special_ability(None, current_time)
             
     def get_distance_to(self, x, y):
@@ -419,18 +434,3 @@ class Boss:
                 alpha_surface.set_alpha(180)
                 alpha_surface.fill(WHITE)
                 surface.blit(alpha_surface, self.rect, special_flags=pygame.BLEND_ALPHA_SDL2)
-
-    def draw_projectiles(self, surface, camera_x=0, camera_y=0):
-        """Draw boss projectiles (larger and more impressive)"""
-        for projectile in self.projectiles:
-            if projectile['alive']:
-                proj_x = int(projectile['x'] - camera_x)
-                proj_y = int(projectile['y'] - camera_y)
-                
-                # Different projectile visuals per boss
-                if self.boss_type == BossType.NECROMANCER:
-                    pygame.draw.circle(surface, PURPLE, (proj_x, proj_y), 8)
-                    pygame.draw.circle(surface, WHITE, (proj_x, proj_y), 4)
-                elif self.boss_type == BossType.DEMON_LORD:
-                    pygame.draw.circle(surface, DARK_RED, (proj_x, proj_y), 6)
-                    pygame.draw.circle(surface, ORANGE, (proj_x, proj_y), 3)
\ No newline at end of file
@@ -0,0 +1,72 @@
+import numpy as np
+from constants import *
+
+
+class BuildingLookup:
+    """Precomputed nearest interactable building for every cell of a map
+
+    The map is split into cells of `cell_size` world units, several per
+    tile. Each cell stores the building (from the map's get_building_at)
+    whose nearest tile centre is closest to the cell's centre and within
+    `interaction_range`, so a runtime check is one indexed read. Call
+    rebuild() when the map's tiles or the interaction range change.
+    """
+    def __init__(self, game_map, interaction_range, cell_size=BUILDING_LOOKUP_CELL_SIZE,
+                 tile_size=TILE_SIZE):
+        self.cell_size = cell_size
+        self.tile_size = tile_size
+        self.rebuild(game_map, interaction_range)
+
+    def rebuild(self, game_map=None, interaction_range=None):
+        """Recompute every cell, optionally for a new map or range"""
+        if game_map is not None:
+            self.game_map = game_map
+        if interaction_range is not None:
+            self.interaction_range = interaction_range
+        game_map = self.game_map
+
+        # Every building tile's centre, with an index into self.buildings
+        self.buildings = []
+        tile_x = []
+        tile_y = []
+        building_ids = []
+        for y in range(game_map.height):
+            for x in range(game_map.width):
+                building = game_map.get_building_at(x, y)
+                if building is None:
+                    continue
+                if building not in self.buildings:
+                    self.buildings.append(building)
+                tile_x.append(x)
+                tile_y.append(y)
+                building_ids.append(self.buildings.index(building))
+
+        self.columns = int(np.ceil(game_map.width * self.tile_size / self.cell_size))
+        self.rows = int(np.ceil(game_map.height * self.tile_size / self.cell_size))
+        self.cells = np.full((self.rows, self.columns), -1, dtype=np.int8)
+        if not building_ids:
+            return
+
+        centre_x = (np.array(tile_x) + 0.5) * self.tile_size
+        centre_y = (np.array(tile_y) + 0.5) * self.tile_size
+        cell_x = (np.arange(self.columns) + 0.5) * self.cell_size
+        cell_y = (np.arange(self.rows) + 0.5) * self.cell_size
+
+        # Squared distance from every cell to every building tile
+        dx = cell_x[None, :, None] - centre_x[None, None, :]
+        dy = cell_y[:, None, None] - centre_y[None, None, :]
+        distance_sq = dx * dx + dy * dy
+        nearest = np.argmin(distance_sq, axis=2)
+        in_range = np.take_along_axis(distance_sq, nearest[..., None], axis=2)[..., 0] \
+            < self.interaction_range ** 2
+        self.cells[in_range] = np.array(building_ids)[nearest[in_range]]
+
+    def get(self, x, y):
+        """Get the building in interaction range of a world position, or None"""
+        column = int(x // self.cell_size)
+        row = int(y // self.cell_size)
+        if 0 <= row < self.rows and 0 <= column < self.columns:
+            building = self.cells[row, column]
+            if building >= 0:
+                return self.buildings[building]
+        return None
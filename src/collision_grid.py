@@ -0,0 +1,271 @@
+import math
+import numpy as np
+from constants import TILE_SIZE
+
+
+class CollisionGrid:
+    """Flat walkability mask for fast collision queries against a tile map
+
+    Any non-zero tile blocks movement, and everything outside the map is
+    blocked. Tiles are stored one byte each in a bytearray with precomputed
+    row offsets, and the same memory is exposed as a NumPy array for the
+    batch queries. Positions are in world units unless a method says tiles.
+    """
+    def __init__(self, collision_map, width, height, tile_size=TILE_SIZE):
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.row_offsets = [y * width for y in range(height)]
+        self.blocked = bytearray(width * height)
+        self.mask = np.frombuffer(self.blocked, dtype=np.uint8)
+        self.rebuild(collision_map)
+
+    @classmethod
+    def from_map(cls, game_map):
+        """Build a grid from a map with collision_map, width and height"""
+        return cls(game_map.collision_map, game_map.width, game_map.height)
+
+    def rebuild(self, collision_map):
+        """Refresh the mask after the map's tiles change"""
+        for y in range(self.height):
+            offset = self.row_offsets[y]
+            row = collision_map[y]
+            for x in range(self.width):
+                self.blocked[offset + x] = 1 if row[x] != 0 else 0
+
+    def is_blocked_tile(self, tile_x, tile_y):
+        """Check a tile by tile coordinates"""
+        if 0 <= tile_x < self.width and 0 <= tile_y < self.height:
+            return self.blocked[self.row_offsets[tile_y] + tile_x] != 0
+        return True
+
+    def get_tile(self, x, y):
+        """Get the tile coordinates under a point"""
+        return int(x // self.tile_size), int(y // self.tile_size)
+
+    def is_blocked(self, x, y):
+        """Check the tile under a point"""
+        return self.is_blocked_tile(int(x // self.tile_size), int(y // self.tile_size))
+
+    def is_blocked_box(self, x, y, half_size):
+        """Check the corners of a square centred on a point
+
+        Exact for boxes no wider than a tile.
+        """
+        return (self.is_blocked(x - half_size, y - half_size) or
+                self.is_blocked(x + half_size, y - half_size) or
+                self.is_blocked(x - half_size, y + half_size) or
+                self.is_blocked(x + half_size, y + half_size))
+
+    def is_blocked_circle(self, x, y, radius):
+        """Check whether a circle overlaps any blocked tile"""
+        size = self.tile_size
+        min_x = int((x - radius) // size)
+        max_x = int((x + radius) // size)
+        min_y = int((y - radius) // size)
+        max_y = int((y + radius) // size)
+        radius_sq = radius * radius
+
+        for tile_y in range(min_y, max_y + 1):
+            for tile_x in range(min_x, max_x + 1):
+                if not self.is_blocked_tile(tile_x, tile_y):
+                    continue
+                # Distance from the centre to the nearest point of the tile
+                near_x = min(max(x, tile_x * size), (tile_x + 1) * size)
+                near_y = min(max(y, tile_y * size), (tile_y + 1) * size)
+                if (x - near_x) ** 2 + (y - near_y) ** 2 <= radius_sq:
+                    return True
+        return False
+
+    def is_blocked_segment(self, x0, y0, x1, y1):
+        """Check whether a segment passes through any blocked tile"""
+        return self.segment_block_fraction(x0, y0, x1, y1) is not None
+
+    def segment_block_fraction(self, x0, y0, x1, y1):
+        """Get how far along a segment (0 to 1) it first enters a blocked tile
+
+        Walks only the tiles the segment crosses, in order (grid DDA).
+        Returns None if the whole segment is clear.
+        """
+        size = self.tile_size
+        tile_x = int(x0 // size)
+        tile_y = int(y0 // size)
+        end_x = int(x1 // size)
+        end_y = int(y1 // size)
+
+        if self.is_blocked_tile(tile_x, tile_y):
+            return 0.0
+
+        dx = x1 - x0
+        dy = y1 - y0
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+
+        # Segment fraction to the first tile edge on each axis, and per tile
+        if dx != 0:
+            edge_x = (tile_x + 1) * size if dx > 0 else tile_x * size
+            t_max_x = (edge_x - x0) / dx
+            t_delta_x = size / abs(dx)
+        else:
+            t_max_x = t_delta_x = math.inf
+        if dy != 0:
+            edge_y = (tile_y + 1) * size if dy > 0 else tile_y * size
+            t_max_y = (edge_y - y0) / dy
+            t_delta_y = size / abs(dy)
+        else:
+            t_max_y = t_delta_y = math.inf
+
+        while (tile_x, tile_y) != (end_x, end_y):
+            if t_max_x < t_max_y:
+                t_enter = t_max_x
+                tile_x += step_x
+                t_max_x += t_delta_x
+            else:
+                t_enter = t_max_y
+                tile_y += step_y
+                t_max_y += t_delta_y
+            if t_enter > 1:
+                break
+
+            if self.is_blocked_tile(tile_x, tile_y):
+                return t_enter
+        return None
+
+    def tile_indices(self, xs, ys):
+        """Get flat mask indices for arrays of points, and which are in bounds"""
+        tile_x = np.floor_divide(xs, self.tile_size).astype(np.int64)
+        tile_y = np.floor_divide(ys, self.tile_size).astype(np.int64)
+        return self.tile_index_batch(tile_x, tile_y)
+
+    def tile_index_batch(self, tile_x, tile_y):
+        """Get flat mask indices for arrays of tile coordinates, and which are in bounds"""
+        inside = (tile_x >= 0) & (tile_x < self.width) & (tile_y >= 0) & (tile_y < self.height)
+        return np.where(inside, tile_y * self.width + tile_x, 0), inside
+
+    def is_blocked_batch(self, xs, ys):
+        """Check the tiles under arrays of points"""
+        index, inside = self.tile_indices(xs, ys)
+        return ~inside | (self.mask[index] != 0)
+
+    def is_blocked_tile_batch(self, tile_x, tile_y):
+        """Check arrays of tiles by tile coordinates"""
+        index, inside = self.tile_index_batch(tile_x, tile_y)
+        return ~inside | (self.mask[index] != 0)
+
+    def segment_block_fraction_batch(self, x0, y0, x1, y1):
+        """Batch segment_block_fraction for arrays of segments
+
+        Returns an array of fractions with inf for clear segments. Every
+        segment is stepped through its crossed tiles in lockstep, so the
+        loop runs once per tile crossed by the longest segment.
+        """
+        size = self.tile_size
+        tile_x = np.floor_divide(x0, size).astype(np.int64)
+        tile_y = np.floor_divide(y0, size).astype(np.int64)
+        end_x = np.floor_divide(x1, size).astype(np.int64)
+        end_y = np.floor_divide(y1, size).astype(np.int64)
+
+        fraction = np.full(np.shape(x0), np.inf)
+        fraction[self.is_blocked_tile_batch(tile_x, tile_y)] = 0.0
+
+        dx = x1 - x0
+        dy = y1 - y0
+        step_x = np.where(dx > 0, 1, -1)
+        step_y = np.where(dy > 0, 1, -1)
+
+        # Same per-axis edge fractions as the scalar walk, inf on still axes
+        with np.errstate(divide='ignore', invalid='ignore'):
+            edge_x = np.where(dx > 0, tile_x + 1, tile_x) * size
+            edge_y = np.where(dy > 0, tile_y + 1, tile_y) * size
+            t_max_x = np.where(dx != 0, (edge_x - x0) / dx, np.inf)
+            t_max_y = np.where(dy != 0, (edge_y - y0) / dy, np.inf)
+            t_delta_x = np.where(dx != 0, size / np.abs(dx), np.inf)
+            t_delta_y = np.where(dy != 0, size / np.abs(dy), np.inf)
+
+        active = np.isinf(fraction) & ((tile_x != end_x) | (tile_y != end_y))
+        while active.any():
+            step_along_x = active & (t_max_x < t_max_y)
+            step_along_y = active & ~step_along_x
+            t_enter = np.where(step_along_x, t_max_x, t_max_y)
+
+            tile_x += np.where(step_along_x, step_x, 0)
+            tile_y += np.where(step_along_y, step_y, 0)
+            t_max_x = np.where(step_along_x, t_max_x + t_delta_x, t_max_x)
+            t_max_y = np.where(step_along_y, t_max_y + t_delta_y, t_max_y)
+
+            active &= t_enter <= 1
+            hit = active & self.is_blocked_tile_batch(tile_x, tile_y)
+            fraction[hit] = t_enter[hit]
+            active &= ~hit & ((tile_x != end_x) | (tile_y != end_y))
+        return fraction
+
+    def is_blocked_circle_batch(self, xs, ys, radius):
+        """Check arrays of circles against blocked tiles
+
+        radius can be a scalar or an array and must be under one tile, so
+        each circle can only touch the 2x2 tiles around its centre.
+        """
+        size = self.tile_size
+        blocked = np.zeros(np.shape(xs), dtype=bool)
+        radius_sq = np.square(radius)
+
+        for corner_x in (-1, 1):
+            for corner_y in (-1, 1):
+                # Tile holding the circle's extreme point toward this corner
+                tile_x = np.floor_divide(xs + corner_x * radius, size)
+                tile_y = np.floor_divide(ys + corner_y * radius, size)
+                near_x = np.clip(xs, tile_x * size, (tile_x + 1) * size)
+                near_y = np.clip(ys, tile_y * size, (tile_y + 1) * size)
+                touches = (xs - near_x) ** 2 + (ys - near_y) ** 2 <= radius_sq
+                tile_blocked = self.is_blocked_batch(tile_x * size, tile_y * size)
+                blocked |= touches & tile_blocked
+        return blocked
+
+
+def segment_circle_fraction(x0, y0, x1, y1, center_x, center_y, radius):
+    """Get how far along a segment (0 to 1) it first touches a circle
+
+    Returns 0 if the segment starts inside the circle and None if it never
+    touches it.
+    """
+    dx = x1 - x0
+    dy = y1 - y0
+    offset_x = x0 - center_x
+    offset_y = y0 - center_y
+
+    c = offset_x * offset_x + offset_y * offset_y - radius * radius
+    if c <= 0:
+        return 0.0
+
+    a = dx * dx + dy * dy
+    if a == 0:
+        return None
+
+    b = 2 * (offset_x * dx + offset_y * dy)
+    discriminant = b * b - 4 * a * c
+    if discriminant < 0:
+        return None
+
+    t = (-b - math.sqrt(discriminant)) / (2 * a)
+    return t if 0 <= t <= 1 else None
+
+
+def segment_circle_fraction_batch(x0, y0, x1, y1, center_x, center_y, radius):
+    """Batch segment_circle_fraction for arrays, with inf where nothing is touched"""
+    dx = x1 - x0
+    dy = y1 - y0
+    offset_x = x0 - center_x
+    offset_y = y0 - center_y
+
+    a = dx * dx + dy * dy
+    b = 2 * (offset_x * dx + offset_y * dy)
+    c = offset_x * offset_x + offset_y * offset_y - np.square(radius)
+    discriminant = b * b - 4 * a * c
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = (-b - np.sqrt(np.maximum(discriminant, 0))) / (2 * a)
+    touches = (a > 0) & (discriminant >= 0) & (t >= 0) & (t <= 1)
+
+    fraction = np.where(touches, t, np.inf)
+    fraction[c <= 0] = 0.0
+    return fraction
@@ -0,0 +1,75 @@
+from typing import NamedTuple
+
+
+class HitEvent(NamedTuple):
+    """A spell struck a target, or a wall when target is None"""
+    target: object
+    damage: float
+    spell_type: str
+
+
+class DeathEvent(NamedTuple):
+    """An enemy or boss died and was removed"""
+    entity: object
+    score_value: int
+    is_boss: bool
+
+
+class SpawnEvent(NamedTuple):
+    """An enemy or boss entered the arena"""
+    entity: object
+    is_boss: bool
+
+
+class CastEvent(NamedTuple):
+    """The player cast a spell"""
+    spell_type: str
+
+
+class WaveCompleteEvent(NamedTuple):
+    """Every enemy of a wave is dead"""
+    wave: int
+
+
+class CombatEventBus:
+    """Per-tick queue of combat events drained in one batch
+
+    Entities and the arena push events as things happen instead of calling
+    sound, scoring or HUD code directly. dispatch() hands each subscriber
+    the list of this tick's events of the type it subscribed to, in push
+    order, so a subscriber can coalesce duplicates such as many hits in one
+    tick. `totals` counts every event dispatched by type.
+    """
+    def __init__(self):
+        self.queue = []
+        self.subscribers = {}
+        self.totals = {}
+
+    def push(self, event):
+        """Queue an event for the next dispatch"""
+        self.queue.append(event)
+
+    def subscribe(self, event_type, handler):
+        """Call handler(events) with each batch of event_type events"""
+        self.subscribers.setdefault(event_type, []).append(handler)
+
+    def clear(self):
+        """Drop queued events without dispatching them"""
+        self.queue.clear()
+
+    def dispatch(self):
+        """Hand the queued events to subscribers, returns how many there were"""
+        if not self.queue:
+            return 0
+
+        # Events pushed by handlers wait for the next dispatch
+        events, self.queue = self.queue, []
+        batches = {}
+        for event in events:
+            batches.setdefault(type(event), []).append(event)
+
+        for event_type, batch in batches.items():
+            self.totals[event_type] = self.totals.get(event_type, 0) + len(batch)
+            for handler in self.subscribers.get(event_type, ()):
+                handler(batch)
+        return len(events)
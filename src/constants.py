@@ -4,6 +4,13 @@ SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
 
+# Simulation runs in fixed ticks, independent of the display frame rate
+SIM_TICK_RATE = 60
+MAX_SUBSTEPS = 5
+
+# "surface" blits onto the display surface, "sdl2" uses the SDL Renderer
+RENDER_BACKEND = "surface"
+
 FOV = math.pi / 3 
 HALF_FOV = FOV / 2
 NUM_RAYS = SCREEN_WIDTH // 2
@@ -12,6 +19,69 @@ MAX_DEPTH = 20
 
 TILE_SIZE = 64
 
+# Billboard level of detail: distant or small sprites use a reduced image,
+# tiny ones a solid colour impostor (sizes in pixels)
+SPRITE_LOD_DISTANCE = 500
+SPRITE_LOD_MIN_SIZE = 24
+SPRITE_IMPOSTOR_SIZE = 6
+SPRITE_LOD_IMAGE_SIZE = 16
+
+# Most projectiles that can be in flight in the arena at once
+PROJECTILE_POOL_SIZE = 256
+
+# Most finished spells kept for reuse by the arena's spell pool
+SPELL_POOL_SIZE = 64
+
+# Spawn point tables: lattice spacing, wall clearance and ring/sector buckets
+SPAWN_POINT_SPACING = 16
+SPAWN_CLEARANCE = 8
+SPAWN_RINGS = 3
+SPAWN_SECTORS = 16
+
+# Open spawn points are also bucketed into square cells this size for
+# sampling around a position
+SPAWN_CELL_SIZE = TILE_SIZE
+
+# Enemies never spawn closer than this to the player
+SPAWN_SAFE_DISTANCE = 100
+
+# Wave spawns are spread over ticks: most per tick, real-time budget per
+# tick, and game time between batches
+SPAWNS_PER_TICK = 2
+SPAWN_TIME_BUDGET_MS = 2
+SPAWN_STAGGER_MS = 150
+
+# Waves covered by each archetype's precomputed stat scaling tables
+WAVE_TABLE_SIZE = 100
+
+# Enemy AI level of detail: tier distances, how often distant tiers think,
+# the per-tick AI time budget and the most time one update can catch up
+AI_NEAR_DISTANCE = 4 * TILE_SIZE
+AI_MID_DISTANCE = 8 * TILE_SIZE
+AI_VISIBLE_DISTANCE = 10 * TILE_SIZE
+AI_VIEW_MARGIN = 0.2
+AI_MID_INTERVAL = 2
+AI_FAR_INTERVAL = 4
+AI_TIME_BUDGET_MS = 2.0
+AI_MIN_SLICE = 8
+AI_MAX_DT = 0.25
+
+# Crowd separation: bucket size (at least the largest pair of radii),
+# spacing kept between enemies as a multiple of their sizes, and how hard
+# crowding pushes compared to walking speed
+CROWD_CELL_SIZE = TILE_SIZE
+CROWD_SPACING = 1.0
+CROWD_SEPARATION_WEIGHT = 2.0
+
+# Population budget for boss summons: most enemies and bosses in the arena
+# (queued spawns included), and how many summons one merged minion may
+# stand for when there is no room for each to have its own
+MAX_ARENA_POPULATION = 40
+MAX_SUMMON_STRENGTH = 4
+
+# Resolution of the precomputed nearest-building grid for town interactions
+BUILDING_LOOKUP_CELL_SIZE = TILE_SIZE // 8
+
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 RED = (255, 0, 0)
@@ -43,6 +113,14 @@ class EnemyType:
     TROLL = "troll"
     DEMON = "demon"
 
+# Most live or queued enemies of each type that summons may add up to
+SUMMON_TYPE_CAPS = {
+    EnemyType.SKELETON: 12,
+    EnemyType.ORC: 10,
+    EnemyType.TROLL: 6,
+    EnemyType.DEMON: 8,
+}
+
 class BossType:
     NECROMANCER = "necromancer"
     ORC_CHIEFTAIN = "orc_chieftain"
@@ -0,0 +1,79 @@
+import numpy as np
+from constants import *
+
+
+def neighbour_pairs(x, y, cell_size=CROWD_CELL_SIZE):
+    """Get every pair of agents in the same or adjacent grid cells
+
+    Agents are bucketed by sorting on a cell key, and each agent finds the
+    agents in its 3x3 block of cells with binary searches, so the work is
+    linear in agents for a bounded crowd density. Returns index arrays i
+    and j with each ordered pair once and no self pairs.
+    """
+    cell_x = np.floor_divide(x, cell_size).astype(np.int64)
+    cell_y = np.floor_divide(y, cell_size).astype(np.int64)
+
+    # Shift cells so every neighbour key is non-negative and unique
+    cell_x -= cell_x.min() - 1
+    cell_y -= cell_y.min() - 1
+    stride = cell_y.max() + 2
+    key = cell_x * stride + cell_y
+
+    order = np.argsort(key, kind='stable')
+    sorted_key = key[order]
+    agents = np.arange(len(x))
+
+    pairs_i = []
+    pairs_j = []
+    for offset_x in (-1, 0, 1):
+        for offset_y in (-1, 0, 1):
+            neighbour_key = key + offset_x * stride + offset_y
+            start = np.searchsorted(sorted_key, neighbour_key, 'left')
+            counts = np.searchsorted(sorted_key, neighbour_key, 'right') - start
+            total = counts.sum()
+            if total == 0:
+                continue
+
+            # Expand each agent's run of neighbours into flat pair lists
+            first = np.repeat(np.cumsum(counts) - counts, counts)
+            position = np.repeat(start, counts) + np.arange(total) - first
+            pairs_i.append(np.repeat(agents, counts))
+            pairs_j.append(order[position])
+
+    if not pairs_i:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    i = np.concatenate(pairs_i)
+    j = np.concatenate(pairs_j)
+    distinct = i != j
+    return i[distinct], j[distinct]
+
+
+def separation_push(x, y, radius, cell_size=CROWD_CELL_SIZE):
+    """Get a push away from overlapping neighbours for every agent
+
+    Agents i and j overlap when closer than radius[i] + radius[j]. Each
+    overlap pushes i directly away from j, weighted from 1 when stacked to
+    0 when just touching, and the pushes are summed. Exactly stacked agents
+    are split along x by index.
+    """
+    count = len(x)
+    if count < 2:
+        return np.zeros(count), np.zeros(count)
+
+    i, j = neighbour_pairs(x, y, cell_size)
+    dx = x[i] - x[j]
+    dy = y[i] - y[j]
+    distance = np.sqrt(dx * dx + dy * dy)
+    reach = radius[i] + radius[j]
+    close = distance < reach
+    i, j, dx, dy = i[close], j[close], dx[close], dy[close]
+    distance, reach = distance[close], reach[close]
+
+    stacked = distance == 0
+    dx[stacked] = np.where(i[stacked] < j[stacked], -1.0, 1.0)
+    distance[stacked] = 1.0
+
+    weight = (1 - distance / reach) / distance
+    push_x = np.bincount(i, weights=dx * weight, minlength=count)
+    push_y = np.bincount(i, weights=dy * weight, minlength=count)
+    return push_x, push_y
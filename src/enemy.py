@@ -1,10 +1,40 @@
 import math
 import pygame
 from constants import *
+from entity_stats import EnemyArchetype, ENEMY_STATS
+from projectile_pool import ProjectilePool
+from enemy_store import EnemyStore, EnemyColumn, EnemyFlag, ENEMY_TYPE_IDS, FLAG_ALIVE
 
 
 class Enemy:
+    """Thin proxy over one row of an EnemyStore
+
+    A new enemy starts detached, holding its row in a plain dict, and moves
+    the row into the arena's store when appended to it.
+    """
+    __slots__ = (
+        '_store', '_row', 'archetype', 'owner_id',
+        # Per-type constants copied from the archetype
+        'enemy_type', 'stats', 'image', 'size', 'score_value',
+        'attack_range', 'attack_cooldown', 'is_ranged',
+    )
+    
     enemy_images = {}
+    archetypes = {}
+    projectile_speed = 200
+    projectile_hit_radius = 20
+    
+    # Per-enemy state kept in store columns
+    x = EnemyColumn()
+    y = EnemyColumn()
+    health = EnemyColumn()
+    max_health = EnemyColumn()
+    speed = EnemyColumn()
+    attack_damage = EnemyColumn()
+    last_attack = EnemyColumn()
+    speed_scale = EnemyColumn()
+    handle = EnemyColumn()
+    alive = EnemyFlag(FLAG_ALIVE)
     
     @classmethod
     def load_images(cls):
@@ -30,69 +60,59 @@ class Enemy:
                 surface.fill(color)
                 cls.enemy_images[enemy_type] = surface
 
-    def __init__(self, x: float, y: float, enemy_type: str = EnemyType.SKELETON):
-        self.x = x
-        self.y = y
+    @classmethod
+    def get_archetype(cls, enemy_type):
+        """Get the shared archetype for a type, building it on first use"""
+        archetype = cls.archetypes.get(enemy_type)
+        if archetype is None:
+            if not cls.enemy_images:
+                cls.load_images()
+            size = ENEMY_STATS[enemy_type].size
+            sprite = pygame.transform.scale(cls.enemy_images[enemy_type], (size * 2, size * 2))
+            try:
+                sprite = sprite.convert_alpha()
+            except pygame.error:
+                pass  # No display yet, keep the unconverted sprite
+            archetype = cls.archetypes[enemy_type] = EnemyArchetype.build(enemy_type, sprite)
+        return archetype
+
+    def __init__(self, x: float, y: float, enemy_type: str = EnemyType.SKELETON, wave=None):
+        self.archetype = archetype = Enemy.get_archetype(enemy_type)
+        
+        # Constants shared by every enemy of the type, copied into slots so
+        # reads are a plain attribute lookup
+        self.stats = stats = archetype.stats
         self.enemy_type = enemy_type
-
-        # Set stats based on enemy type
-        if enemy_type == EnemyType.SKELETON:
-            self.health = 75
-            self.max_health = 75
-            self.speed = 40
-            self.attack_damage = 15
-            self.size = 15
-            self.score_value = 15 
-            self.attack_range = 45
-            self.is_ranged = False
-        elif enemy_type == EnemyType.ORC:
-            self.health = 100
-            self.max_health = 120
-            self.speed = 35
-            self.attack_damage = 25
-            self.size = 18
-            self.score_value = 20  
-            self.attack_range = 45
-            self.is_ranged = False
-        elif enemy_type == EnemyType.TROLL:
-            self.health = 120
-            self.max_health = 200
-            self.speed = 25
-            self.attack_damage = 40
-            self.size = 25
-            self.score_value = 45  
-            self.attack_range = 45
-            self.is_ranged = False
-        elif enemy_type == EnemyType.DEMON:
-            self.health = 150
-            self.max_health = 150
-            self.speed = 50
-            self.attack_damage = 30
-            self.size = 20
-            self.score_value = 60  
-            self.attack_range = 120 
-            self.is_ranged = True
-
-        # Load sprite
-        if not Enemy.enemy_images:
-            Enemy.load_images()
-            
-        self.image = pygame.transform.scale(
-            Enemy.enemy_images[self.enemy_type], (self.size * 2, self.size * 2)
+        self.image = archetype.sprite
+        self.size = stats.size
+        self.score_value = stats.score_value
+        self.attack_range = stats.attack_range
+        self.attack_cooldown = stats.attack_cooldown
+        self.is_ranged = stats.is_ranged
+        
+        # Base stats for summons, scaled by the wave for wave spawns
+        if wave is None:
+            health, max_health, attack_damage = stats.health, stats.max_health, stats.attack_damage
+        else:
+            health = max_health = archetype.health_for_wave(wave)
+            attack_damage = archetype.damage_for_wave(wave)
+        EnemyStore.detach(
+            self, x=x, y=y, health=health, max_health=max_health,
+            speed=stats.speed, attack_damage=attack_damage, last_attack=0,
+            type_id=ENEMY_TYPE_IDS[enemy_type], flags=FLAG_ALIVE,
+            handle=EnemyStore.new_handle()
         )
-        self.rect = self.image.get_rect(center=(self.x, self.y))
-
-        # Combat timers
-        self.last_attack = 0
-        self.attack_cooldown = 2000  
-        self.alive = True
         
-        # Projectile system
-        self.projectiles = []
-        self.projectile_speed = 200
+        # Identifies this enemy's shots in the arena projectile pool
+        self.owner_id = ProjectilePool.new_owner_id()
 
-    def update(self, player, dt, current_time):
-        """Update enemy behavior"""
+    @property
+    def rect(self):
+        """Get the sprite rect centred on the current position"""
+        return self.image.get_rect(center=(self.x, self.y))
+
+    def update(self, player, dt, current_time, collision_grid, projectiles, flow_field=None):
+        """Update this enemy on its own (the arena updates its whole store at once)"""
         if not self.alive:
             return
 
@@ -103,37 +123,39 @@ class Enemy:
         # Ranged enemy behavior
         if self.is_ranged:
             if distance > self.attack_range:
-                self.move_towards_player(player, dt, distance, dx, dy)
+                self.move_towards_player(player, dt, distance, dx, dy, collision_grid, flow_field)
             elif distance < 80:
-                self.move_away_from_player(player, dt, distance, dx, dy)
+                self.move_away_from_player(player, dt, distance, dx, dy, collision_grid)
             
             if distance <= self.attack_range and current_time - self.last_attack > self.attack_cooldown:
-                self.ranged_attack(player, current_time)
+                self.ranged_attack(player, current_time, projectiles)
         # Melee enemy behavior
         else:
             if distance > self.attack_range:
-                self.move_towards_player(player, dt, distance, dx, dy)
+                self.move_towards_player(player, dt, distance, dx, dy, collision_grid, flow_field)
             elif current_time - self.last_attack > self.attack_cooldown:
                 self.melee_attack(player, current_time)
-        
-        if self.is_ranged:
-            self.update_projectiles(dt, player)
 
-    def move_towards_player(self, player, dt, distance, dx, dy):
+    def move_towards_player(self, player, dt, distance, dx, dy, collision_grid, flow_field=None):
         """Move towards the player"""
         if distance > 0:
             dx /= distance
             dy /= distance
+            
+            # Follow the flow field around walls when there is one
+            if flow_field is not None:
+                direction = flow_field.get_direction(self.x, self.y)
+                if direction is not None:
+                    dx, dy = direction
 
             new_x = self.x + dx * self.speed * dt
             new_y = self.y + dy * self.speed * dt
 
-            if not self.check_collision(new_x, new_y):
+            if not collision_grid.is_blocked(new_x, new_y):
                 self.x = new_x
                 self.y = new_y
-                self.rect.center = (self.x, self.y)
 
-    def move_away_from_player(self, player, dt, distance, dx, dy):
+    def move_away_from_player(self, player, dt, distance, dx, dy, collision_grid):
         """Move away from the player (for ranged enemies)"""
         if distance > 0:
             dx /= distance
@@ -142,69 +164,25 @@ class Enemy:
             new_x = self.x - dx * self.speed * 0.5 * dt 
             new_y = self.y - dy * self.speed * 0.5 * dt
 
-            if not self.check_collision(new_x, new_y):
+            if not collision_grid.is_blocked(new_x, new_y):
                 self.x = new_x
                 self.y = new_y
-                self.rect.center = (self.x, self.y)
 
     def melee_attack(self, player, current_time):
         """Perform melee attack"""
         player.take_damage(self.attack_damage)
         self.last_attack = current_time
 
-    def ranged_attack(self, player, current_time):
-        """Perform ranged attack by creating a projectile"""
+    def ranged_attack(self, player, current_time, projectiles):
+        """Perform ranged attack by firing into the projectile pool"""
         dx = player.x - self.x
         dy = player.y - self.y
         angle = math.atan2(dy, dx)
         
-        projectile = {
-            'x': self.x,
-            'y': self.y,
-            'angle': angle,
-            'damage': self.attack_damage,
-            'alive': True
-        }
-        self.projectiles.append(projectile)
+        projectiles.spawn(self.x, self.y, angle, self.projectile_speed,
+                          self.attack_damage, self.projectile_hit_radius, self.owner_id)
         self.last_attack = current_time
 
-    def update_projectiles(self, dt, player):
-        """Update enemy projectiles"""
-        for projectile in self.projectiles[:]:  
-            if not projectile['alive']:
-                self.projectiles.remove(projectile)
-                continue
-                
-            # Move projectile
-            projectile['x'] += math.cos(projectile['angle']) * self.projectile_speed * dt
-            projectile['y'] += math.sin(projectile['angle']) * self.projectile_speed * dt
-            
-            # Check collision with player
-            dx = projectile['x'] - player.x
-            dy = projectile['y'] - player.y
-            distance = math.sqrt(dx * dx + dy * dy)
-            
-            if distance < 20:  
-                player.take_damage(projectile['damage'])
-                projectile['alive'] = False
-                
-            elif self.check_collision(projectile['x'], projectile['y']):
-                projectile['alive'] = False
-
-    def check_collision(self, x: float, y: float) -> bool:
-        """Collision check with arena bounds"""
-        map_x = int(x // TILE_SIZE)
-        map_y = int(y // TILE_SIZE)
-
-        if map_x < 0 or map_x >= 20 or map_y < 0 or map_y >= 20:
-            return True
-
-        # Check circular arena boundary
-        center_x, center_y = 10, 10
-        distance = math.sqrt((map_x - center_x) ** 2 + (map_y - center_y) ** 2)
-
-        return distance > 8
-
     def take_damage(self, damage):
         """Take damage and check if enemy dies"""
         self.health -= damage
@@ -225,13 +203,3 @@ class Enemy:
         """Render the enemy on screen"""
         if self.alive:
             surface.blit(self.image, self.rect)
-
-    def draw_projectiles_2d(self, surface, camera_x=0, camera_y=0):
-        """Draw enemy projectiles in 2D (for debugging/minimap)"""
-        for projectile in self.projectiles:
-            if projectile['alive']:
-                proj_x = int(projectile['x'] - camera_x)
-                proj_y = int(projectile['y'] - camera_y)
-                
-                pygame.draw.circle(surface, RED, (proj_x, proj_y), 3)
-                pygame.draw.circle(surface, YELLOW, (proj_x, proj_y), 1)
\ No newline at end of file
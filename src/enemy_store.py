@@ -0,0 +1,352 @@
+import itertools
+import numpy as np
+from constants import *
+from entity_stats import ENEMY_STATS
+from crowd import separation_push
+
+ENEMY_TYPES = [EnemyType.SKELETON, EnemyType.ORC, EnemyType.TROLL, EnemyType.DEMON]
+ENEMY_TYPE_IDS = {enemy_type: i for i, enemy_type in enumerate(ENEMY_TYPES)}
+ENEMY_TYPE_STATS = [ENEMY_STATS[enemy_type] for enemy_type in ENEMY_TYPES]
+
+# Bits in the flags column
+FLAG_ALIVE = 1
+
+
+class EnemyColumn:
+    """Proxy attribute that lives in the owning EnemyStore's column"""
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, enemy, owner=None):
+        if enemy is None:
+            return self
+        store = enemy._store
+        if store is None:
+            return enemy._row[self.name]
+        return store.columns[self.name].item(enemy._row)
+
+    def __set__(self, enemy, value):
+        store = enemy._store
+        if store is None:
+            enemy._row[self.name] = value
+        else:
+            store.columns[self.name][enemy._row] = value
+
+
+class EnemyFlag:
+    """Proxy boolean that lives in one bit of the flags column"""
+    def __init__(self, bit):
+        self.bit = bit
+
+    def __get__(self, enemy, owner=None):
+        if enemy is None:
+            return self
+        store = enemy._store
+        if store is None:
+            return bool(enemy._row['flags'] & self.bit)
+        return bool(store.columns['flags'].item(enemy._row) & self.bit)
+
+    def __set__(self, enemy, value):
+        if enemy._store is None:
+            flags, row = enemy._row, 'flags'
+        else:
+            flags, row = enemy._store.columns['flags'], enemy._row
+        if value:
+            flags[row] |= self.bit
+        else:
+            flags[row] &= ~self.bit & 0xFF
+
+
+class EnemyStore:
+    """Struct-of-arrays enemy storage with vectorized AI
+
+    Every enemy is one row across a set of NumPy columns. Live rows are
+    packed at 0..count-1 and removal swaps the last row into the hole. Each
+    row is owned by an Enemy proxy that reads and writes its columns, so the
+    store also behaves like the arena's list of enemies. row_of maps each
+    live handle to its row and is kept up to date by add() and remove().
+
+    A proxy outside any store is detached: its _store is None and its _row
+    is a plain dict of column values, so spawning and removing enemies
+    never allocates columns.
+    """
+    COLUMNS = {
+        'x': np.float64,
+        'y': np.float64,
+        'prev_x': np.float64,
+        'prev_y': np.float64,
+        'health': np.float64,
+        'max_health': np.float64,
+        'speed': np.float64,
+        'attack_damage': np.float64,
+        'last_attack': np.float64,
+        'ai_dt': np.float64,
+        'push_x': np.float64,
+        'push_y': np.float64,
+        'speed_scale': np.float64,
+        'handle': np.int64,
+        'type_id': np.int8,
+        'flags': np.uint8,
+    }
+
+    # Constant per-type stats, indexed by the type_id column
+    TYPE_COLUMNS = {
+        'attack_range': np.array([stats.attack_range for stats in ENEMY_TYPE_STATS], dtype=np.float64),
+        'attack_cooldown': np.array([stats.attack_cooldown for stats in ENEMY_TYPE_STATS], dtype=np.float64),
+        'is_ranged': np.array([stats.is_ranged for stats in ENEMY_TYPE_STATS], dtype=bool),
+        'size': np.array([stats.size for stats in ENEMY_TYPE_STATS], dtype=np.float64),
+    }
+
+    # Ranged enemies back off when the player is closer than this
+    RETREAT_DISTANCE = 80
+
+    # Handles that identify an enemy for its whole life, across stores
+    handle_ids = itertools.count(1)
+
+    def __init__(self, capacity=64):
+        self.capacity = max(1, capacity)
+        self.count = 0
+        self.proxies = []
+        self.row_of = {}
+        self.columns = {
+            name: np.zeros(self.capacity, dtype=dtype) for name, dtype in self.COLUMNS.items()
+        }
+
+    @classmethod
+    def new_handle(cls):
+        """Get a unique enemy handle"""
+        return next(cls.handle_ids)
+
+    def grow(self):
+        """Double the capacity of every column"""
+        self.capacity *= 2
+        for name, column in self.columns.items():
+            grown = np.zeros(self.capacity, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            self.columns[name] = grown
+
+    @classmethod
+    def detach(cls, proxy, **values):
+        """Give proxy a detached dict row, with defaults for missing columns"""
+        row = dict.fromkeys(cls.COLUMNS, 0)
+        row['prev_x'] = values.get('x', 0)
+        row['prev_y'] = values.get('y', 0)
+        row['speed_scale'] = 1.0
+        row.update(values)
+        proxy._store = None
+        proxy._row = row
+
+    def add(self, proxy, **values):
+        """Add a row owned by proxy and return its index"""
+        if self.count == self.capacity:
+            self.grow()
+
+        row = self.count
+        values.setdefault('prev_x', values.get('x', 0))
+        values.setdefault('prev_y', values.get('y', 0))
+        values.setdefault('speed_scale', 1.0)
+        for name, column in self.columns.items():
+            column[row] = values.get(name, 0)
+
+        self.count += 1
+        self.proxies.append(proxy)
+        self.row_of[self.columns['handle'].item(row)] = row
+        proxy._store = self
+        proxy._row = row
+        return row
+
+    def copy_row(self, row):
+        """Get a row's values as a dict of Python scalars"""
+        return {name: column.item(row) for name, column in self.columns.items()}
+
+    def append(self, enemy):
+        """Move an enemy's row into this store"""
+        if enemy._store is self:
+            return
+        if enemy._store is None:
+            values = enemy._row
+        else:
+            values = enemy._store.copy_row(enemy._row)
+        self.add(enemy, **values)
+
+    def remove(self, enemy):
+        """Remove an enemy in O(1) by moving the last row into its place"""
+        row = enemy._row
+        last = self.count - 1
+        del self.row_of[self.columns['handle'].item(row)]
+
+        # Keep the removed proxy readable through a detached row
+        enemy._row = self.copy_row(row)
+        enemy._store = None
+
+        if row != last:
+            for column in self.columns.values():
+                column[row] = column[last]
+            moved = self.proxies[last]
+            self.proxies[row] = moved
+            moved._row = row
+            self.row_of[self.columns['handle'].item(row)] = row
+
+        self.proxies.pop()
+        self.count -= 1
+
+    def clear(self):
+        """Remove every enemy"""
+        for enemy in self.proxies[::-1]:
+            self.remove(enemy)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.proxies)
+
+    def __getitem__(self, index):
+        return self.proxies[index]
+
+    def view(self, name):
+        """Get the live part of a column"""
+        return self.columns[name][:self.count]
+
+    def column_lists(self, *names):
+        """Get live columns as Python lists, indexed by row
+
+        Per-enemy Python loops (rendering, the minimap, health bars) read
+        these once per frame instead of going through the proxies.
+        """
+        return [self.view(name).tolist() for name in names]
+
+    def save_previous(self):
+        """Remember every position as the previous tick's"""
+        self.view('prev_x')[:] = self.view('x')
+        self.view('prev_y')[:] = self.view('y')
+
+    def apply_interpolation(self, alpha):
+        """Move every enemy between its previous and current position for drawing"""
+        self.saved_positions = (self.view('x').copy(), self.view('y').copy())
+        for name in ('x', 'y'):
+            current = self.view(name)
+            previous = self.view('prev_' + name)
+            current[:] = previous + (current - previous) * alpha
+
+    def restore_interpolation(self):
+        """Put back the positions replaced by apply_interpolation"""
+        saved_x, saved_y = self.saved_positions
+        self.view('x')[:] = saved_x
+        self.view('y')[:] = saved_y
+
+    def type_view(self, name):
+        """Get a per-type stat for every live row"""
+        return self.TYPE_COLUMNS[name][self.view('type_id')]
+
+    def rows_of(self, handles):
+        """Get the rows holding an array of handles, and which were found"""
+        row_of = self.row_of
+        rows = np.array([row_of.get(handle, -1) for handle in np.asarray(handles).tolist()],
+                        dtype=np.int64)
+        found = rows >= 0
+        rows[~found] = 0
+        return rows, found
+
+    def get_dead(self):
+        """Get the enemies whose alive flag has been cleared"""
+        dead_rows = np.flatnonzero((self.view('flags') & FLAG_ALIVE) == 0)
+        return [self.proxies[row] for row in dead_rows]
+
+    def update_separation(self):
+        """Work out every enemy's push away from crowding neighbours"""
+        alive = (self.view('flags') & FLAG_ALIVE) != 0
+        rows = np.flatnonzero(alive)
+        self.view('push_x')[:] = 0.0
+        self.view('push_y')[:] = 0.0
+        if len(rows) < 2:
+            return
+
+        radius = self.TYPE_COLUMNS['size'][self.view('type_id')[rows]] * CROWD_SPACING
+        push_x, push_y = separation_push(self.view('x')[rows], self.view('y')[rows], radius)
+
+        # A push is at most walking speed however many neighbours crowd in
+        scale = 1 / np.maximum(np.hypot(push_x, push_y), 1.0)
+        self.view('push_x')[rows] = push_x * scale
+        self.view('push_y')[rows] = push_y * scale
+
+    def update(self, player, dt, current_time, collision_grid, projectiles, flow_field=None,
+               rows=None, line_of_sight=None):
+        """Run one AI step for live enemies as whole-column passes
+
+        rows limits the step to those row indices, and dt can then be an
+        array holding each row's own time step. With a line_of_sight table,
+        ranged enemies only shoot when they can see the player and close in
+        until they do.
+        """
+        if rows is None:
+            rows = np.arange(self.count)
+        n = len(rows)
+        if n == 0:
+            return
+
+        x = self.view('x')[rows]
+        y = self.view('y')[rows]
+        speed = self.view('speed')[rows] * self.view('speed_scale')[rows]
+        last_attack = self.view('last_attack')[rows]
+        flags = self.view('flags')[rows]
+        type_id = self.view('type_id')[rows]
+
+        alive = (flags & FLAG_ALIVE) != 0
+        ranged = self.TYPE_COLUMNS['is_ranged'][type_id]
+
+        dx = player.x - x
+        dy = player.y - y
+        distance = np.sqrt(dx * dx + dy * dy)
+
+        out_of_range = distance > self.TYPE_COLUMNS['attack_range'][type_id]
+        attack_ready = current_time - last_attack > self.TYPE_COLUMNS['attack_cooldown'][type_id]
+
+        if line_of_sight is not None:
+            blind = ranged & ~line_of_sight.visible_from_batch(x, y, player.x, player.y)
+        else:
+            blind = np.zeros(n, dtype=bool)
+
+        # Seek when out of range or out of sight, ranged enemies retreat when crowded
+        seek = alive & (out_of_range | blind)
+        retreat = alive & ranged & ~blind & ~out_of_range & (distance < self.RETREAT_DISTANCE)
+        attack = alive & ~out_of_range & ~blind & attack_ready & (speed > 0)
+
+        step = np.where(seek, speed * dt, 0.0)
+        step = np.where(retreat, -speed * 0.5 * dt, step)
+        moving = (step != 0) & (distance > 0)
+
+        # Head straight at the player, or along the flow field when seeking
+        direction_x = np.zeros(n)
+        direction_y = np.zeros(n)
+        np.divide(dx, distance, out=direction_x, where=moving)
+        np.divide(dy, distance, out=direction_y, where=moving)
+        if flow_field is not None:
+            flow_x, flow_y, has_flow = flow_field.get_direction_batch(x, y)
+            follow = seek & has_flow
+            direction_x[follow] = flow_x[follow]
+            direction_y[follow] = flow_y[follow]
+
+        new_x = x + direction_x * step
+        new_y = y + direction_y * step
+
+        # Spread out from crowding neighbours, or just steer if that hits a wall
+        spread = speed * dt * CROWD_SEPARATION_WEIGHT
+        spread_x = new_x + self.view('push_x')[rows] * spread
+        spread_y = new_y + self.view('push_y')[rows] * spread
+        pushed = alive & ~collision_grid.is_blocked_batch(spread_x, spread_y)
+        new_x = np.where(pushed, spread_x, new_x)
+        new_y = np.where(pushed, spread_y, new_y)
+
+        move = (moving | pushed) & ~collision_grid.is_blocked_batch(new_x, new_y)
+        self.view('x')[rows[move]] = new_x[move]
+        self.view('y')[rows[move]] = new_y[move]
+
+        # Attacks are rare per tick, so they go through the proxies
+        for i in np.flatnonzero(attack):
+            row = rows[i]
+            enemy = self.proxies[row]
+            if ranged[i]:
+                enemy.ranged_attack(player, current_time, projectiles)
+            else:
+                enemy.melee_attack(player, current_time)
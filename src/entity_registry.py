@@ -0,0 +1,87 @@
+# Low bits of a handle are the slot, the rest is the slot's generation
+HANDLE_SLOT_BITS = 20
+HANDLE_SLOT_MASK = (1 << HANDLE_SLOT_BITS) - 1
+
+
+class EntityRegistry:
+    """Dense entity storage addressed by generational integer handles
+
+    Entities are packed in a list for fast iteration, and removal swaps the
+    last entity into the hole in O(1). A handle names a slot plus the
+    generation the slot had when the entity was added. Removing bumps the
+    generation, so get() on an old handle returns None instead of whatever
+    reuses the slot. Added entities need a `handle` attribute, which the
+    registry sets.
+
+    Iterate by index from the end when removing during the loop: the entity
+    swapped into a removed position has already been visited.
+    """
+    def __init__(self):
+        self.items = []
+        self.generations = []
+        self.dense_index = []
+        self.slot_of = []
+        self.free = []
+
+    def add(self, entity):
+        """Store an entity and return its handle"""
+        if self.free:
+            slot = self.free.pop()
+        else:
+            slot = len(self.generations)
+            self.generations.append(0)
+            self.dense_index.append(-1)
+
+        self.dense_index[slot] = len(self.items)
+        self.items.append(entity)
+        self.slot_of.append(slot)
+        entity.handle = handle = (self.generations[slot] << HANDLE_SLOT_BITS) | slot
+        return handle
+
+    def get(self, handle):
+        """Get the entity for a handle, or None if it has been removed"""
+        if handle is None:
+            return None
+        slot = handle & HANDLE_SLOT_MASK
+        if slot >= len(self.generations) or self.generations[slot] != handle >> HANDLE_SLOT_BITS:
+            return None
+        return self.items[self.dense_index[slot]]
+
+    def remove(self, handle):
+        """Remove an entity by handle in O(1), returns False if it was already gone"""
+        if self.get(handle) is None:
+            return False
+
+        slot = handle & HANDLE_SLOT_MASK
+        index = self.dense_index[slot]
+        last = len(self.items) - 1
+        if index != last:
+            moved_slot = self.slot_of[last]
+            self.items[index] = self.items[last]
+            self.slot_of[index] = moved_slot
+            self.dense_index[moved_slot] = index
+        self.items.pop()
+        self.slot_of.pop()
+
+        self.dense_index[slot] = -1
+        self.generations[slot] += 1
+        self.free.append(slot)
+        return True
+
+    def clear(self):
+        """Remove every entity, invalidating all handles"""
+        for slot in self.slot_of:
+            self.dense_index[slot] = -1
+            self.generations[slot] += 1
+            self.free.append(slot)
+        self.items.clear()
+        self.slot_of.clear()
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
@@ -0,0 +1,176 @@
+from typing import Any, NamedTuple, Optional, Tuple
+from constants import *
+
+
+class EnemyStats(NamedTuple):
+    """Starting and constant stats shared by every enemy of one type"""
+    health: float
+    max_health: float
+    speed: float
+    attack_damage: float
+    size: int
+    score_value: int
+    attack_range: float
+    attack_cooldown: float
+    is_ranged: bool
+
+
+class BossStats(NamedTuple):
+    """Starting and constant stats shared by every boss of one type"""
+    health: float
+    max_health: float
+    speed: float
+    attack_damage: float
+    color: Tuple[int, int, int]
+    size: int
+    score_value: int
+    special_ability: str
+    is_ranged: bool
+    attack_range: float
+    special_ability_cooldown: float
+
+
+class SpellStats(NamedTuple):
+    """Constant stats shared by every spell of one type"""
+    speed: float
+    damage: float
+    color: Tuple[int, int, int]
+    size: int
+    # Status effect left on the target, see status_effects.EFFECT_NAMES
+    effect: Optional[str] = None
+    effect_strength: float = 0
+    effect_duration: int = 0
+
+
+ENEMY_STATS = {
+    EnemyType.SKELETON: EnemyStats(
+        health=75, max_health=75, speed=40, attack_damage=15, size=15,
+        score_value=15, attack_range=45, attack_cooldown=2000, is_ranged=False
+    ),
+    EnemyType.ORC: EnemyStats(
+        health=100, max_health=120, speed=35, attack_damage=25, size=18,
+        score_value=20, attack_range=45, attack_cooldown=2000, is_ranged=False
+    ),
+    EnemyType.TROLL: EnemyStats(
+        health=120, max_health=200, speed=25, attack_damage=40, size=25,
+        score_value=45, attack_range=45, attack_cooldown=2000, is_ranged=False
+    ),
+    EnemyType.DEMON: EnemyStats(
+        health=150, max_health=150, speed=50, attack_damage=30, size=20,
+        score_value=60, attack_range=120, attack_cooldown=2000, is_ranged=True
+    ),
+}
+
+BOSS_STATS = {
+    BossType.NECROMANCER: BossStats(
+        health=300, max_health=300, speed=30, attack_damage=40, color=PURPLE, size=35,
+        score_value=150, special_ability="summon_skeletons", is_ranged=True,
+        attack_range=150, special_ability_cooldown=2000
+    ),
+    BossType.ORC_CHIEFTAIN: BossStats(
+        health=500, max_health=800, speed=60, attack_damage=20, color=DARK_GREEN, size=40,
+        score_value=200, special_ability="berserker_rage", is_ranged=False,
+        attack_range=60, special_ability_cooldown=8000
+    ),
+    BossType.ANCIENT_TROLL: BossStats(
+        health=600, max_health=600, speed=25, attack_damage=80, color=DARK_BROWN, size=50,
+        score_value=300, special_ability="create_decoy", is_ranged=False,
+        attack_range=70, special_ability_cooldown=8000
+    ),
+    BossType.DEMON_LORD: BossStats(
+        health=1200, max_health=1200, speed=70, attack_damage=85, color=DARK_RED, size=45,
+        score_value=450, special_ability="demon_summon", is_ranged=True,
+        attack_range=200, special_ability_cooldown=5000
+    ),
+}
+
+SPELL_STATS = {
+    "fireball": SpellStats(speed=300, damage=100, color=ORANGE, size=8,
+                           effect="burn", effect_strength=10, effect_duration=3000),
+    "lightning": SpellStats(speed=500, damage=40, color=YELLOW, size=6,
+                            effect="stun", effect_strength=1, effect_duration=500),
+    "ice": SpellStats(speed=250, damage=80, color=LIGHT_BLUE, size=10,
+                      effect="slow", effect_strength=0.5, effect_duration=2500),
+    # Instant cast spells have no speed, negative damage heals
+    "heal": SpellStats(speed=0, damage=-50, color=GREEN, size=15),
+    "shield": SpellStats(speed=0, damage=0, color=PURPLE, size=20),
+    "teleport": SpellStats(speed=0, damage=0, color=(255, 0, 255), size=12),
+}
+
+
+def enemy_wave_multipliers(wave):
+    """Get the health and damage multipliers for enemies spawned in a wave"""
+    return 1.0 + (wave - 1) * 0.3, 1.0 + (wave - 1) * 0.2
+
+
+def boss_wave_multiplier(wave):
+    """Get the health and damage multiplier for a wave's boss"""
+    return 1.0 + ((wave - 5) // 5) * 0.5
+
+
+class EnemyArchetype(NamedTuple):
+    """Everything shared by enemies of one type, built once per type
+
+    wave_health and wave_damage hold the scaled stats for waves 0 to
+    WAVE_TABLE_SIZE - 1, later waves are computed on demand.
+    """
+    enemy_type: str
+    stats: EnemyStats
+    sprite: Any
+    wave_health: Tuple[int, ...]
+    wave_damage: Tuple[int, ...]
+
+    @classmethod
+    def build(cls, enemy_type, sprite):
+        """Build the archetype and its scaling tables"""
+        stats = ENEMY_STATS[enemy_type]
+        multipliers = [enemy_wave_multipliers(wave) for wave in range(WAVE_TABLE_SIZE)]
+        return cls(
+            enemy_type, stats, sprite,
+            tuple(int(stats.health * health) for health, _ in multipliers),
+            tuple(int(stats.attack_damage * damage) for _, damage in multipliers),
+        )
+
+    def health_for_wave(self, wave):
+        """Get starting (and max) health for a wave"""
+        if wave < WAVE_TABLE_SIZE:
+            return self.wave_health[wave]
+        return int(self.stats.health * enemy_wave_multipliers(wave)[0])
+
+    def damage_for_wave(self, wave):
+        """Get attack damage for a wave"""
+        if wave < WAVE_TABLE_SIZE:
+            return self.wave_damage[wave]
+        return int(self.stats.attack_damage * enemy_wave_multipliers(wave)[1])
+
+
+class BossArchetype(NamedTuple):
+    """Everything shared by bosses of one type, built once per type"""
+    boss_type: str
+    stats: BossStats
+    sprite: Any
+    wave_health: Tuple[int, ...]
+    wave_damage: Tuple[int, ...]
+
+    @classmethod
+    def build(cls, boss_type, sprite):
+        """Build the archetype and its scaling tables"""
+        stats = BOSS_STATS[boss_type]
+        multipliers = [boss_wave_multiplier(wave) for wave in range(WAVE_TABLE_SIZE)]
+        return cls(
+            boss_type, stats, sprite,
+            tuple(int(stats.health * multiplier) for multiplier in multipliers),
+            tuple(int(stats.attack_damage * multiplier) for multiplier in multipliers),
+        )
+
+    def health_for_wave(self, wave):
+        """Get starting (and max) health for a wave"""
+        if wave < WAVE_TABLE_SIZE:
+            return self.wave_health[wave]
+        return int(self.stats.health * boss_wave_multiplier(wave))
+
+    def damage_for_wave(self, wave):
+        """Get attack damage for a wave"""
+        if wave < WAVE_TABLE_SIZE:
+            return self.wave_damage[wave]
+        return int(self.stats.attack_damage * boss_wave_multiplier(wave))
@@ -0,0 +1,65 @@
+from constants import SIM_TICK_RATE, MAX_SUBSTEPS
+
+
+class FixedTimestep:
+    """Accumulator that turns variable frame times into fixed simulation ticks
+
+    advance() returns how many ticks of `dt` seconds to run for a frame, at
+    most `max_substeps`. Time beyond the cap is dropped so a long hitch does
+    not cause a spiral of catch-up ticks. `alpha` is how far the display is
+    between the last two ticks, for render interpolation.
+    """
+    def __init__(self, tick_rate=SIM_TICK_RATE, max_substeps=MAX_SUBSTEPS):
+        self.dt = 1.0 / tick_rate
+        self.max_substeps = max_substeps
+        self.accumulator = 0.0
+
+    def advance(self, frame_time):
+        """Add a frame's time and get the number of ticks to simulate"""
+        self.accumulator += frame_time
+        steps = int(self.accumulator / self.dt)
+
+        if steps > self.max_substeps:
+            steps = self.max_substeps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.dt
+        return steps
+
+    @property
+    def alpha(self):
+        """Get the fraction of a tick since the last one, from 0 to 1"""
+        return min(1.0, self.accumulator / self.dt)
+
+
+class RenderInterpolation:
+    """Moves entities to interpolated positions for one frame of drawing
+
+    Entities need `x`, `y`, `prev_x` and `prev_y`. apply() blends them
+    between the previous and current tick, restore() puts the simulated
+    positions back.
+    """
+    def __init__(self):
+        self.saved = []
+
+    def apply(self, entities, alpha):
+        """Blend positions toward the previous tick by 1 - alpha"""
+        for entity in entities:
+            x, y = entity.x, entity.y
+            self.saved.append((entity, x, y))
+            entity.x = entity.prev_x + (x - entity.prev_x) * alpha
+            entity.y = entity.prev_y + (y - entity.prev_y) * alpha
+
+    def restore(self):
+        """Put back the simulated positions"""
+        for entity, x, y in self.saved:
+            entity.x = x
+            entity.y = y
+        self.saved.clear()
+
+
+def save_previous(entities):
+    """Remember current positions as the previous tick's"""
+    for entity in entities:
+        entity.prev_x = entity.x
+        entity.prev_y = entity.y
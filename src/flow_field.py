@@ -0,0 +1,114 @@
+import heapq
+import math
+import numpy as np
+
+# Neighbour offsets and their step costs
+NEIGHBOURS = [
+    (1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+    (1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)), (-1, 1, math.sqrt(2)), (-1, -1, math.sqrt(2)),
+]
+
+
+class FlowField:
+    """Shared steering field toward one goal tile on a CollisionGrid
+
+    One Dijkstra search from the goal fills every walkable tile with its
+    path cost and the unit direction to the next tile on its shortest path.
+    Agents then read their steering direction in O(1). Diagonal steps are
+    only taken when both tiles beside them are open, so agents never cut
+    wall corners. The search is redone only when the goal changes tile.
+    """
+    def __init__(self, collision_grid):
+        self.grid = collision_grid
+        size = collision_grid.width * collision_grid.height
+        self.cost = np.full(size, np.inf)
+        self.direction_x = np.zeros(size)
+        self.direction_y = np.zeros(size)
+        self.has_direction = np.zeros(size, dtype=bool)
+        self.goal = None
+
+    def update(self, x, y):
+        """Retarget the field on a world position, returns True if it was rebuilt"""
+        goal = self.grid.get_tile(x, y)
+        if goal == self.goal:
+            return False
+
+        self.goal = goal
+        self.rebuild(*goal)
+        return True
+
+    def rebuild(self, goal_x, goal_y):
+        """Run the search from a goal tile"""
+        grid = self.grid
+        width = grid.width
+        self.cost.fill(np.inf)
+        self.has_direction.fill(False)
+
+        if grid.is_blocked_tile(goal_x, goal_y):
+            return
+
+        goal = goal_y * width + goal_x
+        self.cost[goal] = 0.0
+        cost = self.cost.tolist()
+        next_tile = [-1] * len(cost)
+        queue = [(0.0, goal)]
+
+        while queue:
+            tile_cost, tile = heapq.heappop(queue)
+            if tile_cost > cost[tile]:
+                continue
+
+            tile_x = tile % width
+            tile_y = tile // width
+            for offset_x, offset_y, step in NEIGHBOURS:
+                near_x = tile_x + offset_x
+                near_y = tile_y + offset_y
+                if grid.is_blocked_tile(near_x, near_y):
+                    continue
+                if offset_x and offset_y and (grid.is_blocked_tile(near_x, tile_y) or
+                                              grid.is_blocked_tile(tile_x, near_y)):
+                    continue
+
+                near = near_y * width + near_x
+                near_cost = tile_cost + step
+                if near_cost < cost[near]:
+                    cost[near] = near_cost
+                    next_tile[near] = tile
+                    heapq.heappush(queue, (near_cost, near))
+
+        # Each tile steers toward the tile it was reached from
+        self.cost[:] = cost
+        for tile, target in enumerate(next_tile):
+            if target < 0:
+                continue
+            step_x = target % width - tile % width
+            step_y = target // width - tile // width
+            length = math.sqrt(step_x * step_x + step_y * step_y)
+            self.direction_x[tile] = step_x / length
+            self.direction_y[tile] = step_y / length
+            self.has_direction[tile] = True
+
+    def get_direction(self, x, y):
+        """Get the unit steering direction at a world position
+
+        Returns None in the goal tile and where the goal is unreachable, so
+        callers can steer straight at the goal instead.
+        """
+        tile_x, tile_y = self.grid.get_tile(x, y)
+        if self.grid.is_blocked_tile(tile_x, tile_y):
+            return None
+
+        tile = tile_y * self.grid.width + tile_x
+        if not self.has_direction[tile]:
+            return None
+        return self.direction_x[tile], self.direction_y[tile]
+
+    def get_direction_batch(self, xs, ys):
+        """Get steering directions for arrays of positions
+
+        Returns direction x and y arrays and a mask of which positions have
+        a direction (see get_direction).
+        """
+        index, inside = self.grid.tile_indices(xs, ys)
+        valid = inside & self.has_direction[index]
+        return self.direction_x[index], self.direction_y[index], valid
@@ -6,6 +6,7 @@ from town_state import TownState
 from arena_state import ArenaState
 from shop_state import ShopState
 from menu_state import MenuState
+from render_backend import SurfaceBackend
 
 class FileSoundManager:
     """Sound manager that loads actual sound files"""
@@ -466,11 +467,15 @@ class UltraSimpleSoundManager:
 
 
 class GameStateManager:
-    def __init__(self, screen):
+    def __init__(self, screen, backend=None):
         self.screen = screen
+        self.backend = backend or SurfaceBackend(screen)
         self.current_state = GameState.MENU
         self.states = {}
         
+        # Simulation clock in milliseconds, advanced by each update tick
+        self.sim_time = 0
+        
         # Initialize sound system with fallback chain
         try:
             self.sound_manager = FileSoundManager()
@@ -549,6 +554,9 @@ class GameStateManager:
             if hasattr(self.states[GameState.TOWN], 'sound_manager'):
                 self.states[GameState.TOWN].sound_manager = self.sound_manager
             self.states[GameState.TOWN].initialize_town()
+        
+        # Don't interpolate from positions in the previous state
+        self.save_previous_state()
             
     def capture_mouse(self):
         """Capture mouse for FPS controls"""
@@ -576,16 +584,34 @@ class GameStateManager:
         current_state_obj = self.states[self.current_state]
         current_state_obj.handle_event(event)
         
+    def save_previous_state(self):
+        """Snapshot positions of the current state for render interpolation"""
+        current_state_obj = self.states[self.current_state]
+        if hasattr(current_state_obj, 'save_previous_state'):
+            current_state_obj.save_previous_state()
+        
     def update(self, dt):
-        """Update the current state"""
+        """Run one simulation tick of the current state"""
+        self.save_previous_state()
+        self.sim_time += dt * 1000
+        
         current_state_obj = self.states[self.current_state]
         current_state_obj.update(dt)
         
-    def render(self):
-        """Render the current state"""
+    def render(self, alpha=1.0):
+        """Render the current state, alpha of the way from the last tick to the newest"""
+        self.backend.begin_frame()
+        
         current_state_obj = self.states[self.current_state]
+        interpolate = alpha < 1.0 and hasattr(current_state_obj, 'apply_interpolation')
+        if interpolate:
+            current_state_obj.apply_interpolation(alpha)
+        
         current_state_obj.render()
         
+        if interpolate:
+            current_state_obj.restore_interpolation()
+        
         # Draw crosshair for first-person states
         if self.current_state in [GameState.TOWN, GameState.ARENA]:
             self.draw_crosshair()
@@ -1,21 +1,34 @@
 import pygame
 import sys
 from game_state_manager import GameStateManager
-from constants import FPS, SCREEN_HEIGHT, SCREEN_WIDTH
+from constants import FPS, SCREEN_HEIGHT, SCREEN_WIDTH, RENDER_BACKEND
+from render_backend import SurfaceBackend, SDLBackend
+from fixed_timestep import FixedTimestep
+
+def create_display(use_sdl2=False, software=False):
+    """Create the game window and the backend that draws into it"""
+    if use_sdl2:
+        backend = SDLBackend.create((SCREEN_WIDTH, SCREEN_HEIGHT), "Arena of Shadows", software)
+        return backend.screen, backend
+    
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Arena of Shadows")
+    return screen, SurfaceBackend(screen)
 
 def main():
     # Initialize pygame and create window
     pygame.init()
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption("Arena of Shadows")
+    use_sdl2 = RENDER_BACKEND == "sdl2" or "--sdl2" in sys.argv
+    screen, backend = create_display(use_sdl2, "--software" in sys.argv)
     clock = pygame.time.Clock()
     
-    game_manager = GameStateManager(screen)
+    game_manager = GameStateManager(screen, backend)
+    timestep = FixedTimestep()
     
     # Main game loop
     running = True
     while running:
-        dt = clock.tick(FPS) / 1000.0
+        frame_time = clock.tick(FPS) / 1000.0
         
         # Handle events
         for event in pygame.event.get():
@@ -24,17 +37,18 @@ def main():
             else:
                 game_manager.handle_event(event)
         
-        # Update game state
-        game_manager.update(dt)
+        # Update game state in fixed ticks
+        for _ in range(timestep.advance(frame_time)):
+            game_manager.update(timestep.dt)
         
-        # Render current state
-        game_manager.render()
+        # Render current state between the last two ticks
+        game_manager.render(timestep.alpha)
         
         # Update display
-        pygame.display.flip()
+        backend.present()
     
     pygame.quit()
     sys.exit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
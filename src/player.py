@@ -1,33 +1,50 @@
 import pygame
 import math
 
-from constants import TILE_SIZE  
-
 class Player:
+    __slots__ = (
+        'x', 'y', 'prev_x', 'prev_y', 'angle', 'health', 'mana', 'z', 'z_velocity', 'is_jumping', 'can_jump',
+        'gold', 'weapon_level', 'armor_level', 'spell_level',
+        'current_spell', 'known_spells', 'total_score', 'highest_wave',
+    )
+    
+    # Movement and physics tuning
+    base_speed = 120
+    rot_speed = 3.0
+    gravity = 800
+    jump_power = 250
+    mouse_sensitivity = 0.003
+    collision_buffer = 8
+    
+    # Base pools before upgrades
+    max_health = 6000000000
+    max_mana = 60000
+    mana_regen = 20
+    
+    spell_costs = {
+        "fireball": 20,
+        "lightning": 15,
+        "ice": 25,
+        "heal": 30,
+    }
+    
     def __init__(self, x: float, y: float, angle: float):
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.angle = angle
-        self.base_speed = 120
-        self.rot_speed = 3.0
         
         # Health and mana
         self.health = 1000
-        self.max_health = 6000000000
         self.mana = 100
-        self.max_mana = 60000
-        self.mana_regen = 20
         
         # Jump mechanics
         self.z = 0
         self.z_velocity = 0
-        self.gravity = 800
-        self.jump_power = 250
         self.is_jumping = False
         self.can_jump = True
         
-        self.mouse_sensitivity = 0.003
-        
         self.gold = 1000
         
         # Upgrade levels
@@ -38,12 +55,6 @@ class Player:
         # Spell system
         self.current_spell = "fireball"
         self.known_spells = ["fireball"]
-        self.spell_costs = {
-            "fireball": 20,
-            "lightning": 15,
-            "ice": 25,
-            "heal": 30,
-        }
         
         # Progression tracking
         self.total_score = 0
@@ -135,7 +146,7 @@ class Player:
         self.angle += mouse_rel[0] * self.mouse_sensitivity
         self.angle = self.angle % (2 * math.pi)
 
-    def move(self, keys, dt, collision_map=None, map_width=0, map_height=0):
+    def move(self, keys, dt, collision_grid=None):
         """Move the player based on input"""
         sin_a = math.sin(self.angle)
         cos_a = math.cos(self.angle)
@@ -162,13 +173,13 @@ class Player:
             dy += cos_a * current_speed * dt
         
         # Apply movement with collision checking
-        if collision_map:
+        if collision_grid:
             new_x = self.x + dx
-            if not self.check_collision(new_x, self.y, collision_map, map_width, map_height):
+            if not collision_grid.is_blocked_box(new_x, self.y, self.collision_buffer):
                 self.x = new_x
             
             new_y = self.y + dy
-            if not self.check_collision(self.x, new_y, collision_map, map_width, map_height):
+            if not collision_grid.is_blocked_box(self.x, new_y, self.collision_buffer):
                 self.y = new_y
         else:
             self.x += dx
@@ -186,31 +197,6 @@ class Player:
         
         self.angle = self.angle % (2 * math.pi)
 
-    def check_collision(self, x: float, y: float, collision_map, map_width, map_height) -> bool:
-        """Check collision with map boundaries and walls"""
-        buffer = 8
-        # Check collision at player's corners
-        points = [
-            (x - buffer, y - buffer),
-            (x + buffer, y - buffer),
-            (x - buffer, y + buffer),
-            (x + buffer, y + buffer),
-        ]
-        
-        for px, py in points:
-            map_x = int(px // TILE_SIZE)
-            map_y = int(py // TILE_SIZE)
-            
-            # Check map bounds
-            if map_x < 0 or map_x >= map_width or map_y < 0 or map_y >= map_height:
-                return True
-            
-            # Check wall collision
-            if collision_map[map_y][map_x] != 0:
-                return True
-        
-        return False
-        
     def reset_for_arena(self):
         """Reset temporary stats for arena"""
         max_hp = self.get_max_health()
@@ -0,0 +1,94 @@
+import numpy as np
+from constants import *
+from enemy_store import ENEMY_TYPES, ENEMY_TYPE_IDS
+
+
+class PopulationController:
+    """Entity budget that boss summons have to fit in
+
+    The arena holds at most `max_population` enemies and bosses, counting
+    spawns still queued, and summons may only bring each enemy type up to
+    its cap in `type_caps`. A summon larger than the room left is merged
+    into fewer, stronger minions, each standing for up to
+    MAX_SUMMON_STRENGTH summons. Summons that still do not fit are
+    deferred and offered again with the type's next summon, up to the
+    type's cap, and the rest are dropped.
+
+    live_total and live_by_type hold the population at the last census,
+    plus summons admitted since. merged, dropped and deferred count the
+    summons that did not get a minion of their own.
+    """
+    def __init__(self, max_population=MAX_ARENA_POPULATION, type_caps=SUMMON_TYPE_CAPS):
+        self.max_population = max_population
+        self.type_caps = np.array([type_caps.get(enemy_type, max_population)
+                                   for enemy_type in ENEMY_TYPES])
+
+        # Admitted minions that are queued but not in the store yet
+        self.reserved = np.zeros(len(ENEMY_TYPES), dtype=np.int64)
+        self.deferred = np.zeros(len(ENEMY_TYPES), dtype=np.int64)
+
+        self.live_total = 0
+        self.live_by_type = np.zeros(len(ENEMY_TYPES), dtype=np.int64)
+        self.summoned = 0
+        self.merged = 0
+        self.dropped = 0
+
+    @property
+    def throttled(self):
+        """Summons that were merged, dropped or are still deferred"""
+        return self.merged + self.dropped + int(self.deferred.sum())
+
+    def clear(self):
+        """Forget queued and deferred summons"""
+        self.reserved[:] = 0
+        self.deferred[:] = 0
+        self.live_total = 0
+        self.live_by_type[:] = 0
+
+    def census(self, store, bosses, pending):
+        """Recount the population from the enemy store, boss registry and spawn queue"""
+        live = np.bincount(store.view('type_id'), minlength=len(ENEMY_TYPES))
+        self.live_by_type = live + self.reserved
+        self.live_total = len(store) + len(bosses) + pending
+
+    def admit(self, enemy_type, count):
+        """Fit a summon of count minions in the budget
+
+        Returns how many minions to spawn and how many summons each one
+        stands for. Admitted minions are reserved until spawned() or
+        released() is called for them.
+        """
+        type_id = ENEMY_TYPE_IDS[enemy_type]
+        cap = self.type_caps[type_id]
+        requested = count + int(self.deferred[type_id])
+        self.deferred[type_id] = 0
+
+        room = min(self.max_population - self.live_total, cap - self.live_by_type[type_id])
+        units = int(max(0, min(requested, room)))
+        if units:
+            strength = min(-(-requested // units), MAX_SUMMON_STRENGTH)
+            absorbed = min(requested, units * strength)
+        else:
+            strength = 1
+            absorbed = 0
+
+        # Whatever did not fit waits for the next summon of this type
+        leftover = requested - absorbed
+        self.deferred[type_id] = min(leftover, cap)
+        self.dropped += leftover - self.deferred[type_id]
+        self.merged += absorbed - units
+        self.summoned += units
+
+        self.reserved[type_id] += units
+        self.live_by_type[type_id] += units
+        self.live_total += units
+        return units, strength
+
+    def spawned(self, enemy_type):
+        """Mark one admitted minion as added to the store"""
+        self.release(enemy_type, 1)
+
+    def release(self, enemy_type, count):
+        """Give back admitted minions that will never spawn"""
+        type_id = ENEMY_TYPE_IDS[enemy_type]
+        self.reserved[type_id] = max(0, self.reserved[type_id] - count)
@@ -0,0 +1,102 @@
+import itertools
+import math
+import numpy as np
+import pygame
+from constants import *
+from collision_grid import segment_circle_fraction_batch
+
+
+class ProjectilePool:
+    """Arena-wide fixed-capacity projectile storage
+
+    Every projectile fired at the player is one slot across a set of NumPy
+    arrays. Free slots are kept on a stack, so firing and expiring never
+    allocate. Each tick moves every live projectile and sweeps the steps
+    against the player and the walls in single batched passes, so fast
+    projectiles cannot skip past either. Owners are referenced by integer
+    id, so projectiles keep flying after their owner dies.
+    """
+    # Ids handed out to enemies and bosses that fire projectiles
+    owner_ids = itertools.count(1)
+
+    def __init__(self, capacity=PROJECTILE_POOL_SIZE):
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.damage = np.zeros(capacity)
+        self.hit_radius = np.zeros(capacity)
+        self.owner = np.zeros(capacity, dtype=np.int64)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+        # Stack of free slots, lowest index on top
+        self.free = list(range(capacity - 1, -1, -1))
+
+    @classmethod
+    def new_owner_id(cls):
+        """Get a unique id for a projectile owner"""
+        return next(cls.owner_ids)
+
+    def __len__(self):
+        return self.capacity - len(self.free)
+
+    def spawn(self, x, y, angle, speed, damage, hit_radius, owner_id=0):
+        """Fire a projectile and return its slot, or -1 if the pool is full"""
+        if not self.free:
+            return -1
+
+        slot = self.free.pop()
+        self.x[slot] = x
+        self.y[slot] = y
+        self.vx[slot] = math.cos(angle) * speed
+        self.vy[slot] = math.sin(angle) * speed
+        self.damage[slot] = damage
+        self.hit_radius[slot] = hit_radius
+        self.owner[slot] = owner_id
+        self.alive[slot] = True
+        return slot
+
+    def release(self, slots):
+        """Return slots to the free list"""
+        self.alive[slots] = False
+        self.free.extend(int(slot) for slot in slots)
+
+    def clear(self):
+        """Remove every projectile"""
+        self.alive[:] = False
+        self.free = list(range(self.capacity - 1, -1, -1))
+
+    def update(self, dt, player, collision_grid):
+        """Move all projectiles, damage the player and expire wall hits"""
+        live = np.flatnonzero(self.alive)
+        if len(live) == 0:
+            return
+
+        old_x = self.x[live]
+        old_y = self.y[live]
+        self.x[live] += self.vx[live] * dt
+        self.y[live] += self.vy[live] * dt
+        x = self.x[live]
+        y = self.y[live]
+
+        # Sweep each step against the walls and the player in single passes,
+        # the player is only hit if they are reached before a wall
+        wall = collision_grid.segment_block_fraction_batch(old_x, old_y, x, y)
+        reach = segment_circle_fraction_batch(old_x, old_y, x, y, player.x, player.y,
+                                              self.hit_radius[live])
+        hit = np.isfinite(reach) & (reach <= wall)
+        for slot in live[hit]:
+            player.take_damage(self.damage[slot].item())
+
+        blocked = np.isfinite(wall)
+        expired = live[hit | blocked]
+        if len(expired):
+            self.release(expired)
+
+    def draw_2d(self, surface, camera_x=0, camera_y=0):
+        """Draw projectiles in 2D (for debugging/minimap)"""
+        for slot in np.flatnonzero(self.alive):
+            proj_x = int(self.x[slot] - camera_x)
+            proj_y = int(self.y[slot] - camera_y)
+            pygame.draw.circle(surface, RED, (proj_x, proj_y), 3)
@@ -2,10 +2,15 @@ import pygame
 import math
 from typing import List, Tuple
 from constants import *
+from render_backend import SurfaceBackend
+from sprite_lod import SpriteLOD
+from enemy_store import FLAG_ALIVE
 
 class RayCaster:
-    def __init__(self, screen):
+    def __init__(self, screen, backend=None):
         self.screen = screen
+        self.backend = backend or SurfaceBackend(screen)
+        self.sprite_lod = SpriteLOD()
         
         self.textures = {}
         self.load_textures()
@@ -14,6 +19,9 @@ class RayCaster:
         """Load all texture assets"""
         import os
         
+        # Converting needs a display surface, which the SDL backend doesn't create
+        can_convert = pygame.display.get_surface() is not None
+        
         arena_textures = {
             'arena_wall': "../assets/textures/arena/arena_wall.jpg",
             'arena_pillar': "../assets/textures/arena/arena_pillar.jpg", 
@@ -25,7 +33,8 @@ class RayCaster:
         for texture_name, texture_path in arena_textures.items():
             try:
                 if os.path.exists(texture_path):
-                    self.textures[texture_name] = pygame.image.load(texture_path).convert()
+                    texture = pygame.image.load(texture_path)
+                    self.textures[texture_name] = texture.convert() if can_convert else texture
             except pygame.error as e:
                 pass
             except Exception as e:
@@ -62,7 +71,8 @@ class RayCaster:
         for texture_name, texture_path in town_textures.items():
             try:
                 if os.path.exists(texture_path):
-                    self.textures[texture_name] = pygame.image.load(texture_path).convert()
+                    texture = pygame.image.load(texture_path)
+                    self.textures[texture_name] = texture.convert() if can_convert else texture
             except pygame.error as e:
                 pass
             except Exception as e:
@@ -72,7 +82,8 @@ class RayCaster:
         for texture_name, texture_path in npc_textures.items():
             try:
                 if os.path.exists(texture_path):
-                    self.textures[texture_name] = pygame.image.load(texture_path).convert_alpha()
+                    texture = pygame.image.load(texture_path)
+                    self.textures[texture_name] = texture.convert_alpha() if can_convert else texture
             except pygame.error as e:
                 pass
             except Exception as e:
@@ -208,11 +219,11 @@ class RayCaster:
             sky_blue = (135, 206, 235)
             
             if is_arena:
-                pygame.draw.rect(self.screen, sky_blue, (0, 0 + view_bob, SCREEN_WIDTH, SCREEN_HEIGHT // 2))
-                pygame.draw.rect(self.screen, sandy_color, (0, SCREEN_HEIGHT // 2 + view_bob, SCREEN_WIDTH, SCREEN_HEIGHT // 2))
+                self.backend.fill_rect(sky_blue, (0, 0 + view_bob, SCREEN_WIDTH, SCREEN_HEIGHT // 2))
+                self.backend.fill_rect(sandy_color, (0, SCREEN_HEIGHT // 2 + view_bob, SCREEN_WIDTH, SCREEN_HEIGHT // 2))
             else:
-                pygame.draw.rect(self.screen, sky_blue, (0, 0 + view_bob, SCREEN_WIDTH, SCREEN_HEIGHT // 2))
-                pygame.draw.rect(self.screen, sandy_color, (0, SCREEN_HEIGHT // 2 + view_bob, SCREEN_WIDTH, SCREEN_HEIGHT // 2))
+                self.backend.fill_rect(sky_blue, (0, 0 + view_bob, SCREEN_WIDTH, SCREEN_HEIGHT // 2))
+                self.backend.fill_rect(sandy_color, (0, SCREEN_HEIGHT // 2 + view_bob, SCREEN_WIDTH, SCREEN_HEIGHT // 2))
             return
 
         texture_width = floor_texture.get_width()
@@ -227,14 +238,14 @@ class RayCaster:
             for y in range(0, SCREEN_HEIGHT // 2, texture_height):
                 tex_x = (x - offset_x) % texture_width
                 tex_y = (y - offset_y) % texture_height
-                self.screen.blit(ceiling_texture, (x, y + view_bob))
+                self.backend.blit(ceiling_texture, (x, y + view_bob))
         
         # Tile floor
         for x in range(0, SCREEN_WIDTH, texture_width):
             for y in range(SCREEN_HEIGHT // 2, SCREEN_HEIGHT, texture_height):
                 tex_x = (x - offset_x) % texture_width
                 tex_y = (y - offset_y) % texture_height
-                self.screen.blit(floor_texture, (x, y + view_bob))
+                self.backend.blit(floor_texture, (x, y + view_bob))
 
     def cast_rays(self, player, collision_map, map_width, map_height) -> List[Tuple[float, float, int, float, float]]:
         """Cast rays for raycasting - returns depth, angle, wall type, and hit coordinates"""
@@ -303,16 +314,9 @@ class RayCaster:
                     texture = self.textures.get('arena_entrance')
                 
                 if texture and wall_height > 0:
-                    stretched_texture = pygame.transform.scale(texture, (2, int(wall_height)))
-                    
                     # Apply distance-based shading
                     color_intensity = max(50, 255 - int(depth * 4))
-                    if color_intensity < 255:
-                        dark_overlay = pygame.Surface((2, int(wall_height)))
-                        dark_overlay.fill((color_intensity, color_intensity, color_intensity))
-                        stretched_texture.blit(dark_overlay, (0, 0), special_flags=pygame.BLEND_MULT)
-                    
-                    self.screen.blit(stretched_texture, (wall_x, wall_y))
+                    self.backend.draw_wall_strip(texture, (wall_x, wall_y, 2, int(wall_height)), color_intensity)
                     
                 else:
                     # Fallback to colored rectangles
@@ -329,7 +333,7 @@ class RayCaster:
                     color_intensity = max(50, 255 - int(depth * 4))
                     wall_color = tuple(int(c * color_intensity / 255) for c in base_color)
                     
-                    pygame.draw.rect(self.screen, wall_color, (wall_x, wall_y, 2, wall_height))
+                    self.backend.fill_rect(wall_color, (wall_x, wall_y, 2, wall_height))
 
     def render_3d_arena(self, rays: List[Tuple[float, float, int, float, float]], enemies, spells, player):
         """Render 3D arena environment with textures"""
@@ -354,16 +358,9 @@ class RayCaster:
                     texture = self.textures.get('arena_wall')
 
                 if texture and actual_wall_height > 0:
-                    stretched_texture = pygame.transform.scale(texture, (2, int(actual_wall_height)))
-                    
                     # Apply distance-based shading
                     color_intensity = max(30, 255 - int(depth * 6))
-                    if color_intensity < 255:
-                        dark_overlay = pygame.Surface((2, int(actual_wall_height)))
-                        dark_overlay.fill((color_intensity, color_intensity, color_intensity))
-                        stretched_texture.blit(dark_overlay, (0, 0), special_flags=pygame.BLEND_MULT)
-                    
-                    self.screen.blit(stretched_texture, (wall_x, wall_y))
+                    self.backend.draw_wall_strip(texture, (wall_x, wall_y, 2, int(actual_wall_height)), color_intensity)
                     
                 else:
                     # Fallback to colored rectangles
@@ -378,7 +375,7 @@ class RayCaster:
                     wall_color = tuple(int(c * color_intensity / 255) for c in base_color)
 
                     if actual_wall_height > 0:
-                        pygame.draw.rect(self.screen, wall_color, (wall_x, wall_y, 2, actual_wall_height))
+                        self.backend.fill_rect(wall_color, (wall_x, wall_y, 2, actual_wall_height))
 
         self.render_spells(spells, view_bob)
         self.render_enemies(player, enemies, view_bob)
@@ -391,16 +388,17 @@ class RayCaster:
             screen_x = int(spell.x * 0.5)
             screen_y = int(spell.y * 0.5) + view_bob
             if 0 <= screen_x < SCREEN_WIDTH and 0 <= screen_y < SCREEN_HEIGHT:
-                pygame.draw.circle(self.screen, spell.color, (screen_x, screen_y), spell.size)
+                self.backend.draw_circle(spell.color, (screen_x, screen_y), spell.size)
 
     def render_enemies(self, player, enemies, view_bob: int = 0):
-        """Render enemy sprites in 3D space"""
-        for enemy in enemies:
-            if not enemy.alive:
+        """Render enemy sprites in 3D space from an EnemyStore's columns"""
+        xs, ys, flags = enemies.column_lists('x', 'y', 'flags')
+        for row, enemy in enumerate(enemies.proxies):
+            if not flags[row] & FLAG_ALIVE:
                 continue
 
-            dx = enemy.x - player.x
-            dy = enemy.y - player.y
+            dx = xs[row] - player.x
+            dy = ys[row] - player.y
             enemy_distance = math.sqrt(dx * dx + dy * dy)
             if enemy_distance < 1:
                 continue
@@ -423,11 +421,11 @@ class RayCaster:
                 enemy_width = enemy_scale
                 enemy_height = enemy_scale
 
-                scaled_image = pygame.transform.scale(enemy.image, (enemy_width, enemy_height))
                 enemy_y = (SCREEN_HEIGHT // 2 - enemy_height // 2) + view_bob
-                enemy_rect = scaled_image.get_rect(center=(int(screen_x), int(enemy_y + enemy_height // 2)))
+                enemy_rect = pygame.Rect(0, 0, enemy_width, enemy_height)
+                enemy_rect.center = (int(screen_x), int(enemy_y + enemy_height // 2))
 
-                self.screen.blit(scaled_image, enemy_rect)
+                self.sprite_lod.draw(self.backend, enemy.image, enemy_rect, enemy_distance)
 
     def render_bosses(self, player, bosses, view_bob: int = 0):
         """Render boss sprites in 3D space"""
@@ -460,7 +458,7 @@ class RayCaster:
                 boss_height = boss_scale
 
                 if hasattr(boss, 'image') and boss.image:
-                    scaled_image = pygame.transform.scale(boss.image, (boss_width, boss_height))
                     boss_y = (SCREEN_HEIGHT // 2 - boss_height // 2) + view_bob
-                    boss_rect = scaled_image.get_rect(center=(int(screen_x), int(boss_y + boss_height // 2)))
-                    self.screen.blit(scaled_image, boss_rect)
\ No newline at end of file
+                    boss_rect = pygame.Rect(0, 0, boss_width, boss_height)
+                    boss_rect.center = (int(screen_x), int(boss_y + boss_height // 2))
+                    self.sprite_lod.draw(self.backend, boss.image, boss_rect, boss_distance)
\ No newline at end of file
@@ -0,0 +1,283 @@
+import os
+import math
+import weakref
+import pygame
+from constants import *
+
+
+def texel_spans(rect_start, scale, src_start, src_end, visible_start, visible_end, clip_length,
+                src_length):
+    """Split one axis of the covered texels into (src, src_end, out, out_end) spans
+
+    Normally one span holds every covered texel at its exact screen
+    position. A shrunk axis keeps every texel, since sampling a block of
+    them picks different texels than a full scale and the axis is no longer
+    than the image anyway. When a single texel is longer than the clip
+    area, each covered texel (at most two) gets its own span cut to the
+    visible area, so the scaled image never grows past the screen.
+    """
+    if scale < 1:
+        return [(0, src_length, rect_start, rect_start + round(src_length * scale))]
+    if scale <= clip_length:
+        return [(src_start, src_end,
+                 rect_start + round(src_start * scale), rect_start + round(src_end * scale))]
+
+    spans = []
+    for texel in range(src_start, src_end):
+        out_start = max(visible_start, rect_start + round(texel * scale))
+        out_end = min(visible_end, rect_start + round((texel + 1) * scale))
+        if out_end > out_start:
+            spans.append((texel, texel + 1, out_start, out_end))
+    return spans
+
+
+def scale_clipped(image, rect, clip_rect):
+    """Scale only the part of image that is visible when drawn into rect
+
+    Returns the scaled surface and its blit position, or (None, None) when
+    rect is entirely outside clip_rect. Only the source texels that touch the
+    visible area are scaled, at the same screen positions a full scale would
+    give them, and the result is cropped to the visible area so it is never
+    larger than clip_rect.
+    """
+    visible = rect.clip(clip_rect)
+    if visible.width <= 0 or visible.height <= 0:
+        return None, None
+    if visible == rect:
+        return pygame.transform.scale(image, rect.size), rect.topleft
+
+    image_width, image_height = image.get_size()
+    x_scale = rect.width / image_width
+    y_scale = rect.height / image_height
+
+    # Source texels covered by the visible area
+    src_left = int((visible.left - rect.left) / x_scale)
+    src_top = int((visible.top - rect.top) / y_scale)
+    src_right = max(src_left + 1, min(image_width, math.ceil((visible.right - rect.left) / x_scale)))
+    src_bottom = max(src_top + 1, min(image_height, math.ceil((visible.bottom - rect.top) / y_scale)))
+
+    # Where those texels land on screen
+    x_spans = texel_spans(rect.left, x_scale, src_left, src_right,
+                          visible.left, visible.right, clip_rect.width, image_width)
+    y_spans = texel_spans(rect.top, y_scale, src_top, src_bottom,
+                          visible.top, visible.bottom, clip_rect.height, image_height)
+
+    if len(x_spans) == 1 and len(y_spans) == 1:
+        (src_left, src_right, out_left, out_right), = x_spans
+        (src_top, src_bottom, out_top, out_bottom), = y_spans
+        source = image.subsurface((src_left, src_top, src_right - src_left, src_bottom - src_top))
+        scaled_image = pygame.transform.scale(source, (out_right - out_left, out_bottom - out_top))
+
+        # Crop the partly visible edge texels
+        out_rect = pygame.Rect(out_left, out_top, out_right - out_left, out_bottom - out_top)
+        crop = out_rect.clip(visible)
+        if crop != out_rect:
+            scaled_image = scaled_image.subsurface(crop.move(-out_left, -out_top))
+        return scaled_image, crop.topleft
+
+    # Huge texels: copy each span's pixels into one visible-sized image
+    has_alpha = image.get_flags() & pygame.SRCALPHA
+    scaled_image = pygame.Surface(visible.size, has_alpha, image)
+    for src_left, src_right, out_left, out_right in x_spans:
+        for src_top, src_bottom, out_top, out_bottom in y_spans:
+            source = image.subsurface((src_left, src_top, src_right - src_left, src_bottom - src_top))
+            piece = pygame.transform.scale(source, (out_right - out_left, out_bottom - out_top))
+            piece.set_colorkey(None)
+            if has_alpha:
+                # Dropping the surface alpha would drop the per-pixel alpha too
+                scaled_image.blit(piece, (out_left - visible.left, out_top - visible.top),
+                                  special_flags=pygame.BLEND_RGBA_MAX)
+            else:
+                piece.set_alpha(None)
+                scaled_image.blit(piece, (out_left - visible.left, out_top - visible.top))
+    if image.get_colorkey() is not None:
+        scaled_image.set_colorkey(image.get_colorkey())
+    return scaled_image, visible.topleft
+
+
+class SurfaceBackend:
+    """Default backend that draws with software blits onto the display surface"""
+    def __init__(self, screen):
+        self.screen = screen
+
+    def begin_frame(self):
+        """Prepare for a new frame (states clear the screen themselves)"""
+        pass
+
+    def clear(self, color=BLACK):
+        """Clear the world view"""
+        self.screen.fill(color)
+
+    def fill_rect(self, color, rect):
+        """Fill a solid rectangle in the world view"""
+        pygame.draw.rect(self.screen, color, rect)
+
+    def draw_rect(self, color, rect, width=0):
+        """Draw a rectangle in the world view, outlined when width is set"""
+        pygame.draw.rect(self.screen, color, rect, width)
+
+    def draw_circle(self, color, center, radius, alpha=255):
+        """Draw a filled circle in the world view, blended by alpha"""
+        if alpha >= 255:
+            pygame.draw.circle(self.screen, color, center, radius)
+            return
+
+        circle = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(circle, (*color, alpha), (radius, radius), radius)
+        self.screen.blit(circle, (center[0] - radius, center[1] - radius))
+
+    def blit(self, image, pos):
+        """Draw an unscaled image in the world view"""
+        self.screen.blit(image, pos)
+
+    def draw_wall_strip(self, texture, rect, intensity=255):
+        """Stretch a texture into a wall column and shade it by intensity"""
+        x, y, width, height = rect
+        stretched_texture = pygame.transform.scale(texture, (width, height))
+
+        if intensity < 255:
+            dark_overlay = pygame.Surface((width, height))
+            dark_overlay.fill((intensity, intensity, intensity))
+            stretched_texture.blit(dark_overlay, (0, 0), special_flags=pygame.BLEND_MULT)
+
+        self.screen.blit(stretched_texture, (x, y))
+
+    def draw_sprite(self, image, rect, darkness=0):
+        """Scale the visible part of a sprite into rect and darken it with a black overlay"""
+        rect = pygame.Rect(rect)
+        clip_rect = self.screen.get_clip()
+        scaled_image, pos = scale_clipped(image, rect, clip_rect)
+        if scaled_image is None:
+            return
+
+        self.screen.blit(scaled_image, pos)
+
+        if darkness > 0:
+            visible = rect.clip(clip_rect)
+            dark_surface = pygame.Surface(visible.size)
+            dark_surface.fill(BLACK)
+            dark_surface.set_alpha(darkness)
+            self.screen.blit(dark_surface, visible)
+
+    def present(self):
+        """Show the finished frame"""
+        pygame.display.flip()
+
+
+class SDLBackend:
+    """Hardware-style backend built on pygame._sdl2 Window/Renderer/Texture
+
+    Static images are uploaded to textures once and scaled by SDL at draw
+    time. HUD code keeps drawing onto `screen`, a transparent overlay that is
+    streamed to the renderer on top of the world each frame.
+    """
+    def __init__(self, window, renderer):
+        from pygame._sdl2.video import Texture
+
+        self.window = window
+        self.renderer = renderer
+        self.screen = pygame.Surface(window.size, pygame.SRCALPHA)
+
+        self.overlay = Texture(renderer, window.size, streaming=True)
+        self.overlay.blend_mode = 1  # SDL_BLENDMODE_BLEND
+
+        # Textures are keyed by their source surface and dropped with it
+        self.textures = weakref.WeakKeyDictionary()
+
+        # White circle images by radius, tinted per draw
+        self.circles = {}
+
+    @classmethod
+    def create(cls, size, title, software=False):
+        """Open a window with an SDL renderer"""
+        from pygame._sdl2.video import Window, Renderer
+
+        if software:
+            os.environ["SDL_RENDER_DRIVER"] = "software"
+
+        window = Window(title, size=size)
+        renderer = Renderer(window, accelerated=0 if software else -1)
+        return cls(window, renderer)
+
+    def get_texture(self, image):
+        """Get the texture for a surface, uploading it on first use"""
+        texture = self.textures.get(image)
+        if texture is None:
+            from pygame._sdl2.video import Texture
+            texture = Texture.from_surface(self.renderer, image)
+            self.textures[image] = texture
+        return texture
+
+    def begin_frame(self):
+        """Clear the renderer and the HUD overlay"""
+        self.clear(BLACK)
+
+    def clear(self, color=BLACK):
+        """Clear the world view"""
+        self.renderer.draw_color = pygame.Color(color)
+        self.renderer.clear()
+        self.screen.fill((0, 0, 0, 0))
+
+    def fill_rect(self, color, rect):
+        """Fill a solid rectangle in the world view"""
+        self.renderer.draw_blend_mode = 0
+        self.renderer.draw_color = pygame.Color(color)
+        self.renderer.fill_rect(pygame.Rect(rect))
+
+    def draw_rect(self, color, rect, width=0):
+        """Draw a rectangle in the world view, outlined when width is set"""
+        if width <= 0:
+            self.fill_rect(color, rect)
+            return
+
+        x, y, w, h = pygame.Rect(rect)
+        for edge in ((x, y, w, width), (x, y + h - width, w, width),
+                     (x, y, width, h), (x + w - width, y, width, h)):
+            self.fill_rect(color, edge)
+
+    def draw_circle(self, color, center, radius, alpha=255):
+        """Draw a filled circle in the world view from a tinted circle texture"""
+        radius = int(radius)
+        if radius <= 0:
+            return
+
+        circle = self.circles.get(radius)
+        if circle is None:
+            circle = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(circle, WHITE, (radius, radius), radius)
+            self.circles[radius] = circle
+
+        texture = self.get_texture(circle)
+        texture.color = color
+        texture.alpha = alpha
+        texture.draw(dstrect=(int(center[0]) - radius, int(center[1]) - radius, radius * 2, radius * 2))
+
+    def blit(self, image, pos):
+        """Draw an unscaled image in the world view"""
+        texture = self.get_texture(image)
+        texture.color = WHITE
+        texture.draw(dstrect=(pos[0], pos[1], texture.width, texture.height))
+
+    def draw_wall_strip(self, texture, rect, intensity=255):
+        """Let SDL stretch a texture into a wall column, shaded by color mod"""
+        sdl_texture = self.get_texture(texture)
+        sdl_texture.color = (intensity, intensity, intensity)
+        sdl_texture.draw(dstrect=pygame.Rect(rect))
+
+    def draw_sprite(self, image, rect, darkness=0):
+        """Let SDL scale a sprite into rect and darken it with a black overlay"""
+        rect = pygame.Rect(rect)
+        texture = self.get_texture(image)
+        texture.color = WHITE
+        texture.draw(dstrect=rect)
+
+        if darkness > 0:
+            self.renderer.draw_blend_mode = 1
+            self.renderer.draw_color = (0, 0, 0, darkness)
+            self.renderer.fill_rect(rect)
+
+    def present(self):
+        """Composite the HUD overlay and show the finished frame"""
+        self.overlay.update(self.screen)
+        self.overlay.draw()
+        self.renderer.present()
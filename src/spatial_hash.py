@@ -0,0 +1,84 @@
+from constants import TILE_SIZE
+
+
+class SpatialHash:
+    """Uniform grid of buckets for broadphase proximity queries
+
+    Objects need `x`, `y` and `size` attributes. Queries return every object
+    in the cells overlapped by the query circle grown by the largest object
+    size, so callers still do their own exact distance test. The hash can
+    be rebuilt every tick, or kept and told about moves with move().
+    """
+    def __init__(self, cell_size=TILE_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.max_size = 0
+
+    def clear(self):
+        """Remove all objects"""
+        self.cells.clear()
+        self.max_size = 0
+
+    def get_cell(self, x, y):
+        """Get the cell key containing a position"""
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, obj, x=None, y=None):
+        """Add an object to the cell for (x, y), its own position by default"""
+        key = self.get_cell(obj.x if x is None else x, obj.y if y is None else y)
+        bucket = self.cells.get(key)
+        if bucket is None:
+            self.cells[key] = [obj]
+        else:
+            bucket.append(obj)
+
+        if obj.size > self.max_size:
+            self.max_size = obj.size
+
+    def remove(self, obj, x=None, y=None):
+        """Take an object out of the cell for (x, y), its own position by default"""
+        key = self.get_cell(obj.x if x is None else x, obj.y if y is None else y)
+        bucket = self.cells.get(key)
+        if bucket and obj in bucket:
+            bucket.remove(obj)
+            if not bucket:
+                del self.cells[key]
+
+    def move(self, obj, old_x, old_y):
+        """Refile an object that moved from (old_x, old_y), if it changed cell"""
+        if self.get_cell(old_x, old_y) != self.get_cell(obj.x, obj.y):
+            self.remove(obj, old_x, old_y)
+            self.insert(obj)
+
+    def rebuild(self, objects):
+        """Replace the contents with the given objects"""
+        self.clear()
+        for obj in objects:
+            self.insert(obj)
+
+    def query(self, x, y, radius):
+        """Get objects that may lie within radius of a position"""
+        reach = radius + self.max_size
+        min_x, min_y = self.get_cell(x - reach, y - reach)
+        max_x, max_y = self.get_cell(x + reach, y + reach)
+
+        found = []
+        for cell_y in range(min_y, max_y + 1):
+            for cell_x in range(min_x, max_x + 1):
+                bucket = self.cells.get((cell_x, cell_y))
+                if bucket:
+                    found.extend(bucket)
+        return found
+
+    def nearest(self, x, y, radius):
+        """Get the object closest to a position within radius, or None"""
+        best = None
+        best_distance_sq = radius * radius
+        for obj in self.query(x, y, radius):
+            dx = obj.x - x
+            dy = obj.y - y
+            distance_sq = dx * dx + dy * dy
+            if distance_sq < best_distance_sq:
+                best = obj
+                best_distance_sq = distance_sq
+        return best
@@ -0,0 +1,61 @@
+import time
+from collections import deque
+from constants import *
+
+
+class SpawnScheduler:
+    """Queue of pending spawns that are created a few at a time
+
+    Spawns are queued as generators that create and add one entity per
+    step. Each tick runs at most `max_per_tick` steps within
+    `time_budget_ms` of real time, and consecutive batches are at least
+    `stagger_ms` of game time apart so a wave arrives gradually instead of
+    all in one frame. `pending` counts spawns that have not happened yet.
+    """
+    def __init__(self, max_per_tick=SPAWNS_PER_TICK, time_budget_ms=SPAWN_TIME_BUDGET_MS,
+                 stagger_ms=SPAWN_STAGGER_MS):
+        self.max_per_tick = max_per_tick
+        self.time_budget = time_budget_ms / 1000
+        self.stagger_ms = stagger_ms
+        self.queue = deque()
+        self.pending = 0
+        self.next_spawn_time = 0
+
+    def schedule(self, spawns, count):
+        """Queue a generator that adds one entity per step, count steps long"""
+        self.queue.append([spawns, count])
+        self.pending += count
+
+    def clear(self):
+        """Drop every queued spawn"""
+        self.queue.clear()
+        self.pending = 0
+        self.next_spawn_time = 0
+
+    def update(self, current_time):
+        """Run the spawns that fit in this tick's budget, returns how many ran"""
+        if not self.queue or current_time < self.next_spawn_time:
+            return 0
+
+        deadline = time.perf_counter() + self.time_budget
+        spawned = 0
+        while self.queue and spawned < self.max_per_tick:
+            entry = self.queue[0]
+            try:
+                next(entry[0])
+            except StopIteration:
+                # Generator ended early, forget its unused count
+                self.pending -= entry[1]
+                self.queue.popleft()
+                continue
+
+            spawned += 1
+            self.pending -= 1
+            entry[1] -= 1
+            if entry[1] <= 0:
+                self.queue.popleft()
+            if time.perf_counter() > deadline:
+                break
+
+        self.next_spawn_time = current_time + self.stagger_ms
+        return spawned
@@ -0,0 +1,126 @@
+import math
+import random
+import numpy as np
+from constants import *
+
+
+class SpawnTable:
+    """Precomputed open spawn points for one map
+
+    Built once from a CollisionGrid: every point of a regular lattice that
+    clears the walls by SPAWN_CLEARANCE is kept. Points inside the spawn
+    ring around the map's centre are also bucketed by ring and angle
+    sector, so picking one is a random bucket and a random index into it
+    with no retries. Buckets whose bounds reach into the area kept clear
+    around the player are skipped as a whole.
+
+    Every open point is also bucketed by square cell, so sampling around a
+    position only looks at the points in the cells its annulus overlaps.
+    """
+    def __init__(self, collision_grid, center_x, center_y, inner_radius, outer_radius,
+                 rings=SPAWN_RINGS, sectors=SPAWN_SECTORS, spacing=SPAWN_POINT_SPACING,
+                 cell_size=SPAWN_CELL_SIZE):
+        self.center_x = center_x
+        self.center_y = center_y
+        self.cell_size = cell_size
+
+        # Every open lattice point on the map
+        columns = int(collision_grid.width * collision_grid.tile_size // spacing)
+        rows = int(collision_grid.height * collision_grid.tile_size // spacing)
+        grid_x, grid_y = np.meshgrid((np.arange(columns) + 0.5) * spacing,
+                                     (np.arange(rows) + 0.5) * spacing)
+        grid_x = grid_x.ravel()
+        grid_y = grid_y.ravel()
+        open_points = ~collision_grid.is_blocked_circle_batch(grid_x, grid_y, SPAWN_CLEARANCE)
+        points_x = grid_x[open_points]
+        points_y = grid_y[open_points]
+
+        # Sort the open points by cell, each cell's points are then the
+        # slice cell_start[cell]:cell_start[cell + 1]
+        self.cells_wide = int(math.ceil(collision_grid.width * collision_grid.tile_size / cell_size))
+        self.cells_high = int(math.ceil(collision_grid.height * collision_grid.tile_size / cell_size))
+        cell = ((points_y // cell_size).astype(np.int64) * self.cells_wide
+                + (points_x // cell_size).astype(np.int64))
+        order = np.argsort(cell, kind='stable')
+        self.points_x = points_x[order]
+        self.points_y = points_y[order]
+        self.cell_start = np.searchsorted(cell[order],
+                                          np.arange(self.cells_wide * self.cells_high + 1))
+
+        # Bucket the points inside the spawn ring by ring and sector
+        dx = self.points_x - center_x
+        dy = self.points_y - center_y
+        distance = np.hypot(dx, dy)
+        in_ring = (distance >= inner_radius) & (distance <= outer_radius)
+        ring = np.minimum((distance - inner_radius) / (outer_radius - inner_radius) * rings,
+                          rings - 1).astype(np.int64)
+        sector = (np.arctan2(dy, dx) % (2 * math.pi) / (2 * math.pi) * sectors).astype(np.int64)
+        bucket = np.where(in_ring, ring * sectors + np.minimum(sector, sectors - 1), -1)
+
+        order = np.argsort(bucket, kind='stable')
+        order = order[bucket[order] >= 0]
+        self.ring_x = self.points_x[order]
+        self.ring_y = self.points_y[order]
+        bucket_ids, self.bucket_start, self.bucket_count = np.unique(
+            bucket[order], return_index=True, return_counts=True)
+
+        # Bounding circle of each non-empty bucket for player exclusion
+        self.bucket_x = np.add.reduceat(self.ring_x, self.bucket_start) / self.bucket_count
+        self.bucket_y = np.add.reduceat(self.ring_y, self.bucket_start) / self.bucket_count
+        self.bucket_radius = np.zeros(len(bucket_ids))
+        for i, (start, count) in enumerate(zip(self.bucket_start, self.bucket_count)):
+            self.bucket_radius[i] = np.hypot(self.ring_x[start:start + count] - self.bucket_x[i],
+                                             self.ring_y[start:start + count] - self.bucket_y[i]).max()
+
+    @classmethod
+    def from_map(cls, collision_grid, center_x, center_y, spawn_radius):
+        """Build a table for the arena's spawn ring of 0.7 to 1 times spawn_radius"""
+        return cls(collision_grid, center_x, center_y, spawn_radius * 0.7, spawn_radius)
+
+    def sample(self, avoid_x, avoid_y, avoid_radius):
+        """Get a random spawn point in the ring at least avoid_radius from a position"""
+        gap = np.hypot(self.bucket_x - avoid_x, self.bucket_y - avoid_y) - self.bucket_radius
+        allowed = np.flatnonzero(gap > avoid_radius)
+        if len(allowed) == 0:
+            return self.farthest_from(avoid_x, avoid_y)
+
+        bucket = allowed[random.randrange(len(allowed))]
+        index = self.bucket_start[bucket] + random.randrange(self.bucket_count[bucket])
+        return self.ring_x[index].item(), self.ring_y[index].item()
+
+    def points_near(self, x, y, radius):
+        """Get the indices of the open points in cells within radius of a position"""
+        low_x = max(int((x - radius) // self.cell_size), 0)
+        high_x = min(int((x + radius) // self.cell_size), self.cells_wide - 1)
+        low_y = max(int((y - radius) // self.cell_size), 0)
+        high_y = min(int((y + radius) // self.cell_size), self.cells_high - 1)
+        if low_x > high_x or low_y > high_y:
+            return np.zeros(0, dtype=np.int64)
+
+        # Each row of cells is one contiguous run of sorted points
+        rows = np.arange(low_y, high_y + 1) * self.cells_wide
+        starts = self.cell_start[rows + low_x]
+        counts = self.cell_start[rows + high_x + 1] - starts
+        offsets = np.cumsum(counts) - counts
+        return np.repeat(starts - offsets, counts) + np.arange(counts.sum())
+
+    def sample_near(self, x, y, inner_radius, outer_radius):
+        """Get a random open point between two distances from a position
+
+        Only the points in cells overlapping the annulus are checked. Falls
+        back to the open point nearest the position.
+        """
+        candidates = self.points_near(x, y, outer_radius)
+        distance_sq = (self.points_x[candidates] - x) ** 2 + (self.points_y[candidates] - y) ** 2
+        candidates = candidates[(distance_sq >= inner_radius * inner_radius) &
+                                (distance_sq <= outer_radius * outer_radius)]
+        if len(candidates):
+            index = candidates[random.randrange(len(candidates))]
+        else:
+            index = ((self.points_x - x) ** 2 + (self.points_y - y) ** 2).argmin()
+        return self.points_x[index].item(), self.points_y[index].item()
+
+    def farthest_from(self, x, y):
+        """Get the ring point farthest from a position"""
+        index = ((self.ring_x - x) ** 2 + (self.ring_y - y) ** 2).argmax()
+        return self.ring_x[index].item(), self.ring_y[index].item()
@@ -1,58 +1,69 @@
 import math
 from constants import *
+from entity_stats import SPELL_STATS
+from combat_events import HitEvent
+
+class TrailParticle:
+    """Fading particle left behind a moving spell"""
+    __slots__ = ('x', 'y', 'life', 'size', 'color')
+
+    def __init__(self, x, y, size, color):
+        self.reset(x, y, size, color)
+
+    def reset(self, x, y, size, color):
+        """Reinitialise a recycled particle"""
+        self.x = x
+        self.y = y
+        self.life = 1.0
+        self.size = size
+        self.color = color
+
 
 class Spell:
-    def __init__(self, x: float, y: float, angle: float, spell_type: str = "fireball", sound_manager=None):
+    __slots__ = (
+        'x', 'y', 'prev_x', 'prev_y', 'angle', 'spell_type', 'stats', 'alive', 'events',
+        'speed', 'color', 'size',
+        'damage', 'trail_particles', 'spare_particles', 'particle_timer', 'handle',
+    )
+    
+    particle_spawn_rate = 50
+    max_trail_particles = 10
+    
+    def __init__(self, x: float, y: float, angle: float, spell_type: str = "fireball", events=None):
+        # Particle trail system, dead particles are kept for reuse
+        self.trail_particles = []
+        self.spare_particles = []
+        
+        # Set while the spell is in the arena's registry
+        self.handle = None
+        
+        self.reset(x, y, angle, spell_type, events)
+        
+    def reset(self, x: float, y: float, angle: float, spell_type: str = "fireball", events=None):
+        """Reinitialise a recycled spell for a new cast"""
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.angle = angle
         self.spell_type = spell_type
+        self.stats = stats = SPELL_STATS[spell_type]
         self.alive = True
-        self.sound_manager = sound_manager
         
-        # Set spell properties based on type
-        if spell_type == "fireball":
-            self.speed = 300
-            self.damage = 100
-            self.color = ORANGE
-            self.size = 8
-            self.trail_particles = []
-        elif spell_type == "lightning":
-            self.speed = 500
-            self.damage = 40
-            self.color = YELLOW
-            self.size = 6
-            self.trail_particles = []
-        elif spell_type == "ice":
-            self.speed = 250
-            self.damage = 80
-            self.color = LIGHT_BLUE
-            self.size = 10
-            self.trail_particles = []
-        elif spell_type == "heal":
-            self.speed = 0  # Instant cast
-            self.damage = -50  # Negative = healing
-            self.color = GREEN
-            self.size = 15
-            self.trail_particles = []
-        elif spell_type == "shield":
-            self.speed = 0  # Instant cast
-            self.damage = 0
-            self.color = PURPLE
-            self.size = 20
-            self.trail_particles = []
-        elif spell_type == "teleport":
-            self.speed = 0  # Instant cast
-            self.damage = 0
-            self.color = (255, 0, 255)
-            self.size = 12
-            self.trail_particles = []
+        # Hot per-type constants are copied into slots for fast reads
+        self.speed = stats.speed
+        self.color = stats.color
+        self.size = stats.size
+        self.events = events
         
-        # Particle trail system
+        # Damage is scaled per cast by the player's spell level
+        self.damage = self.stats.damage
+        
+        self.spare_particles.extend(self.trail_particles)
+        self.trail_particles.clear()
         self.particle_timer = 0
-        self.particle_spawn_rate = 50
             
-    def update(self, dt, collision_map=None, map_width=0, map_height=0):
+    def update(self, dt, collision_grid=None):
         """Update spell position and check collisions"""
         if not self.alive:
             return
@@ -62,8 +73,9 @@ class Spell:
             self.alive = False
             return
             
-        # Move spell
+        # Move spell, the step from prev to the new position is swept for hits
         old_x, old_y = self.x, self.y
+        self.prev_x, self.prev_y = old_x, old_y
         self.x += math.cos(self.angle) * self.speed * dt
         self.y += math.sin(self.angle) * self.speed * dt
         
@@ -75,70 +87,91 @@ class Spell:
         
         self.update_particles(dt)
         
-        # Check wall collisions
-        if collision_map:
-            map_x = int(self.x // TILE_SIZE)
-            map_y = int(self.y // TILE_SIZE)
-            
-            if (map_x < 0 or map_x >= map_width or 
-                map_y < 0 or map_y >= map_height or 
-                collision_map[map_y][map_x] != 0):
-                if self.sound_manager:
-                    self.sound_manager.play_sound('spell_hit')
+        # Check wall collisions along the whole step, stopping at the wall
+        if collision_grid:
+            hit = collision_grid.segment_block_fraction(old_x, old_y, self.x, self.y)
+            if hit is not None:
+                self.x = old_x + (self.x - old_x) * hit
+                self.y = old_y + (self.y - old_y) * hit
+                if self.events:
+                    self.events.push(HitEvent(None, 0, self.spell_type))
                 self.alive = False
     
     def add_trail_particle(self, x, y):
         """Add a particle to the spell's trail"""
         import random
         
-        particle = {
-            'x': x + random.uniform(-2, 2),
-            'y': y + random.uniform(-2, 2),
-            'life': 1.0,
-            'size': random.uniform(2, 4),
-            'color': self.color
-        }
+        particle_x = x + random.uniform(-2, 2)
+        particle_y = y + random.uniform(-2, 2)
+        particle_size = random.uniform(2, 4)
+        
+        if self.spare_particles:
+            particle = self.spare_particles.pop()
+            particle.reset(particle_x, particle_y, particle_size, self.color)
+        else:
+            particle = TrailParticle(particle_x, particle_y, particle_size, self.color)
         self.trail_particles.append(particle)
         
         # Limit trail length
-        if len(self.trail_particles) > 10:
-            self.trail_particles.pop(0)
+        if len(self.trail_particles) > self.max_trail_particles:
+            self.spare_particles.append(self.trail_particles.pop(0))
     
     def update_particles(self, dt):
         """Update trail particles"""
-        for particle in self.trail_particles[:]:
-            particle['life'] -= dt * 3
-            particle['size'] *= 0.98
+        for i in range(len(self.trail_particles) - 1, -1, -1):
+            particle = self.trail_particles[i]
+            particle.life -= dt * 3
+            particle.size *= 0.98
             
-            # Remove dead particles
-            if particle['life'] <= 0:
-                self.trail_particles.remove(particle)
+            # Recycle dead particles
+            if particle.life <= 0:
+                self.spare_particles.append(self.trail_particles.pop(i))
     
-    def render_trail(self, screen):
-        """Render spell trail particles"""
-        import pygame
-        
+    def render_trail(self, backend):
+        """Render spell trail particles through the world view's render backend"""
         for particle in self.trail_particles:
-            if particle['life'] > 0:
+            if particle.life > 0:
                 # Calculate alpha based on particle life
-                alpha = int(255 * particle['life'])
-                size = max(1, int(particle['size']))
-                
-                particle_surface = pygame.Surface((size * 2, size * 2))
-                particle_surface.set_alpha(alpha)
-                particle_color = particle['color']
+                alpha = int(255 * particle.life)
+                size = max(1, int(particle.size))
                 
                 # Adjust brightness based on life
-                brightness = particle['life']
-                adjusted_color = tuple(int(c * brightness) for c in particle_color)
+                brightness = particle.life
+                adjusted_color = tuple(int(c * brightness) for c in particle.color)
                 
-                pygame.draw.circle(particle_surface, adjusted_color, (size, size), size)
-                screen.blit(particle_surface, (particle['x'] - size, particle['y'] - size))
+                backend.draw_circle(adjusted_color, (particle.x, particle.y), size, alpha)
     
-    def on_hit_target(self):
+    def on_hit_target(self, target):
         """Called when spell hits a target (enemy/boss)"""
-        if self.sound_manager:
-            if self.spell_type == "heal":
-                pass  # No sound for heal on hit
-            else:
-                self.sound_manager.play_sound('spell_hit')
\ No newline at end of file
+        if self.events:
+            self.events.push(HitEvent(target, self.damage, self.spell_type))
+
+
+class SpellPool:
+    """Recycles Spell objects (and their trail particles) between casts
+
+    Released spells are kept, up to `cap`, and handed back out by acquire()
+    after a reset. `hits` counts casts served from the pool and `misses`
+    casts that had to allocate a new Spell.
+    """
+    def __init__(self, cap=SPELL_POOL_SIZE):
+        self.cap = cap
+        self.free = []
+        self.hits = 0
+        self.misses = 0
+        
+    def acquire(self, x: float, y: float, angle: float, spell_type: str = "fireball", events=None):
+        """Get a spell ready to fly, reusing a released one when possible"""
+        if self.free:
+            spell = self.free.pop()
+            spell.reset(x, y, angle, spell_type, events)
+            self.hits += 1
+        else:
+            spell = Spell(x, y, angle, spell_type, events)
+            self.misses += 1
+        return spell
+        
+    def release(self, spell):
+        """Return a finished spell to the pool"""
+        if len(self.free) < self.cap:
+            self.free.append(spell)
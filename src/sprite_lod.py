@@ -0,0 +1,74 @@
+import weakref
+import pygame
+from constants import *
+
+LOD_FULL = 0
+LOD_REDUCED = 1
+LOD_IMPOSTOR = 2
+
+
+class SpriteLOD:
+    """Level-of-detail policy for billboards
+
+    Sprites beyond `distance` or smaller than `min_size` pixels are drawn
+    from a small pre-reduced copy of their image, and sprites smaller than
+    `impostor_size` pixels become a solid rect in the image's average colour.
+    Reduced images and colours are cached per source image.
+    """
+    def __init__(self, distance=SPRITE_LOD_DISTANCE, min_size=SPRITE_LOD_MIN_SIZE,
+                 impostor_size=SPRITE_IMPOSTOR_SIZE, reduced_size=SPRITE_LOD_IMAGE_SIZE):
+        self.distance = distance
+        self.min_size = min_size
+        self.impostor_size = impostor_size
+        self.reduced_size = reduced_size
+
+        self.reduced_images = weakref.WeakKeyDictionary()
+        self.impostor_colors = weakref.WeakKeyDictionary()
+
+    def get_level(self, distance, pixel_size):
+        """Pick the detail level for a sprite at this distance and size"""
+        if pixel_size < self.impostor_size:
+            return LOD_IMPOSTOR
+        if distance > self.distance or pixel_size < self.min_size:
+            return LOD_REDUCED
+        return LOD_FULL
+
+    def get_reduced_image(self, image):
+        """Get a copy of image no larger than reduced_size on either side"""
+        reduced = self.reduced_images.get(image)
+        if reduced is None:
+            width, height = image.get_size()
+            factor = self.reduced_size / max(width, height)
+            if factor < 1:
+                reduced = pygame.transform.scale(
+                    image, (max(1, int(width * factor)), max(1, int(height * factor)))
+                )
+            else:
+                reduced = image
+            self.reduced_images[image] = reduced
+        return reduced
+
+    def get_impostor_color(self, image):
+        """Get the average colour of image"""
+        color = self.impostor_colors.get(image)
+        if color is None:
+            average = pygame.transform.average_color(image, consider_alpha=True)
+            color = (average[0], average[1], average[2])
+            self.impostor_colors[image] = color
+        return color
+
+    def draw(self, backend, image, rect, distance, darkness=0):
+        """Draw a billboard at the right detail level and return that level"""
+        rect = pygame.Rect(rect)
+        level = self.get_level(distance, min(rect.width, rect.height))
+
+        if level == LOD_FULL:
+            backend.draw_sprite(image, rect, darkness)
+        elif level == LOD_REDUCED:
+            backend.draw_sprite(self.get_reduced_image(image), rect, darkness)
+        else:
+            shade = (255 - darkness) / 255
+            color = self.get_impostor_color(image)
+            backend.fill_rect(tuple(int(c * shade) for c in color), rect)
+
+        return level
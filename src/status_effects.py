@@ -0,0 +1,121 @@
+import numpy as np
+
+# Effect kinds, each a column of the strength and expiry tables
+EFFECT_SLOW = 0
+EFFECT_BURN = 1
+EFFECT_STUN = 2
+EFFECT_SHIELD = 3
+EFFECT_REGEN = 4
+EFFECT_KINDS = 5
+
+EFFECT_NAMES = {
+    "slow": EFFECT_SLOW,
+    "burn": EFFECT_BURN,
+    "stun": EFFECT_STUN,
+    "shield": EFFECT_SHIELD,
+    "regen": EFFECT_REGEN,
+}
+
+
+class StatusEffects:
+    """Status effects on entities, held in columns keyed by entity handle
+
+    Each affected entity has one row, with the strength and expiry time of
+    every effect kind in its own column: slow is the fraction of speed
+    lost, burn and regen are health per second, stun stops the entity and
+    shield is damage still to absorb. Rows are packed at 0..count-1 and
+    removal swaps the last row into the hole, so apply() and remove() are
+    O(1). tick() expires and sums every effect in one pass over the arrays.
+
+    active_counts holds how many entities had each effect at the last tick.
+    """
+    def __init__(self, capacity=64):
+        self.capacity = max(1, capacity)
+        self.count = 0
+        self.row_of = {}
+        self.handles = np.zeros(self.capacity, dtype=np.int64)
+        self.strength = np.zeros((self.capacity, EFFECT_KINDS))
+        self.until = np.zeros((self.capacity, EFFECT_KINDS))
+        self.active_counts = [0] * EFFECT_KINDS
+
+    def grow(self):
+        """Double the capacity of every column"""
+        self.capacity *= 2
+        for name in ('handles', 'strength', 'until'):
+            column = getattr(self, name)
+            grown = np.zeros((self.capacity,) + column.shape[1:], dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            setattr(self, name, grown)
+
+    def __len__(self):
+        return self.count
+
+    def apply(self, handle, kind, strength, duration, current_time):
+        """Put an effect on an entity, keeping the stronger and longer of any it has"""
+        row = self.row_of.get(handle)
+        if row is None:
+            if self.count == self.capacity:
+                self.grow()
+            row = self.count
+            self.count += 1
+            self.row_of[handle] = row
+            self.handles[row] = handle
+            self.strength[row] = 0.0
+            self.until[row] = 0.0
+
+        if self.until[row, kind] <= current_time:
+            self.strength[row, kind] = strength
+        else:
+            self.strength[row, kind] = max(self.strength[row, kind], strength)
+        self.until[row, kind] = max(self.until[row, kind], current_time + duration)
+
+    def absorb(self, handle, damage, current_time):
+        """Take damage off an entity's shield, returns the damage that gets through"""
+        row = self.row_of.get(handle)
+        if row is None or self.until[row, EFFECT_SHIELD] <= current_time:
+            return damage
+        blocked = min(self.strength[row, EFFECT_SHIELD], damage)
+        self.strength[row, EFFECT_SHIELD] -= blocked
+        return damage - blocked
+
+    def remove(self, handle):
+        """Drop every effect on an entity in O(1)"""
+        row = self.row_of.pop(handle, None)
+        if row is None:
+            return
+        last = self.count - 1
+        if row != last:
+            moved = int(self.handles[last])
+            self.handles[row] = moved
+            self.strength[row] = self.strength[last]
+            self.until[row] = self.until[last]
+            self.row_of[moved] = row
+        self.count -= 1
+
+    def clear(self):
+        """Drop every effect"""
+        self.row_of.clear()
+        self.count = 0
+
+    def tick(self, dt, current_time):
+        """Expire finished effects and sum this step's result for every entity
+
+        Returns the handles of affected entities with matching arrays of
+        damage taken, health regained and speed multiplier. Entities left
+        with no effects are dropped afterwards.
+        """
+        count = self.count
+        strength = self.strength[:count]
+        active = self.until[:count] > current_time
+        strength[~active] = 0.0
+        self.active_counts = active.sum(axis=0).tolist()
+
+        handles = self.handles[:count].copy()
+        damage = strength[:, EFFECT_BURN] * dt
+        heal = strength[:, EFFECT_REGEN] * dt
+        speed_scale = np.where(active[:, EFFECT_STUN], 0.0,
+                               1.0 - np.minimum(strength[:, EFFECT_SLOW], 1.0))
+
+        for handle in handles[~active.any(axis=1)]:
+            self.remove(int(handle))
+        return handles, damage, heal, speed_scale
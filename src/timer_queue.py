@@ -0,0 +1,70 @@
+import heapq
+import itertools
+
+
+class Timer:
+    """Handle for one scheduled callback"""
+    __slots__ = ('due', 'entry_id', 'callback', 'args', 'active')
+
+    def __init__(self, due, callback, args):
+        self.due = due
+        self.entry_id = 0
+        self.callback = callback
+        self.args = args
+        self.active = True
+
+
+class TimerQueue:
+    """Min-heap of callbacks due at times on the game clock
+
+    `clock` returns the current game time in milliseconds. advance() pops
+    and runs only the timers that are due, so waiting timers cost nothing
+    per tick. Cancelled and rescheduled timers leave their old heap entry
+    behind, which is skipped when it comes up.
+    """
+    def __init__(self, clock):
+        self.clock = clock
+        self.heap = []
+        self.entry_ids = itertools.count()
+
+    def push(self, timer):
+        """Add a heap entry for the timer's current due time"""
+        timer.entry_id = next(self.entry_ids)
+        heapq.heappush(self.heap, (timer.due, timer.entry_id, timer))
+
+    def schedule(self, delay, callback, *args):
+        """Call callback(*args) delay milliseconds from now, returns the Timer"""
+        timer = Timer(self.clock() + delay, callback, args)
+        self.push(timer)
+        return timer
+
+    def reschedule(self, timer, delay):
+        """Move a timer to delay milliseconds from now, reviving it if it had run"""
+        timer.due = self.clock() + delay
+        timer.active = True
+        self.push(timer)
+
+    def cancel(self, timer):
+        """Stop a timer from running, None is ignored"""
+        if timer is not None:
+            timer.active = False
+
+    def clear(self):
+        """Drop every timer"""
+        for _, _, timer in self.heap:
+            timer.active = False
+        self.heap.clear()
+
+    def advance(self):
+        """Run every timer that is due, returns how many ran"""
+        now = self.clock()
+        heap = self.heap
+        fired = 0
+        while heap and heap[0][0] <= now:
+            _, entry_id, timer = heapq.heappop(heap)
+            if not timer.active or entry_id != timer.entry_id:
+                continue
+            timer.active = False
+            timer.callback(*timer.args)
+            fired += 1
+        return fired
@@ -3,16 +3,36 @@ import math
 from constants import *
 from raycaster import RayCaster
 from town_map import TownMap
+from collision_grid import CollisionGrid
+from line_of_sight import LineOfSightTable
+from spatial_hash import SpatialHash
+from building_lookup import BuildingLookup
+from sprite_lod import LOD_FULL
+from fixed_timestep import RenderInterpolation, save_previous
+from timer_queue import TimerQueue
 
 class NPC:
     """Simple NPC that wanders around town with proper collision detection"""
+    __slots__ = (
+        'x', 'y', 'prev_x', 'prev_y', 'name', 'color', 'texture_key', 'image',
+        'dialogue', 'has_talked', 'is_being_talked_to',
+        'target_x', 'target_y', 'home_x', 'home_y', 'target_reached_time', 'stuck_timer',
+    )
+    
+    # Shared by every NPC
+    size = 12
+    speed = 15
+    wander_radius = 60
+    wait_time = 3000
+    max_stuck_time = 2000
+    
     def __init__(self, x, y, name, color=BLUE, dialogue=None, texture_key=None):
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.name = name
         self.color = color
-        self.size = 12
-        self.speed = 15
         self.texture_key = texture_key
         self.image = None
         
@@ -23,30 +43,32 @@ class NPC:
         # Wandering behavior
         self.target_x = x
         self.target_y = y
-        self.wander_radius = 60
         self.home_x = x
         self.home_y = y
         self.target_reached_time = 0
-        self.wait_time = 3000
         self.stuck_timer = 0
-        self.max_stuck_time = 2000
         
-    def update(self, dt, current_time, town_map):
-        """Update NPC movement with collision detection"""
+    def update(self, dt, current_time, collision_grid, npc_index=None):
+        """Update NPC movement with collision detection, keeping npc_index up to date"""
         if self.is_being_talked_to:
             return
             
+        old_x, old_y = self.x, self.y
+        self.wander(dt, current_time, collision_grid)
+        if npc_index is not None:
+            npc_index.move(self, old_x, old_y)
+            
+    def wander(self, dt, current_time, collision_grid):
+        """Walk toward the current target, picking a new one when there or stuck"""
         distance_to_target = math.sqrt((self.x - self.target_x)**2 + (self.y - self.target_y)**2)
         
         # Check if target reached
         if distance_to_target < 15:
             if current_time - self.target_reached_time > self.wait_time:
-                self.set_new_target(town_map)
+                self.set_new_target(collision_grid)
                 self.target_reached_time = current_time
                 self.stuck_timer = 0
         else:
-            old_x, old_y = self.x, self.y
-            
             # Move towards target
             dx = self.target_x - self.x
             dy = self.target_y - self.y
@@ -57,11 +79,8 @@ class NPC:
                 new_x = self.x + dx * self.speed * dt
                 new_y = self.y + dy * self.speed * dt
                 
-                new_tile_x = int(new_x // TILE_SIZE)
-                new_tile_y = int(new_y // TILE_SIZE)
-                
                 # Check collision before moving
-                if town_map.is_walkable(new_tile_x, new_tile_y):
+                if not collision_grid.is_blocked(new_x, new_y):
                     self.x = new_x
                     self.y = new_y
                     self.stuck_timer = 0
@@ -70,10 +89,10 @@ class NPC:
                     
                     # Find new target if stuck too long
                     if self.stuck_timer > self.max_stuck_time:
-                        self.set_new_target(town_map)
+                        self.set_new_target(collision_grid)
                         self.stuck_timer = 0
                 
-    def set_new_target(self, town_map):
+    def set_new_target(self, collision_grid):
         """Set a new random target within wander radius, avoiding buildings"""
         import random
         attempts = 0
@@ -87,14 +106,11 @@ class NPC:
             potential_y = self.home_y + math.sin(angle) * distance
             
             # Keep within map bounds
-            potential_x = max(TILE_SIZE, min((town_map.width - 1) * TILE_SIZE, potential_x))
-            potential_y = max(TILE_SIZE, min((town_map.height - 1) * TILE_SIZE, potential_y))
-            
-            target_tile_x = int(potential_x // TILE_SIZE)
-            target_tile_y = int(potential_y // TILE_SIZE)
+            potential_x = max(TILE_SIZE, min((collision_grid.width - 1) * TILE_SIZE, potential_x))
+            potential_y = max(TILE_SIZE, min((collision_grid.height - 1) * TILE_SIZE, potential_y))
             
             # Check if target is walkable
-            if town_map.is_walkable(target_tile_x, target_tile_y):
+            if not collision_grid.is_blocked(potential_x, potential_y):
                 self.target_x = potential_x
                 self.target_y = potential_y
                 return
@@ -112,9 +128,12 @@ class TownState:
         self.player = player
         
         self.town_map = TownMap()
-        self.raycaster = RayCaster(screen)
+        self.collision_grid = CollisionGrid.from_map(self.town_map)
+        self.line_of_sight = LineOfSightTable.from_grid(self.collision_grid)
+        self.raycaster = RayCaster(screen, game_manager.backend)
+        self.interpolation = RenderInterpolation()
         
-        # Interaction system
+        # Interaction system, setting the range rebuilds the building lookup
         self.interaction_range = 80
         self.show_interaction_prompt = False
         self.current_interaction = None
@@ -125,6 +144,11 @@ class TownState:
         self.dialogue_text = ""
         self.dialogue_timer = 0
         self.dialogue_duration = 5000
+        self.dialogue_choices_duration = 15000
+        
+        # Dialogue timeouts run on the game clock
+        self.timers = TimerQueue(lambda: self.game_manager.sim_time)
+        self.dialogue_timeout = None
         self.show_dialogue_choices = False
         self.dialogue_choices = []
         self.selected_choice = 0
@@ -197,6 +221,23 @@ class TownState:
         
         self.load_npc_images()
         
+        # NPCs bucketed by tile for interaction checks, refiled as they move
+        self.npc_index = SpatialHash(TILE_SIZE)
+        self.npc_index.rebuild(self.npcs)
+        
+    @property
+    def interaction_range(self):
+        """How close the player has to be to talk to an NPC or enter a building"""
+        return self._interaction_range
+        
+    @interaction_range.setter
+    def interaction_range(self, value):
+        self._interaction_range = value
+        if hasattr(self, 'building_lookup'):
+            self.building_lookup.rebuild(interaction_range=value)
+        else:
+            self.building_lookup = BuildingLookup(self.town_map, value)
+        
     def load_npc_images(self):
         """Load NPC images from the raycaster's texture cache"""
         for npc in self.npcs:
@@ -229,6 +270,8 @@ class TownState:
         self.show_dialogue_choices = False
         self.dialogue_text = ""
         self.dialogue_timer = 0
+        self.timers.clear()
+        self.dialogue_timeout = None
         
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
@@ -255,7 +298,7 @@ class TownState:
         if self.current_npc:
             self.show_dialogue_choices = True
             self.selected_choice = 0
-            self.dialogue_timer = pygame.time.get_ticks()
+            self.restart_dialogue_timeout(self.dialogue_choices_duration)
             self.current_npc.is_being_talked_to = True
             
             # Generate dialogue choices based on NPC
@@ -327,7 +370,7 @@ class TownState:
             self.dialogue_text = f"You: {chosen_question}\n\n{self.current_npc.name}: {response}"
             self.show_dialogue = True
             self.show_dialogue_choices = False
-            self.dialogue_timer = pygame.time.get_ticks()
+            self.restart_dialogue_timeout(self.dialogue_duration)
             self.current_npc.has_talked = True
     
     def get_npc_response(self, npc, choice_index):
@@ -388,8 +431,17 @@ class TownState:
             
         return responses[choice_index % len(responses)]
     
+    def restart_dialogue_timeout(self, duration):
+        """Close the dialogue after duration unless it changes first"""
+        self.dialogue_timer = self.game_manager.sim_time
+        if self.dialogue_timeout is None:
+            self.dialogue_timeout = self.timers.schedule(duration, self.end_dialogue)
+        else:
+            self.timers.reschedule(self.dialogue_timeout, duration)
+    
     def end_dialogue(self):
         """End current dialogue and reset state"""
+        self.timers.cancel(self.dialogue_timeout)
         self.show_dialogue = False
         self.show_dialogue_choices = False
         self.dialogue_text = ""
@@ -414,107 +466,69 @@ class TownState:
         except Exception as e:
             self.dialogue_text = f"The {self.current_interaction.replace('_', ' ')} is currently closed."
             self.show_dialogue = True
-            self.dialogue_timer = pygame.time.get_ticks()
+            self.restart_dialogue_timeout(self.dialogue_duration)
             
     def check_interactions(self):
         """Check for nearby interactive objects and NPCs"""
         self.show_interaction_prompt = False
         self.current_interaction = None
         
-        # Reset NPC interaction states
-        for npc in self.npcs:
-            if not npc.is_being_talked_to:
-                npc.is_being_talked_to = False
+        # Check for the nearest NPC, letting the last one walk on once out of range
+        npc = self.npc_index.nearest(self.player.x, self.player.y, self.interaction_range)
+        if self.current_npc is not None and self.current_npc is not npc:
+            self.current_npc.is_being_talked_to = False
+        self.current_npc = npc
         
-        self.current_npc = None
+        if npc is not None:
+            self.show_interaction_prompt = True
+            npc.is_being_talked_to = True
+            return
         
-        # Check for nearby NPCs
-        for npc in self.npcs:
-            distance = math.sqrt(
-                (self.player.x - npc.x) ** 2 + 
-                (self.player.y - npc.y) ** 2
-            )
-            
-            if distance < self.interaction_range:
-                self.show_interaction_prompt = True
-                self.current_npc = npc
-                npc.is_being_talked_to = True
-                return
+        # Check for the nearest building with one read of the precomputed lookup
+        self.current_interaction = self.building_lookup.get(self.player.x, self.player.y)
+        if self.current_interaction is not None:
+            self.show_interaction_prompt = True
+                            
+    def save_previous_state(self):
+        """Snapshot positions before a tick for render interpolation"""
+        save_previous([self.player])
+        save_previous(self.npcs)
         
-        # Check for nearby buildings
-        player_map_x = int(self.player.x // TILE_SIZE)
-        player_map_y = int(self.player.y // TILE_SIZE)
+    def apply_interpolation(self, alpha):
+        """Draw everything alpha of the way between the last two ticks"""
+        self.interpolation.apply([self.player], alpha)
+        self.interpolation.apply(self.npcs, alpha)
+        
+    def restore_interpolation(self):
+        """Put back the simulated positions after drawing"""
+        self.interpolation.restore()
         
-        for dy in range(-1, 2):
-            for dx in range(-1, 2):
-                check_x = player_map_x + dx
-                check_y = player_map_y + dy
-                
-                if (0 <= check_x < self.town_map.width and 
-                    0 <= check_y < self.town_map.height):
-                    
-                    tile_type = self.town_map.get_tile(check_x, check_y)
-                    
-                    tile_center_x = check_x * TILE_SIZE + TILE_SIZE // 2
-                    tile_center_y = check_y * TILE_SIZE + TILE_SIZE // 2
-                    
-                    distance = math.sqrt(
-                        (self.player.x - tile_center_x) ** 2 + 
-                        (self.player.y - tile_center_y) ** 2
-                    )
-                    
-                    if distance < self.interaction_range:
-                        if tile_type == 3:
-                            self.show_interaction_prompt = True
-                            self.current_interaction = "weapon_shop"
-                        elif tile_type == 4:
-                            self.show_interaction_prompt = True
-                            self.current_interaction = "magic_shop"
-                        elif tile_type == 5:
-                            self.show_interaction_prompt = True
-                            self.current_interaction = "healer"
-                        elif tile_type == 6:
-                            self.show_interaction_prompt = True
-                            self.current_interaction = "arena"
-                            
     def update(self, dt):
-        current_time = pygame.time.get_ticks()
+        current_time = self.game_manager.sim_time
         
         # Player movement with collision
         keys = pygame.key.get_pressed()
         old_x, old_y = self.player.x, self.player.y
         
-        self.player.move(keys, dt, self.town_map.collision_map, 
-                        self.town_map.width, self.town_map.height)
-        
-        player_tile_x = int(self.player.x // TILE_SIZE)
-        player_tile_y = int(self.player.y // TILE_SIZE)
+        self.player.move(keys, dt, self.collision_grid)
         
         # Check bounds and walkability
-        if (player_tile_x < 0 or player_tile_x >= self.town_map.width or
-            player_tile_y < 0 or player_tile_y >= self.town_map.height or
-            not self.town_map.is_walkable(player_tile_x, player_tile_y)):
+        if self.collision_grid.is_blocked(self.player.x, self.player.y):
             self.player.x, self.player.y = old_x, old_y
         
         self.player.update(dt)
         
         # Update NPCs
         for npc in self.npcs:
-            npc.update(dt, current_time, self.town_map)
+            npc.update(dt, current_time, self.collision_grid, self.npc_index)
         
         self.check_interactions()
         
-        # Handle dialogue timeouts
-        if self.show_dialogue:
-            if current_time - self.dialogue_timer > self.dialogue_duration:
-                self.end_dialogue()
-        
-        if self.show_dialogue_choices:
-            if current_time - self.dialogue_timer > 15000:
-                self.end_dialogue()
+        # Run due dialogue timeouts
+        self.timers.advance()
         
     def render(self):
-        self.screen.fill(BLACK)
+        self.raycaster.backend.clear(BLACK)
         
         # Render 3D town view
         rays = self.raycaster.cast_rays(self.player, self.town_map.collision_map,
@@ -547,21 +561,8 @@ class TownState:
                 
             # Only render if in field of view
             if abs(angle_diff) < HALF_FOV:
-                # Check if NPC is blocked by walls
-                npc_blocked = False
-                steps = int(npc_distance / 10)
-                
-                for step in range(1, steps):
-                    check_x = self.player.x + (dx * step / steps)
-                    check_y = self.player.y + (dy * step / steps)
-                    check_tile_x = int(check_x // TILE_SIZE)
-                    check_tile_y = int(check_y // TILE_SIZE)
-                    
-                    if not self.town_map.is_walkable(check_tile_x, check_tile_y):
-                        npc_blocked = True
-                        break
-                
-                if not npc_blocked:
+                # Skip NPCs behind buildings with one lookup in the sight table
+                if self.line_of_sight.visible_points(self.player.x, self.player.y, npc.x, npc.y):
                     screen_x = (angle_diff / HALF_FOV) * (SCREEN_WIDTH // 2) + (SCREEN_WIDTH // 2)
                     
                     # Scale NPC based on distance
@@ -570,23 +571,18 @@ class TownState:
                     npc_height = npc_scale * 1.5
                     
                     npc_y = (SCREEN_HEIGHT - npc_height) // 2 + view_bob
+                    lod_level = LOD_FULL
                     
                     if npc.image:
-                        scaled_npc = pygame.transform.scale(npc.image, (int(npc_width), int(npc_height)))
+                        npc_rect = (screen_x - npc_width // 2, npc_y, int(npc_width), int(npc_height))
                         
                         # Apply distance-based darkness
+                        darkness = 0
                         if npc_distance > 100:
-                            dark_surface = pygame.Surface((int(npc_width), int(npc_height)))
-                            dark_surface.fill((0, 0, 0))
                             darkness = min(128, int((npc_distance - 100) * 2))
-                            dark_surface.set_alpha(darkness)
                             
-                            npc_rect = (screen_x - npc_width // 2, npc_y, npc_width, npc_height)
-                            self.screen.blit(scaled_npc, npc_rect)
-                            self.screen.blit(dark_surface, npc_rect)
-                        else:
-                            npc_rect = (screen_x - npc_width // 2, npc_y, npc_width, npc_height)
-                            self.screen.blit(scaled_npc, npc_rect)
+                        lod_level = self.raycaster.sprite_lod.draw(
+                            self.raycaster.backend, npc.image, npc_rect, npc_distance, darkness)
                     else:
                         # Fallback colored sprite
                         npc_rect = (
@@ -595,7 +591,7 @@ class TownState:
                             npc_width,
                             npc_height
                         )
-                        pygame.draw.rect(self.screen, npc.color, npc_rect)
+                        self.raycaster.backend.fill_rect(npc.color, npc_rect)
                         
                         # Add eyes if sprite is large enough
                         if npc_scale > 10:
@@ -604,12 +600,12 @@ class TownState:
                             right_eye_x = int(screen_x + npc_width // 4)
                             eye_y = int(npc_y + npc_height // 3)
                             
-                            pygame.draw.circle(self.screen, WHITE, (left_eye_x, eye_y), eye_size)
-                            pygame.draw.circle(self.screen, WHITE, (right_eye_x, eye_y), eye_size)
+                            self.raycaster.backend.draw_circle(WHITE, (left_eye_x, eye_y), eye_size)
+                            self.raycaster.backend.draw_circle(WHITE, (right_eye_x, eye_y), eye_size)
                     
                     # Show NPC name when close
-                    if npc_distance < 120 and npc_scale > 15:
-                        name_font = pygame.font.Font(None, max(12, int(npc_scale // 3)))
+                    if npc_distance < 120 and npc_scale > 15 and lod_level == LOD_FULL:
+                        name_font = pygame.font.Font(None, min(48, max(12, int(npc_scale // 3))))
                         name_text = name_font.render(npc.name, True, WHITE)
                         name_rect = name_text.get_rect(center=(screen_x, npc_y - 15))
                         
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+from ai_scheduler import AI_TIER_FAR, AI_TIER_MID, AI_TIER_NEAR, AIScheduler
+from constants import (AI_FAR_INTERVAL, AI_MAX_DT, AI_MID_INTERVAL, AI_MIN_SLICE,
+                       AI_NEAR_DISTANCE, TILE_SIZE)
+from enemy_store import EnemyStore
+
+DT = 0.01
+
+
+class Player:
+    """Player at the origin looking along +x"""
+    x = 0.0
+    y = 0.0
+    angle = 0.0
+
+
+class Row:
+    """Bare proxy for a store row"""
+
+
+class RecordingStore(EnemyStore):
+    """Enemy store that records the rows and time steps each update gets"""
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def update(self, player, dt, current_time, collision_grid, projectiles, flow_field=None,
+               rows=None, line_of_sight=None):
+        self.calls.append((rows.copy(), np.array(dt, dtype=float)))
+
+
+def make_store(positions):
+    store = RecordingStore()
+    for x, y in positions:
+        store.add(Row(), x=x, y=y, flags=1, handle=EnemyStore.new_handle())
+    return store
+
+
+def run_ticks(scheduler, store, ticks):
+    """Run the scheduler and get each row's list of (tick, dt) updates"""
+    updates = {row: [] for row in range(len(store))}
+    for tick in range(ticks):
+        store.calls.clear()
+        scheduler.update(store, Player, DT, tick * DT, None, [])
+        for rows, dts in store.calls:
+            for row, row_dt in zip(rows.tolist(), dts.tolist()):
+                updates[row].append((tick, row_dt))
+    return updates
+
+
+def test_classify_by_distance_and_view():
+    near = AI_NEAR_DISTANCE / 2
+    store = make_store([
+        (-near, 0),                  # close behind
+        (6 * TILE_SIZE, 0),          # in view
+        (-6 * TILE_SIZE, 0),         # behind, mid range
+        (-20 * TILE_SIZE, 0),        # behind, far away
+        (20 * TILE_SIZE, 0),         # in view but past the visible distance
+    ])
+    tier = AIScheduler().classify(store, Player)
+    assert tier.tolist() == [AI_TIER_NEAR, AI_TIER_NEAR, AI_TIER_MID, AI_TIER_FAR, AI_TIER_FAR]
+
+
+def test_near_rows_every_tick_distant_rows_every_interval():
+    store = make_store([(10, 0), (-6 * TILE_SIZE, 0), (-6 * TILE_SIZE, 5),
+                        (-20 * TILE_SIZE, 0), (-20 * TILE_SIZE, 5)])
+    updates = run_ticks(AIScheduler(), store, 12)
+
+    assert [row_dt for _, row_dt in updates[0]] == pytest.approx([DT] * 12)
+    for row, interval in ((1, AI_MID_INTERVAL), (2, AI_MID_INTERVAL),
+                          (3, AI_FAR_INTERVAL), (4, AI_FAR_INTERVAL)):
+        ticks = [tick for tick, _ in updates[row]]
+        assert np.diff(ticks).tolist() == [interval] * (len(ticks) - 1)
+        # Each update carries the time skipped since the last one
+        assert [row_dt for _, row_dt in updates[row][1:]] == pytest.approx(
+            [interval * DT] * (len(ticks) - 1))
+    assert store.view('ai_dt').max() < AI_FAR_INTERVAL * DT
+
+
+def test_skipped_time_is_capped():
+    store = make_store([(-20 * TILE_SIZE, 0)])
+    scheduler = AIScheduler()
+    store.calls.clear()
+    for tick in range(AI_FAR_INTERVAL):
+        scheduler.update(store, Player, 1.0, tick, None, [])
+    (rows, dts), = store.calls
+    assert dts.tolist() == [AI_MAX_DT]
+
+
+def test_slice_cap_from_budget_with_floor():
+    scheduler = AIScheduler(time_budget_ms=2.0)
+    scheduler.row_cost_ms = 0.1
+    tier = np.full(400, AI_TIER_FAR)
+
+    # Every 4th row is due, 100 rows; the budget covers 20 of them
+    near, distant = scheduler.select(tier, len(tier))
+    assert len(near) == 0
+    assert len(distant) == 20
+
+    # Near rows use up the budget, but a few distant rows still run
+    tier[:30] = AI_TIER_NEAR
+    near, distant = scheduler.select(tier, len(tier))
+    assert len(near) == 30
+    assert len(distant) == AI_MIN_SLICE
+    assert set(distant.tolist()).isdisjoint(near.tolist())
+
+
+def test_cursor_reaches_every_distant_row():
+    scheduler = AIScheduler(time_budget_ms=0.0)
+    tier = np.full(200, AI_TIER_MID)
+    seen = set()
+    for tick in range(200):
+        scheduler.tick = tick
+        near, distant = scheduler.select(tier, len(tier))
+        assert len(distant) <= AI_MIN_SLICE
+        seen.update(distant.tolist())
+    assert seen == set(range(200))
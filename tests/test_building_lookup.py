@@ -0,0 +1,89 @@
+import math
+import random
+from constants import TILE_SIZE
+from building_lookup import BuildingLookup
+from town_map import TownMap
+
+RANGE = 80
+
+
+def building_tiles(town_map):
+    return [(x, y, town_map.get_building_at(x, y))
+            for y in range(town_map.height) for x in range(town_map.width)
+            if town_map.get_building_at(x, y) is not None]
+
+
+def nearest_building(tiles, x, y, interaction_range=RANGE):
+    """Reference: the closest building tile centre in range, and the distances in range"""
+    best = None
+    best_distance = math.inf
+    in_range = []
+    for tile_x, tile_y, building in tiles:
+        distance = math.hypot(x - (tile_x + 0.5) * TILE_SIZE, y - (tile_y + 0.5) * TILE_SIZE)
+        if distance < interaction_range:
+            in_range.append((distance, building))
+            if distance < best_distance:
+                best, best_distance = building, distance
+    return best, in_range
+
+
+def old_check(town_map, x, y, interaction_range=RANGE):
+    """The 3x3 tile scan the town used before the lookup, last match wins"""
+    found = None
+    map_x = int(x // TILE_SIZE)
+    map_y = int(y // TILE_SIZE)
+    for dy in range(-1, 2):
+        for dx in range(-1, 2):
+            check_x, check_y = map_x + dx, map_y + dy
+            if 0 <= check_x < town_map.width and 0 <= check_y < town_map.height:
+                centre_x = check_x * TILE_SIZE + TILE_SIZE // 2
+                centre_y = check_y * TILE_SIZE + TILE_SIZE // 2
+                if math.hypot(x - centre_x, y - centre_y) < interaction_range:
+                    building = town_map.get_building_at(check_x, check_y)
+                    if building is not None:
+                        found = building
+    return found
+
+
+def test_every_cell_centre_holds_its_nearest_building():
+    town_map = TownMap()
+    lookup = BuildingLookup(town_map, RANGE)
+    tiles = building_tiles(town_map)
+    for row in range(lookup.rows):
+        for column in range(lookup.columns):
+            x = (column + 0.5) * lookup.cell_size
+            y = (row + 0.5) * lookup.cell_size
+            assert lookup.get(x, y) == nearest_building(tiles, x, y)[0]
+
+
+def test_matches_old_check_away_from_range_edges_and_overlaps():
+    town_map = TownMap()
+    lookup = BuildingLookup(town_map, RANGE)
+    tiles = building_tiles(town_map)
+    # A position is at most half a cell diagonal from its cell's centre
+    slack = lookup.cell_size * math.sqrt(0.5)
+    rng = random.Random(0)
+    compared = 0
+    for _ in range(5000):
+        x = rng.uniform(0, town_map.width * TILE_SIZE)
+        y = rng.uniform(0, town_map.height * TILE_SIZE)
+        _, in_range = nearest_building(tiles, x, y, RANGE + slack)
+        if len({building for _, building in in_range}) > 1:
+            continue
+        if any(abs(distance - RANGE) <= slack for distance, _ in in_range):
+            continue
+        assert lookup.get(x, y) == old_check(town_map, x, y)
+        compared += 1
+    assert compared > 4000
+
+
+def test_rebuild_with_new_range_and_outside_map():
+    town_map = TownMap()
+    lookup = BuildingLookup(town_map, RANGE)
+    assert lookup.get(-10, 100) is None
+    assert lookup.get(100, town_map.height * TILE_SIZE + 10) is None
+
+    lookup.rebuild(interaction_range=0)
+    size = lookup.cell_size
+    assert all(lookup.get((column + 0.5) * size, (row + 0.5) * size) is None
+               for column in range(lookup.columns) for row in range(lookup.rows))
@@ -0,0 +1,139 @@
+import math
+import random
+import numpy as np
+import pytest
+from collision_grid import (CollisionGrid, segment_circle_fraction,
+                            segment_circle_fraction_batch)
+
+TILE = 64
+STEPS = 4000
+
+
+def random_grid(seed, width=12, height=10, density=0.25):
+    """Build a grid with a random scatter of walls"""
+    rng = random.Random(seed)
+    tiles = [[1 if rng.random() < density else 0 for _ in range(width)] for _ in range(height)]
+    return CollisionGrid(tiles, width, height, TILE)
+
+
+def random_segments(seed, count, grid):
+    """Random segments that start and end on or just beyond the map"""
+    rng = random.Random(seed)
+    span_x = grid.width * TILE
+    span_y = grid.height * TILE
+    for _ in range(count):
+        yield (rng.uniform(-20, span_x + 20), rng.uniform(-20, span_y + 20),
+               rng.uniform(-20, span_x + 20), rng.uniform(-20, span_y + 20))
+
+
+def stepped_block_fraction(grid, x0, y0, x1, y1, steps=STEPS):
+    """Reference: first of many evenly spaced points that lands on a blocked tile"""
+    for step in range(steps + 1):
+        t = step / steps
+        if grid.is_blocked(x0 + (x1 - x0) * t, y0 + (y1 - y0) * t):
+            return t
+    return None
+
+
+def stepped_circle_fraction(x0, y0, x1, y1, center_x, center_y, radius, steps=STEPS):
+    """Reference: first of many evenly spaced points inside the circle"""
+    for step in range(steps + 1):
+        t = step / steps
+        if math.hypot(x0 + (x1 - x0) * t - center_x, y0 + (y1 - y0) * t - center_y) <= radius:
+            return t
+    return None
+
+
+def enters_wall_at(grid, x0, y0, x1, y1, t):
+    """Check that the segment is inside a blocked tile just after fraction t"""
+    t += 1e-9
+    return grid.is_blocked(x0 + (x1 - x0) * t, y0 + (y1 - y0) * t)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_segment_block_fraction_matches_stepped_walk(seed):
+    grid = random_grid(seed)
+    for x0, y0, x1, y1 in random_segments(seed, 150, grid):
+        exact = grid.segment_block_fraction(x0, y0, x1, y1)
+        stepped = stepped_block_fraction(grid, x0, y0, x1, y1)
+        if exact is None:
+            assert stepped is None
+            continue
+
+        # The walk finds no wall before the exact entry, and the entry is
+        # real. Corner slivers shorter than one step can slip between
+        # samples, otherwise the walk finds the same wall within a step.
+        assert enters_wall_at(grid, x0, y0, x1, y1, exact)
+        assert stepped is None or exact <= stepped + 1e-9
+        if stepped is not None and stepped - exact > 1 / STEPS + 1e-9:
+            sliver = [exact + k / (STEPS * 10) for k in range(1, 11)]
+            assert not all(enters_wall_at(grid, x0, y0, x1, y1, t) for t in sliver)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_segment_block_fraction_batch_matches_scalar(seed):
+    grid = random_grid(seed)
+    segments = np.array(list(random_segments(seed + 100, 300, grid)))
+    batch = grid.segment_block_fraction_batch(*segments.T)
+    for (x0, y0, x1, y1), fraction in zip(segments, batch):
+        expected = grid.segment_block_fraction(x0, y0, x1, y1)
+        if expected is None:
+            assert math.isinf(fraction)
+        else:
+            assert fraction == pytest.approx(expected)
+
+
+def test_segment_block_fraction_axis_aligned_and_short():
+    tiles = [
+        [0, 0, 0, 0],
+        [0, 0, 1, 0],
+        [0, 0, 0, 0],
+    ]
+    grid = CollisionGrid(tiles, 4, 3, TILE)
+
+    # Along x into the wall at x = 128, and straight down past it
+    assert grid.segment_block_fraction(32, 96, 224, 96) == pytest.approx(96 / 192)
+    assert grid.segment_block_fraction(96, 32, 96, 160) is None
+
+    # Starting inside a wall, and a step that stays inside one open tile
+    assert grid.segment_block_fraction(150, 100, 10, 10) == 0.0
+    assert grid.segment_block_fraction(10, 10, 20, 20) is None
+    assert not grid.is_blocked_segment(10, 10, 10, 10)
+
+    # Leaving the map counts as blocked
+    assert grid.segment_block_fraction(224, 32, 288, 32) == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_segment_circle_fraction_matches_stepped_walk(seed):
+    rng = random.Random(seed)
+    for _ in range(300):
+        x0, y0, x1, y1 = (rng.uniform(-100, 100) for _ in range(4))
+        center_x, center_y = rng.uniform(-60, 60), rng.uniform(-60, 60)
+        radius = rng.uniform(1, 40)
+
+        exact = segment_circle_fraction(x0, y0, x1, y1, center_x, center_y, radius)
+        stepped = stepped_circle_fraction(x0, y0, x1, y1, center_x, center_y, radius)
+        if stepped is None:
+            # A grazing touch can fall between samples
+            assert exact is None or exact > 0
+            continue
+        assert exact is not None
+        assert exact <= stepped + 1e-9
+        assert stepped - exact <= 1 / STEPS + 1e-9
+
+        batch = segment_circle_fraction_batch(
+            np.array([x0]), np.array([y0]), np.array([x1]), np.array([y1]),
+            center_x, center_y, radius)
+        assert batch[0] == pytest.approx(exact)
+
+
+def test_segment_circle_fraction_edge_cases():
+    # Starting inside, standing still outside, and passing by
+    assert segment_circle_fraction(0, 0, 10, 0, 1, 0, 5) == 0.0
+    assert segment_circle_fraction(20, 0, 20, 0, 0, 0, 5) is None
+    assert segment_circle_fraction(-10, 10, 10, 10, 0, 0, 5) is None
+
+    # Stopping short, and reaching exactly the edge
+    assert segment_circle_fraction(-20, 0, -10, 0, 0, 0, 5) is None
+    assert segment_circle_fraction(-15, 0, -5, 0, 0, 0, 5) == pytest.approx(1.0)
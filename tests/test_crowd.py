@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from crowd import neighbour_pairs, separation_push
+
+CELL = 64
+
+
+def brute_force_pairs(x, y, cell_size=CELL):
+    """Every ordered pair of distinct agents in the same or adjacent cells"""
+    cell_x = np.floor_divide(x, cell_size)
+    cell_y = np.floor_divide(y, cell_size)
+    return {
+        (i, j)
+        for i in range(len(x)) for j in range(len(x))
+        if i != j and abs(cell_x[i] - cell_x[j]) <= 1 and abs(cell_y[i] - cell_y[j]) <= 1
+    }
+
+
+def brute_force_push(x, y, radius):
+    """Reference separation push from every pair of agents"""
+    push_x = np.zeros(len(x))
+    push_y = np.zeros(len(x))
+    for i in range(len(x)):
+        for j in range(len(x)):
+            if i == j:
+                continue
+            dx = x[i] - x[j]
+            dy = y[i] - y[j]
+            distance = np.hypot(dx, dy)
+            reach = radius[i] + radius[j]
+            if distance >= reach:
+                continue
+            if distance == 0:
+                dx, distance = (-1.0 if i < j else 1.0), 1.0
+            weight = (1 - distance / reach) / distance
+            push_x[i] += dx * weight
+            push_y[i] += dy * weight
+    return push_x, push_y
+
+
+def random_crowd(seed, count, span):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-span / 2, span, count), rng.uniform(-span / 2, span, count)
+
+
+@pytest.mark.parametrize("seed, count, span", [(0, 50, 400), (1, 200, 300), (2, 120, 2000), (3, 2, 10)])
+def test_neighbour_pairs_match_brute_force(seed, count, span):
+    x, y = random_crowd(seed, count, span)
+    i, j = neighbour_pairs(x, y, CELL)
+    pairs = list(zip(i.tolist(), j.tolist()))
+    assert len(pairs) == len(set(pairs))
+    assert set(pairs) == brute_force_pairs(x, y)
+
+
+def test_neighbour_pairs_on_cell_edges_and_stacked():
+    x = np.array([0.0, 64.0, 128.0, 192.0, 0.0, 0.0])
+    y = np.array([0.0, 0.0, 0.0, 0.0, -0.5, 0.0])
+    i, j = neighbour_pairs(x, y, CELL)
+    assert set(zip(i.tolist(), j.tolist())) == brute_force_pairs(x, y)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_separation_push_matches_brute_force(seed):
+    x, y = random_crowd(seed, 150, 300)
+    # Stack some agents exactly on top of each other
+    x[:10] = y[:10] = 100.0
+    radius = np.random.default_rng(seed).uniform(10, 30, len(x))
+
+    push_x, push_y = separation_push(x, y, radius, CELL)
+    expected_x, expected_y = brute_force_push(x, y, radius)
+    np.testing.assert_allclose(push_x, expected_x, atol=1e-9)
+    np.testing.assert_allclose(push_y, expected_y, atol=1e-9)
+
+
+def test_separation_push_small_crowds():
+    assert [len(push) for push in separation_push(np.zeros(1), np.zeros(1), np.ones(1))] == [1, 1]
+    push_x, push_y = separation_push(np.array([0.0, 100.0]), np.array([0.0, 0.0]), np.array([10.0, 10.0]))
+    assert push_x.tolist() == [0.0, 0.0]
+    assert push_y.tolist() == [0.0, 0.0]
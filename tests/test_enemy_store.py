@@ -0,0 +1,138 @@
+import os
+import pytest
+import enemy
+from constants import EnemyType
+from enemy import Enemy
+from enemy_store import EnemyStore, FLAG_ALIVE
+
+
+@pytest.fixture(autouse=True)
+def src_dir(monkeypatch):
+    """Enemy sprites load from paths relative to src/"""
+    monkeypatch.chdir(os.path.dirname(enemy.__file__))
+
+
+def spawn(store, count):
+    """Append count enemies with distinct positions and health"""
+    enemies = []
+    types = [EnemyType.SKELETON, EnemyType.ORC, EnemyType.TROLL, EnemyType.DEMON]
+    for i in range(count):
+        spawned = Enemy(100 + i, 200 + i, types[i % len(types)])
+        spawned.health = 1000 + i
+        store.append(spawned)
+        enemies.append(spawned)
+    return enemies
+
+
+def assert_consistent(store):
+    """Every proxy in the store points at the row holding its own values"""
+    assert len(store.proxies) == store.count
+    assert len(store.row_of) == store.count
+    for row, proxy in enumerate(store.proxies):
+        assert proxy._store is store
+        assert proxy._row == row
+        assert store.row_of[proxy.handle] == row
+
+
+def test_new_enemy_is_detached():
+    spawned = Enemy(10, 20, EnemyType.ORC)
+    assert spawned._store is None
+    assert (spawned.x, spawned.y) == (10, 20)
+    assert spawned.alive
+
+    spawned.alive = False
+    spawned.x = 15
+    assert not spawned.alive
+    assert spawned.x == 15
+
+
+def test_append_moves_detached_row():
+    store = EnemyStore(capacity=2)
+    enemies = spawn(store, 5)
+
+    assert_consistent(store)
+    assert store.capacity >= 5
+    for i, spawned in enumerate(enemies):
+        assert (spawned.x, spawned.y, spawned.health) == (100 + i, 200 + i, 1000 + i)
+
+
+def test_swap_remove_keeps_proxies_consistent():
+    store = EnemyStore()
+    enemies = spawn(store, 6)
+    handles = {id(spawned): spawned.handle for spawned in enemies}
+
+    removed = [enemies[1], enemies[5], enemies[0]]
+    for spawned in removed:
+        store.remove(spawned)
+        assert_consistent(store)
+
+    # Remaining enemies still read their own values after being moved
+    remaining = [spawned for spawned in enemies if spawned not in removed]
+    assert sorted(store, key=id) == sorted(remaining, key=id)
+    for spawned in remaining:
+        i = enemies.index(spawned)
+        assert (spawned.x, spawned.y, spawned.health) == (100 + i, 200 + i, 1000 + i)
+        assert spawned.handle == handles[id(spawned)]
+
+    # Removed enemies keep their last values in a detached row
+    for spawned in removed:
+        i = enemies.index(spawned)
+        assert spawned._store is None
+        assert (spawned.x, spawned.health, spawned.handle) == (100 + i, 1000 + i, handles[id(spawned)])
+
+
+def test_writes_after_remove_do_not_touch_store():
+    store = EnemyStore()
+    first, second = spawn(store, 2)
+    store.remove(first)
+
+    first.x = -1
+    first.alive = False
+    assert second.x == 101
+    assert second.alive
+    assert store.view('x').tolist() == [101]
+
+
+def test_get_dead_and_rows_of():
+    store = EnemyStore()
+    enemies = spawn(store, 4)
+    enemies[2].take_damage(10 ** 6)
+
+    assert store.get_dead() == [enemies[2]]
+    assert (store.view('flags') & FLAG_ALIVE).tolist() == [1, 1, 0, 1]
+
+    store.remove(enemies[0])
+    rows, found = store.rows_of([enemies[3].handle, enemies[0].handle])
+    assert found.tolist() == [True, False]
+    assert store[rows[0]] is enemies[3]
+
+
+def test_clear_detaches_everything():
+    store = EnemyStore()
+    enemies = spawn(store, 3)
+    store.clear()
+
+    assert len(store) == 0
+    assert all(spawned._store is None for spawned in enemies)
+    assert [spawned.x for spawned in enemies] == [100, 101, 102]
+
+
+def test_rows_of_follows_swap_remove():
+    store = EnemyStore()
+    enemies = spawn(store, 5)
+    store.remove(enemies[1])
+    store.remove(enemies[0])
+    assert_consistent(store)
+
+    handles = [spawned.handle for spawned in enemies]
+    rows, found = store.rows_of(handles)
+    assert found.tolist() == [False, False, True, True, True]
+    for spawned, row in zip(enemies[2:], rows[2:]):
+        assert store[row] is spawned
+
+    store.append(enemies[0])
+    assert_consistent(store)
+    rows, found = store.rows_of([])
+    assert len(rows) == len(found) == 0
+    store.clear()
+    assert store.row_of == {}
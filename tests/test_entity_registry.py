@@ -0,0 +1,98 @@
+import random
+from entity_registry import EntityRegistry, HANDLE_SLOT_MASK
+
+
+class Thing:
+    def __init__(self, name):
+        self.name = name
+        self.handle = None
+
+
+def test_add_sets_handle_and_get_resolves_it():
+    registry = EntityRegistry()
+    things = [Thing(i) for i in range(3)]
+    handles = [registry.add(thing) for thing in things]
+
+    assert [thing.handle for thing in things] == handles
+    assert len(set(handles)) == 3
+    assert [registry.get(handle) for handle in handles] == things
+    assert list(registry) == things
+    assert registry.get(None) is None
+
+
+def test_removed_handle_goes_stale():
+    registry = EntityRegistry()
+    thing = Thing("a")
+    handle = registry.add(thing)
+
+    assert registry.remove(handle)
+    assert registry.get(handle) is None
+    assert not registry.remove(handle)
+    assert len(registry) == 0
+
+
+def test_stale_handle_does_not_reach_slot_reuser():
+    registry = EntityRegistry()
+    old_handle = registry.add(Thing("old"))
+    registry.remove(old_handle)
+
+    new = Thing("new")
+    new_handle = registry.add(new)
+    assert new_handle & HANDLE_SLOT_MASK == old_handle & HANDLE_SLOT_MASK
+    assert new_handle != old_handle
+    assert registry.get(old_handle) is None
+    assert not registry.remove(old_handle)
+    assert registry.get(new_handle) is new
+
+
+def test_swap_remove_keeps_other_handles_valid():
+    registry = EntityRegistry()
+    things = [Thing(i) for i in range(5)]
+    for thing in things:
+        registry.add(thing)
+
+    registry.remove(things[1].handle)
+    registry.remove(things[4].handle)
+    remaining = [things[0], things[2], things[3]]
+    assert sorted(registry, key=lambda thing: thing.name) == remaining
+    for thing in remaining:
+        assert registry.get(thing.handle) is thing
+
+
+def test_handles_never_found_in_registry_are_rejected():
+    registry = EntityRegistry()
+    registry.add(Thing("a"))
+    assert registry.get(12345) is None
+    assert not registry.remove(12345)
+
+
+def test_clear_invalidates_every_handle():
+    registry = EntityRegistry()
+    handles = [registry.add(Thing(i)) for i in range(4)]
+    registry.clear()
+
+    assert len(registry) == 0
+    assert all(registry.get(handle) is None for handle in handles)
+    fresh = Thing("fresh")
+    assert registry.get(registry.add(fresh)) is fresh
+    assert all(registry.get(handle) is None for handle in handles)
+
+
+def test_random_churn_matches_dict_model():
+    rng = random.Random(0)
+    registry = EntityRegistry()
+    live = {}
+    dead = []
+    for step in range(3000):
+        if live and rng.random() < 0.45:
+            handle = rng.choice(list(live))
+            assert registry.remove(handle)
+            dead.append(live.pop(handle))
+        else:
+            thing = Thing(step)
+            live[registry.add(thing)] = thing
+
+        assert len(registry) == len(live)
+    assert all(registry.get(handle) is thing for handle, thing in live.items())
+    assert sorted(id(thing) for thing in registry) == sorted(id(thing) for thing in live.values())
+    assert all(registry.get(thing.handle) is None for thing in dead)
@@ -0,0 +1,108 @@
+import math
+import random
+import numpy as np
+import pytest
+from arena_map import ArenaMap
+from collision_grid import CollisionGrid
+from line_of_sight import LineOfSightTable
+
+TILE = 64
+
+
+def random_grid(seed, width=12, height=10, density=0.2):
+    rng = random.Random(seed)
+    tiles = [[1 if rng.random() < density else 0 for _ in range(width)] for _ in range(height)]
+    return CollisionGrid(tiles, width, height, TILE)
+
+
+def dda_visible(grid, tile_a, tile_b):
+    """Reference: walk the grid between the two tile centres"""
+    x0, y0 = (tile_a[0] + 0.5) * TILE, (tile_a[1] + 0.5) * TILE
+    x1, y1 = (tile_b[0] + 0.5) * TILE, (tile_b[1] + 0.5) * TILE
+    return grid.segment_block_fraction(x0, y0, x1, y1) is None
+
+
+def crosses_corner(tile_a, tile_b):
+    """Check whether the centre to centre line passes exactly through a tile corner
+
+    From a tile centre, stepping (dx, dy) hits a corner when both are odd
+    once their common factor is divided out.
+    """
+    dx = tile_b[0] - tile_a[0]
+    dy = tile_b[1] - tile_a[1]
+    if dx == 0 or dy == 0:
+        return False
+    common = math.gcd(dx, dy)
+    return (dx // common) % 2 != 0 and (dy // common) % 2 != 0
+
+
+def open_tiles(grid):
+    return [(x, y) for y in range(grid.height) for x in range(grid.width)
+            if not grid.is_blocked_tile(x, y)]
+
+
+def check_against_dda(grid):
+    table = LineOfSightTable.from_grid(grid)
+    tiles = open_tiles(grid)
+    for index, tile_a in enumerate(tiles):
+        for tile_b in tiles[index:]:
+            seen = table.visible(tile_a, tile_b)
+            assert seen == table.visible(tile_b, tile_a)
+            if crosses_corner(tile_a, tile_b):
+                # The table also needs both tiles beside the corner open,
+                # the DDA walk only enters one of them
+                assert not seen or dda_visible(grid, tile_a, tile_b)
+            else:
+                assert seen == dda_visible(grid, tile_a, tile_b), (tile_a, tile_b)
+    return table
+
+
+def test_arena_table_matches_dda():
+    check_against_dda(CollisionGrid.from_map(ArenaMap()))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_random_grid_table_matches_dda(seed):
+    check_against_dda(random_grid(seed))
+
+
+def test_corner_between_two_walls_blocks_sight():
+    tiles = [
+        [0, 1, 0],
+        [1, 0, 0],
+        [0, 0, 0],
+    ]
+    table = LineOfSightTable.from_grid(CollisionGrid(tiles, 3, 3, TILE))
+    assert not table.visible((0, 0), (1, 1))
+    assert not table.visible((2, 0), (1, 1))
+    assert table.visible((1, 1), (2, 2))
+    assert table.visible((2, 1), (1, 2))
+
+
+def test_blocked_and_outside_tiles_see_nothing():
+    grid = random_grid(5)
+    table = LineOfSightTable.from_grid(grid)
+    wall = next((x, y) for y in range(grid.height) for x in range(grid.width)
+                if grid.is_blocked_tile(x, y))
+    floor = open_tiles(grid)[0]
+
+    assert table.visible(floor, floor)
+    assert not table.visible(wall, wall)
+    assert not table.visible(wall, floor)
+    assert not table.visible((-1, 0), floor)
+    assert not table.visible(floor, (grid.width, 0))
+
+
+def test_point_queries_use_the_tiles_under_them():
+    grid = random_grid(7)
+    table = LineOfSightTable.from_grid(grid)
+    rng = np.random.default_rng(7)
+    xs = rng.uniform(-50, grid.width * TILE + 50, 300)
+    ys = rng.uniform(-50, grid.height * TILE + 50, 300)
+    x, y = (open_tiles(grid)[3][0] + 0.3) * TILE, (open_tiles(grid)[3][1] + 0.6) * TILE
+
+    batch = table.visible_from_batch(xs, ys, x, y)
+    for px, py, seen in zip(xs, ys, batch):
+        assert seen == table.visible_points(px, py, x, y)
+        assert seen == table.visible((int(px // TILE), int(py // TILE)),
+                                     (int(x // TILE), int(y // TILE)))
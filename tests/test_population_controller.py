@@ -0,0 +1,91 @@
+from constants import MAX_SUMMON_STRENGTH, EnemyType
+from enemy_store import ENEMY_TYPE_IDS, EnemyStore
+from population_controller import PopulationController
+
+SKELETON = EnemyType.SKELETON
+ORC = EnemyType.ORC
+
+
+class Row:
+    """Bare proxy for a store row"""
+
+
+def add(store, enemy_type, count):
+    rows = [Row() for _ in range(count)]
+    for row in rows:
+        store.add(row, type_id=ENEMY_TYPE_IDS[enemy_type], handle=EnemyStore.new_handle())
+    return rows
+
+
+def assert_accounted(population, requested):
+    """Every requested summon got a minion, was merged, dropped or is deferred"""
+    assert (population.summoned + population.merged + population.dropped
+            + int(population.deferred.sum())) == requested
+
+
+def test_summon_that_fits_is_admitted_whole():
+    population = PopulationController(max_population=10, type_caps={SKELETON: 6})
+    population.census(EnemyStore(), [], 0)
+    assert population.admit(SKELETON, 4) == (4, 1)
+    assert population.live_total == 4
+    assert population.throttled == 0
+    assert_accounted(population, 4)
+
+
+def test_over_cap_summons_are_merged_then_deferred():
+    population = PopulationController(max_population=10, type_caps={SKELETON: 6})
+    store = EnemyStore()
+    orcs = add(store, ORC, 8)
+    population.census(store, [], 0)
+
+    # Two places left, so six summons become two minions of strength three
+    assert population.admit(SKELETON, 6) == (2, 3)
+    assert population.merged == 4
+    assert population.live_total == 10
+
+    # No room: the type's cap is kept for later and the rest dropped
+    assert population.admit(SKELETON, 20) == (0, 1)
+    assert population.deferred[ENEMY_TYPE_IDS[SKELETON]] == 6
+    assert population.dropped == 14
+    assert population.throttled == 4 + 14 + 6
+    assert_accounted(population, 26)
+
+    # The admitted minions spawn and the orcs die, freeing room
+    add(store, SKELETON, 2)
+    population.spawned(SKELETON)
+    population.spawned(SKELETON)
+    for orc in orcs:
+        store.remove(orc)
+    population.census(store, [], 0)
+    assert population.live_total == 2
+
+    # Deferred summons come back with the next one, up to the type cap
+    assert population.admit(SKELETON, 1) == (4, 2)
+    assert population.deferred.sum() == 0
+    assert population.merged == 4 + 3
+    assert population.live_by_type[ENEMY_TYPE_IDS[SKELETON]] == 6
+    assert_accounted(population, 27)
+
+
+def test_merged_strength_is_capped():
+    population = PopulationController(max_population=2, type_caps={SKELETON: 50})
+    population.census(EnemyStore(), [], 0)
+    units, strength = population.admit(SKELETON, 20)
+    assert (units, strength) == (2, MAX_SUMMON_STRENGTH)
+    assert population.merged == 2 * MAX_SUMMON_STRENGTH - 2
+    assert population.deferred[ENEMY_TYPE_IDS[SKELETON]] == 20 - 2 * MAX_SUMMON_STRENGTH
+    assert_accounted(population, 20)
+
+
+def test_census_counts_queued_spawns_and_reserved_minions():
+    population = PopulationController(max_population=10, type_caps={SKELETON: 6})
+    store = EnemyStore()
+    add(store, SKELETON, 1)
+    population.admit(SKELETON, 2)
+    population.census(store, ["boss"], 3)
+    assert population.live_total == 1 + 1 + 3
+    assert population.live_by_type[ENEMY_TYPE_IDS[SKELETON]] == 1 + 2
+
+    population.release(SKELETON, 2)
+    population.census(store, [], 0)
+    assert population.live_by_type[ENEMY_TYPE_IDS[SKELETON]] == 1
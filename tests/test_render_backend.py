@@ -0,0 +1,70 @@
+import pygame
+import pytest
+from constants import BLACK, RED, WHITE
+from render_backend import SDLBackend, SurfaceBackend
+
+
+@pytest.fixture(scope="module")
+def sdl_backend():
+    pygame.init()
+    backend = SDLBackend.create((160, 120), "test", software=True)
+    yield backend
+    backend.window.destroy()
+
+
+def make_image(size=(16, 16), color=RED):
+    image = pygame.Surface(size)
+    image.fill(color)
+    return image
+
+
+def test_sdl_backend_draws_headless(sdl_backend):
+    image = make_image()
+    sdl_backend.begin_frame()
+    sdl_backend.draw_wall_strip(image, (10, 10, 2, 60), 128)
+    sdl_backend.draw_sprite(image, (40, 20, 48, 48), darkness=64)
+    sdl_backend.draw_circle(WHITE, (80, 60), 6, alpha=128)
+    sdl_backend.draw_rect(RED, (5, 5, 30, 20), 3)
+    sdl_backend.blit(image, (100, 80))
+    sdl_backend.present()
+
+
+def test_sdl_backend_uploads_each_surface_once(sdl_backend):
+    image = make_image()
+    other = make_image(color=WHITE)
+    before = len(sdl_backend.textures)
+
+    texture = sdl_backend.get_texture(image)
+    assert sdl_backend.get_texture(image) is texture
+    sdl_backend.draw_sprite(image, (0, 0, 32, 32))
+    sdl_backend.blit(image, (0, 0))
+    assert len(sdl_backend.textures) == before + 1
+
+    assert sdl_backend.get_texture(other) is not texture
+    assert len(sdl_backend.textures) == before + 2
+
+
+def test_sdl_backend_reuses_circle_textures(sdl_backend):
+    sdl_backend.draw_circle(RED, (20, 20), 5)
+    count = len(sdl_backend.textures)
+    sdl_backend.draw_circle(WHITE, (50, 50), 5, alpha=40)
+    assert len(sdl_backend.textures) == count
+    assert 5 in sdl_backend.circles
+
+
+def test_surface_backend_draws_into_screen():
+    screen = pygame.Surface((160, 120))
+    backend = SurfaceBackend(screen)
+    backend.clear(BLACK)
+    backend.draw_wall_strip(make_image(color=WHITE), (10, 0, 2, 120), 128)
+    backend.draw_sprite(make_image(), (40, 20, 48, 48))
+    backend.draw_circle(WHITE, (120, 100), 6)
+    backend.draw_rect(WHITE, (130, 5, 20, 20), 2)
+    backend.blit(make_image(), (0, 100))
+
+    assert screen.get_at((10, 60))[:3] == (128, 128, 128)
+    assert screen.get_at((60, 40))[:3] == RED
+    assert screen.get_at((120, 100))[:3] == WHITE
+    assert screen.get_at((130, 5))[:3] == WHITE
+    assert screen.get_at((140, 15))[:3] == BLACK
+    assert screen.get_at((5, 105))[:3] == RED
@@ -0,0 +1,119 @@
+import random
+import numpy as np
+import pygame
+import pytest
+from render_backend import scale_clipped
+
+CLIP = pygame.Rect(0, 0, 200, 150)
+BACKGROUND = (1, 2, 3)
+
+
+def noise_image(width, height, seed):
+    """An image with a different colour in every texel"""
+    rng = np.random.default_rng(seed)
+    image = pygame.Surface((width, height))
+    pygame.surfarray.blit_array(image, rng.integers(4, 256, (width, height, 3)))
+    return image
+
+
+def reference(image, rect, clip=CLIP):
+    """Scale the whole image and blit it clipped"""
+    screen = pygame.Surface(clip.size)
+    screen.fill(BACKGROUND)
+    screen.blit(pygame.transform.scale(image, rect.size), rect.move(-clip.x, -clip.y))
+    return pygame.surfarray.array3d(screen)
+
+
+def clipped(image, rect, clip=CLIP):
+    """Draw with scale_clipped, checking the result size"""
+    screen = pygame.Surface(clip.size)
+    screen.fill(BACKGROUND)
+    scaled, pos = scale_clipped(image, rect, clip)
+    assert scaled is not None
+    assert scaled.get_width() <= clip.width and scaled.get_height() <= clip.height
+    screen.blit(scaled, (pos[0] - clip.x, pos[1] - clip.y))
+    return pygame.surfarray.array3d(screen)
+
+
+def assert_matches(image, rect, clip=CLIP):
+    """Every pixel matches, or matches a neighbour of the same pixel in the reference
+
+    Scaling a block of texels rounds their edges independently of a full
+    scale, so an edge between two texels can land one pixel over.
+    """
+    expected = reference(image, rect, clip)
+    actual = clipped(image, rect, clip)
+    wrong = np.argwhere((expected != actual).any(axis=2))
+    width, height = clip.size
+    for x, y in wrong:
+        neighbours = [expected[nx, ny] for nx in (x - 1, x, x + 1) for ny in (y - 1, y, y + 1)
+                      if 0 <= nx < width and 0 <= ny < height]
+        assert any((colour == actual[x, y]).all() for colour in neighbours), (rect, x, y)
+    assert len(wrong) <= 0.2 * width * height
+
+
+@pytest.mark.parametrize("rect", [
+    pygame.Rect(-60, 20, 120, 90),     # off the left edge
+    pygame.Rect(150, 30, 120, 90),     # off the right edge
+    pygame.Rect(40, -50, 120, 90),     # off the top edge
+    pygame.Rect(40, 100, 120, 90),     # off the bottom edge
+    pygame.Rect(-300, -200, 900, 700), # larger than the clip area
+    pygame.Rect(-7, -3, 13, 9),        # small, in a corner
+])
+@pytest.mark.parametrize("size", [(32, 32), (8, 6), (3, 5)])
+def test_matches_full_scale_when_partly_visible(rect, size):
+    assert_matches(noise_image(*size, seed=sum(size)), rect)
+
+
+def test_matches_full_scale_for_huge_texels():
+    # Each texel is larger than the clip area on both axes
+    image = noise_image(3, 5, seed=1)
+    for rect in (pygame.Rect(-241, -595, 658, 919), pygame.Rect(-500, -1000, 900, 1300)):
+        assert_matches(image, rect)
+
+
+def test_random_rects_match_full_scale():
+    rng = random.Random(0)
+    for seed in range(150):
+        width, height = rng.choice([(4, 4), (8, 6), (32, 32), (3, 5)])
+        size = rng.randint(20, 3000)
+        rect = pygame.Rect(rng.randint(-size, CLIP.width), rng.randint(-size, CLIP.height),
+                           size, int(size * rng.uniform(0.5, 1.5)))
+        if rect.clip(CLIP).width and rect.clip(CLIP).height:
+            assert_matches(noise_image(width, height, seed), rect)
+
+
+def test_offset_clip_area():
+    clip = pygame.Rect(50, 40, 120, 100)
+    assert_matches(noise_image(8, 6, seed=3), pygame.Rect(0, 60, 300, 200), clip)
+
+
+@pytest.mark.parametrize("rect", [
+    pygame.Rect(-200, 10, 100, 100),
+    pygame.Rect(200, 10, 100, 100),
+    pygame.Rect(10, -100, 50, 100),
+    pygame.Rect(10, 150, 50, 100),
+])
+def test_fully_off_screen_is_none(rect):
+    assert scale_clipped(noise_image(4, 4, seed=0), rect, CLIP) == (None, None)
+
+
+def test_fully_visible_scales_whole_image():
+    image = noise_image(4, 4, seed=0)
+    scaled, pos = scale_clipped(image, pygame.Rect(10, 20, 40, 30), CLIP)
+    assert scaled.get_size() == (40, 30)
+    assert pos == (10, 20)
+
+
+def test_huge_texels_keep_per_pixel_alpha():
+    image = pygame.Surface((2, 2), pygame.SRCALPHA)
+    image.fill((255, 0, 0, 255))
+    image.set_at((1, 1), (0, 0, 255, 0))
+    # Texels are 250 pixels, the edge between them lands at (100, 100)
+    scaled, pos = scale_clipped(image, pygame.Rect(-150, -150, 500, 500), CLIP)
+    assert pos == (0, 0)
+    assert scaled.get_size() == CLIP.size
+    assert scaled.get_flags() & pygame.SRCALPHA
+    assert scaled.get_at((99, 99)) == (255, 0, 0, 255)
+    assert scaled.get_at((100, 100)) == (0, 0, 255, 0)
+    assert scaled.get_at((100, 99)) == (255, 0, 0, 255)
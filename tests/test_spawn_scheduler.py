@@ -0,0 +1,78 @@
+import time
+from spawn_scheduler import SpawnScheduler
+
+
+def adder(spawned, name, count):
+    """Spawn generator that records one name per step"""
+    for i in range(count):
+        spawned.append((name, i))
+        yield
+
+
+def make_scheduler(**kwargs):
+    kwargs.setdefault('max_per_tick', 3)
+    kwargs.setdefault('time_budget_ms', 1000)
+    kwargs.setdefault('stagger_ms', 0)
+    return SpawnScheduler(**kwargs)
+
+
+def test_budget_per_tick_and_pending_counts_down():
+    scheduler = make_scheduler()
+    spawned = []
+    scheduler.schedule(adder(spawned, "a", 5), 5)
+    scheduler.schedule(adder(spawned, "b", 3), 3)
+    assert scheduler.pending == 8
+
+    ran = []
+    now = 0
+    while scheduler.pending:
+        count = scheduler.update(now)
+        assert count <= 3
+        assert scheduler.pending == 8 - len(spawned)
+        ran.append(count)
+        now += 16
+    assert ran == [3, 3, 2]
+    assert spawned == [("a", i) for i in range(5)] + [("b", i) for i in range(3)]
+    assert scheduler.update(now) == 0
+
+
+def test_batches_are_staggered():
+    scheduler = make_scheduler(stagger_ms=100)
+    spawned = []
+    scheduler.schedule(adder(spawned, "a", 9), 9)
+
+    assert scheduler.update(0) == 3
+    assert scheduler.update(50) == 0
+    assert scheduler.update(100) == 3
+    assert scheduler.pending == 3
+
+
+def test_generator_ending_early_drops_its_count():
+    scheduler = make_scheduler(max_per_tick=10)
+    spawned = []
+    scheduler.schedule(adder(spawned, "short", 2), 5)
+    scheduler.schedule(adder(spawned, "next", 1), 1)
+
+    assert scheduler.update(0) == 3
+    assert scheduler.pending == 0
+    assert not scheduler.queue
+
+
+def test_time_budget_stops_a_slow_tick():
+    def slow():
+        while True:
+            time.sleep(0.002)
+            yield
+
+    scheduler = make_scheduler(max_per_tick=100, time_budget_ms=1)
+    scheduler.schedule(slow(), 50)
+    assert scheduler.update(0) == 1
+    assert scheduler.pending == 49
+
+
+def test_clear_drops_pending_spawns():
+    scheduler = make_scheduler()
+    scheduler.schedule(adder([], "a", 5), 5)
+    scheduler.clear()
+    assert scheduler.pending == 0
+    assert scheduler.update(0) == 0
@@ -0,0 +1,40 @@
+import math
+import random
+import numpy as np
+from arena_map import ArenaMap
+from collision_grid import CollisionGrid
+from spawn_table import SpawnTable
+
+
+def arena_table():
+    """Build the table the arena uses"""
+    grid = CollisionGrid.from_map(ArenaMap())
+    size = grid.width * grid.tile_size
+    return grid, SpawnTable.from_map(grid, size / 2, size / 2, 300)
+
+
+def test_points_near_covers_every_point_in_range():
+    grid, table = arena_table()
+    rng = random.Random(0)
+    span = grid.width * grid.tile_size
+    for _ in range(500):
+        x, y = rng.uniform(-100, span + 100), rng.uniform(-100, span + 100)
+        near = set(table.points_near(x, y, 120).tolist())
+        distance = np.hypot(table.points_x - x, table.points_y - y)
+        assert set(np.flatnonzero(distance <= 120).tolist()) <= near
+
+
+def test_sample_near_stays_in_annulus_on_open_points():
+    grid, table = arena_table()
+    random.seed(1)
+    for _ in range(200):
+        x, y = table.sample_near(640, 640, 60, 120)
+        assert 60 <= math.hypot(x - 640, y - 640) <= 120
+        assert not grid.is_blocked(x, y)
+
+
+def test_sample_near_falls_back_to_nearest_point():
+    _, table = arena_table()
+    x, y = table.sample_near(-500, -500, 60, 120)
+    nearest = np.argmin(np.hypot(table.points_x + 500, table.points_y + 500))
+    assert (x, y) == (table.points_x[nearest], table.points_y[nearest])
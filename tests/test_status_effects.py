@@ -0,0 +1,102 @@
+import pytest
+from status_effects import (EFFECT_BURN, EFFECT_REGEN, EFFECT_SHIELD, EFFECT_SLOW,
+                            EFFECT_STUN, StatusEffects)
+
+
+def test_refresh_keeps_stronger_and_longer():
+    effects = StatusEffects()
+    effects.apply(7, EFFECT_SLOW, 0.5, 2.0, current_time=0.0)
+    effects.apply(7, EFFECT_SLOW, 0.2, 5.0, current_time=1.0)
+    row = effects.row_of[7]
+    assert effects.strength[row, EFFECT_SLOW] == 0.5
+    assert effects.until[row, EFFECT_SLOW] == 6.0
+
+    effects.apply(7, EFFECT_SLOW, 0.8, 1.0, current_time=2.0)
+    assert effects.strength[row, EFFECT_SLOW] == 0.8
+    assert effects.until[row, EFFECT_SLOW] == 6.0
+
+
+def test_apply_after_expiry_replaces_strength():
+    effects = StatusEffects()
+    effects.apply(7, EFFECT_BURN, 10.0, 1.0, current_time=0.0)
+    effects.apply(7, EFFECT_BURN, 3.0, 1.0, current_time=1.0)
+    row = effects.row_of[7]
+    assert effects.strength[row, EFFECT_BURN] == 3.0
+    assert effects.until[row, EFFECT_BURN] == 2.0
+
+
+def test_effect_expires_at_until():
+    effects = StatusEffects()
+    effects.apply(7, EFFECT_SLOW, 0.5, 2.0, current_time=0.0)
+    effects.apply(7, EFFECT_BURN, 4.0, 3.0, current_time=0.0)
+
+    handles, damage, heal, speed_scale = effects.tick(0.1, current_time=1.9)
+    assert speed_scale.tolist() == [0.5]
+    handles, damage, heal, speed_scale = effects.tick(0.1, current_time=2.0)
+    assert speed_scale.tolist() == [1.0]
+    assert damage.tolist() == pytest.approx([0.4])
+    assert effects.active_counts[EFFECT_SLOW] == 0
+    assert effects.active_counts[EFFECT_BURN] == 1
+
+
+def test_burn_and_regen_totals_over_ticks():
+    effects = StatusEffects()
+    effects.apply(1, EFFECT_BURN, 5.0, 2.0, current_time=0.0)
+    effects.apply(2, EFFECT_REGEN, 3.0, 2.0, current_time=0.0)
+    effects.apply(2, EFFECT_BURN, 1.0, 1.0, current_time=0.0)
+
+    burned = {1: 0.0, 2: 0.0}
+    healed = {1: 0.0, 2: 0.0}
+    for step in range(40):
+        handles, damage, heal, speed_scale = effects.tick(0.05, current_time=step * 0.05)
+        for handle, burn, regen in zip(handles.tolist(), damage, heal):
+            burned[handle] += burn
+            healed[handle] += regen
+    assert burned == pytest.approx({1: 10.0, 2: 1.0})
+    assert healed == pytest.approx({1: 0.0, 2: 6.0})
+
+
+def test_stun_overrides_slow():
+    effects = StatusEffects()
+    effects.apply(7, EFFECT_SLOW, 0.3, 5.0, current_time=0.0)
+    effects.apply(7, EFFECT_STUN, 1.0, 1.0, current_time=0.0)
+    assert effects.tick(0.1, current_time=0.5)[3].tolist() == [0.0]
+    assert effects.tick(0.1, current_time=1.0)[3].tolist() == pytest.approx([0.7])
+
+
+def test_shield_absorbs_until_used_up():
+    effects = StatusEffects()
+    assert effects.absorb(7, 10.0, current_time=0.0) == 10.0
+    effects.apply(7, EFFECT_SHIELD, 15.0, 5.0, current_time=0.0)
+    assert effects.absorb(7, 10.0, current_time=1.0) == 0.0
+    assert effects.absorb(7, 10.0, current_time=1.0) == 5.0
+    assert effects.absorb(7, 10.0, current_time=6.0) == 10.0
+
+
+def test_handles_with_no_effects_left_are_removed():
+    effects = StatusEffects(capacity=1)
+    for handle in (1, 2, 3):
+        effects.apply(handle, EFFECT_BURN, 1.0, handle, current_time=0.0)
+    assert len(effects) == 3
+
+    handles, _, _, _ = effects.tick(0.1, current_time=1.0)
+    assert handles.tolist() == [1, 2, 3]
+    assert len(effects) == 2
+    assert 1 not in effects.row_of
+
+    effects.tick(0.1, current_time=3.0)
+    assert len(effects) == 0
+    assert effects.row_of == {}
+
+
+def test_remove_swaps_last_row_into_hole():
+    effects = StatusEffects()
+    for handle in (1, 2, 3):
+        effects.apply(handle, EFFECT_SLOW, handle / 10, 5.0, current_time=0.0)
+    effects.remove(1)
+    effects.remove(99)
+
+    assert len(effects) == 2
+    for handle, row in effects.row_of.items():
+        assert effects.handles[row] == handle
+        assert effects.strength[row, EFFECT_SLOW] == handle / 10
@@ -0,0 +1,127 @@
+from timer_queue import TimerQueue
+
+
+class Clock:
+    """Game clock the test moves by hand"""
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def make_queue():
+    clock = Clock()
+    fired = []
+    return clock, TimerQueue(clock), fired
+
+
+def test_timers_fire_once_in_due_order():
+    clock, timers, fired = make_queue()
+    timers.schedule(300, fired.append, "c")
+    timers.schedule(100, fired.append, "a")
+    timers.schedule(200, fired.append, "b")
+
+    clock.now = 99
+    assert timers.advance() == 0
+    clock.now = 200
+    assert timers.advance() == 2
+    clock.now = 1000
+    assert timers.advance() == 1
+    assert timers.advance() == 0
+    assert fired == ["a", "b", "c"]
+
+
+def test_same_due_time_keeps_schedule_order():
+    clock, timers, fired = make_queue()
+    for name in "xyz":
+        timers.schedule(50, fired.append, name)
+    clock.now = 50
+    timers.advance()
+    assert fired == ["x", "y", "z"]
+
+
+def test_cancel_stops_timer():
+    clock, timers, fired = make_queue()
+    timer = timers.schedule(100, fired.append, "cancelled")
+    timers.schedule(100, fired.append, "kept")
+    timers.cancel(timer)
+    timers.cancel(None)
+
+    clock.now = 500
+    assert timers.advance() == 1
+    assert fired == ["kept"]
+    assert not timer.active
+
+
+def test_reschedule_moves_timer_and_skips_old_entry():
+    clock, timers, fired = make_queue()
+    timer = timers.schedule(100, fired.append, "moved")
+
+    clock.now = 50
+    timers.reschedule(timer, 200)
+    clock.now = 100
+    assert timers.advance() == 0
+    clock.now = 250
+    assert timers.advance() == 1
+    assert fired == ["moved"]
+
+    # Only the newest heap entry ever runs
+    clock.now = 10000
+    assert timers.advance() == 0
+    assert fired == ["moved"]
+
+
+def test_reschedule_earlier_and_after_firing():
+    clock, timers, fired = make_queue()
+    timer = timers.schedule(500, fired.append, "t")
+    timers.reschedule(timer, 100)
+    clock.now = 100
+    assert timers.advance() == 1
+
+    # A timer that already ran is revived by rescheduling it
+    timers.reschedule(timer, 100)
+    clock.now = 200
+    assert timers.advance() == 1
+    clock.now = 600
+    assert timers.advance() == 0
+    assert fired == ["t", "t"]
+
+
+def test_cancel_after_reschedule_and_reschedule_after_cancel():
+    clock, timers, fired = make_queue()
+    first = timers.schedule(100, fired.append, "first")
+    timers.reschedule(first, 300)
+    timers.cancel(first)
+
+    second = timers.schedule(100, fired.append, "second")
+    timers.cancel(second)
+    timers.reschedule(second, 200)
+
+    clock.now = 1000
+    assert timers.advance() == 1
+    assert fired == ["second"]
+
+
+def test_timer_scheduled_by_callback_waits_for_its_time():
+    clock, timers, fired = make_queue()
+
+    def chain():
+        fired.append("first")
+        timers.schedule(0, fired.append, "chained")
+        timers.schedule(100, fired.append, "later")
+
+    timers.schedule(10, chain)
+    clock.now = 10
+    assert timers.advance() == 2
+    assert fired == ["first", "chained"]
+
+
+def test_clear_drops_everything():
+    clock, timers, fired = make_queue()
+    timer = timers.schedule(10, fired.append, "dropped")
+    timers.clear()
+    clock.now = 100
+    assert timers.advance() == 0
+    assert fired == []
+    assert not timer.active